@@ -5,17 +5,30 @@ import os
 import time
 import json
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Callable
+from typing import Dict, Any, List, Callable, Optional, Tuple
+from response_cache import MemoryResponseCache, create_response_cache, canonical_params, serve_from_superset
+from sources.rate_limiter import create_rate_limiter
+from sources.metrics import metrics
+from sources.tracing import tracer
 
-# Logging konfigurieren
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename='api_manager.log'
-)
 logger = logging.getLogger('api_manager')
 
+def configure_logging() -> None:
+    """Konfiguriert das Logging (api_manager.log)
+    
+    Wird beim Erstellen des Singletons aufgerufen statt beim Import, damit ein
+    reiner Import weder Dateien anlegt noch die Logging-Konfiguration der
+    Anwendung überschreibt.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        filename='api_manager.log'
+    )
+
 class APIManager:
     """Zentrale Verwaltung für alle Datenquellen-APIs im WED-Projekt"""
     
@@ -28,8 +41,15 @@ class APIManager:
         self.config_file = config_file
         self.config = self._load_config()
         self.sources = {}  # API-Quellen-Module
-        self.rate_limits = {}  # Speichert Zeitstempel für Rate-Limiting
-        self.data_cache = {}  # Cache für API-Antworten
+        self.rate_limits = {}  # Token-Buckets für Quellen ohne eigenes Rate-Limiting
+        # Cache für API-Antworten (In-Memory, LRU-begrenzt)
+        self.data_cache = MemoryResponseCache(self.config.get('cache', {}).get('memory_entries', 256))
+        # Überlebt Neustarts; liegt neben der Konfigurationsdatei (ohne Konfiguration nur In-Memory)
+        config_dir = os.path.dirname(os.path.abspath(config_file)) if os.path.exists(config_file) else None
+        self.persistent_cache = create_response_cache(self.config.get('cache', {}), config_dir)
+        self._inflight = {}  # Laufende Abrufe je Cache-Schlüssel (Single-Flight)
+        self._inflight_lock = threading.Lock()
+        self._refresh_executor = None  # Hintergrund-Aktualisierung veralteter Einträge (Stale-While-Revalidate)
         
         logger.info("API Manager initialized")
     
@@ -55,14 +75,53 @@ class APIManager:
         """
         if name in self.sources:
             logger.warning(f"Source {name} already registered. Overwriting.")
+            self._close_source(name)
         
         self.sources[name] = source_module
-        self.rate_limits[name] = {
-            'last_call': 0,
-            'min_interval': source_module.MIN_INTERVAL if hasattr(source_module, 'MIN_INTERVAL') else 1
-        }
+        
+        if hasattr(source_module, 'metrics_label'):
+            # Metriken der Quelle unter demselben Namen führen wie die des Managers
+            source_module.metrics_label = name
+        
+        if hasattr(source_module, 'rate_limiter'):
+            # Quelle begrenzt jeden HTTP-Request selbst - kein zweites Limit im Manager
+            self.rate_limits[name] = None
+        else:
+            min_interval = source_module.MIN_INTERVAL if hasattr(source_module, 'MIN_INTERVAL') else 1
+            self.rate_limits[name] = create_rate_limiter({'rate_limit': min_interval}, name)
         logger.info(f"Registered source: {name}")
     
+    def _close_source(self, name: str) -> None:
+        """Gibt Ressourcen (z.B. HTTP-Sessions) einer registrierten Quelle frei"""
+        source_module = self.sources.get(name)
+        if source_module is not None and hasattr(source_module, 'close'):
+            try:
+                source_module.close()
+            except Exception as e:
+                logger.warning(f"Error closing source {name}: {str(e)}")
+    
+    def close(self) -> None:
+        """Schließt alle registrierten Quellen und den persistenten Cache"""
+        with self._inflight_lock:
+            executor, self._refresh_executor = self._refresh_executor, None
+        if executor is not None:
+            # Laufende Hintergrund-Aktualisierungen noch abschließen lassen
+            executor.shutdown(wait=True)
+        for name in list(self.sources):
+            self._close_source(name)
+        if self.persistent_cache is not None:
+            self.persistent_cache.close()
+            self.persistent_cache = None
+        logger.info("API Manager closed")
+    
+    async def close_async(self) -> None:
+        """Wie close, schließt aiohttp-Sessions der Quellen aber auf der laufenden Event-Loop"""
+        import asyncio
+        for source_module in list(self.sources.values()):
+            if hasattr(source_module, 'close_async'):
+                await source_module.close_async()
+        await asyncio.to_thread(self.close)
+    
     def get_api_key(self, source_name: str) -> str:
         """Gibt den API-Schlüssel für eine bestimmte Quelle zurück
         
@@ -78,13 +137,26 @@ class APIManager:
             logger.warning(f"No API key found for {source_name}")
             return ""
     
-    def fetch_data(self, source_name: str, dataset_id: str, params: Dict = None) -> Dict:
+    def fetch_data(self, source_name: str, dataset_id: str, params: Dict = None,
+                   allow_stale: bool = True, refresh: bool = False,
+                   fetch: Callable[[], Dict] = None) -> Dict:
         """Ruft Daten von einer API-Quelle ab mit Rate-Limiting und Fehlerbehandlung
         
+        Gleichzeitige Aufrufe mit demselben Cache-Schlüssel werden zusammengefasst:
+        Nur der erste ruft ab, die übrigen erhalten dessen Ergebnis bzw. Fehler.
+        
+        Mit Stale-While-Revalidate (cache.stale_while_revalidate) werden abgelaufene
+        Einträge bis zur max_staleness sofort geliefert und im Hintergrund erneuert.
+        
         Args:
             source_name: Name der registrierten Datenquelle
             dataset_id: ID des Datensatzes in der Datenquelle
             params: Zusätzliche Parameter für den API-Aufruf
+            allow_stale: False erzwingt frische Daten (z.B. für den Updater)
+            refresh: True überspringt den Cache-Lookup und fragt die Quelle ab
+                     (z.B. beim Warten auf eine Veröffentlichung); das Ergebnis wird gecacht
+            fetch: Optional, Abruf anstelle von fetch_dataset(dataset_id, params), dessen
+                   Ergebnis dieselben Daten liefert (z.B. seitenweiser Zeitraum-Abruf)
             
         Returns:
             Abgerufene Daten als Dictionary
@@ -94,19 +166,95 @@ class APIManager:
             logger.error(error_msg)
             return {'error': error_msg}
         
-        # Rate-Limiting prüfen und einhalten
-        self._respect_rate_limit(source_name)
+        # Caching-Schlüssel erstellen (Parameter kanonisch, Reihenfolge egal)
+        cache_key = self._cache_key(source_name, dataset_id, params)
+        
+        with tracer.span('fetch_data', source=source_name, dataset=dataset_id) as span:
+            # Versuchen, aus dem Cache zu laden (vor dem Rate-Limiting, Treffer kosten keine Wartezeit)
+            cached_data = None if refresh else self._lookup_cache(source_name, dataset_id, params, cache_key,
+                                                                   allow_stale, span)
+            if cached_data is not None:
+                return cached_data
+            
+            # Läuft derselbe Abruf bereits, auf dessen Ergebnis (oder Fehler) warten statt erneut abzurufen
+            future, leader = self._join_inflight(source_name, cache_key)
+            if not leader:
+                span.set(coalesced=True)
+                return future.result()
+            
+            result = None
+            try:
+                result = None if refresh else self._peek_cached(source_name, cache_key)
+                if result is None:
+                    result = self._fetch_uncached(source_name, dataset_id, params, cache_key, fetch)
+                return result
+            finally:
+                self._finish_inflight(cache_key, future, result)
+    
+    def fetch_historical_range(self, source_name: str, dataset_id: str, start_date: str, end_date: str) -> Dict:
+        """Ruft einen Zeitraum vollständig ab, über Cache, Subsumption und Single-Flight
+        
+        Das Ergebnis wird unter den Parametern aus get_range_params der Quelle
+        gecacht: Ein gecachter umfassenderer Zeitraum bedient die Abfrage ohne
+        Netzwerkzugriff, und der abgerufene Zeitraum bedient später engere
+        Abfragen (z.B. die Standard-Abfrage der letzten Beobachtungen).
+        
+        Args:
+            source_name: Name der registrierten Datenquelle
+            dataset_id: ID des Datensatzes in der Datenquelle
+            start_date: Start-Datum (YYYY-MM-DD)
+            end_date: End-Datum (YYYY-MM-DD)
+            
+        Returns:
+            Abgerufene Daten als Dictionary oder {'error': ...}
+        """
+        if source_name not in self.sources:
+            error_msg = f"Source {source_name} not registered"
+            logger.error(error_msg)
+            return {'error': error_msg}
         
-        # Caching-Schlüssel erstellen
-        cache_key = f"{source_name}_{dataset_id}_{str(params)}"
+        source_module = self.sources[source_name]
+        params = source_module.get_range_params(start_date, end_date) \
+            if hasattr(source_module, 'get_range_params') else None
+        if params is None or not hasattr(source_module, 'fetch_historical_range'):
+            error_msg = f"Source {source_name} does not support historical ranges"
+            logger.error(error_msg)
+            return {'error': error_msg}
+        
+        return self.fetch_data(
+            source_name, dataset_id, params,
+            fetch=lambda: source_module.fetch_historical_range(dataset_id, start_date, end_date)
+        )
+    
+    def _lookup_cache(self, source_name: str, dataset_id: str, params: Optional[Dict], cache_key: str,
+                      allow_stale: bool, span) -> Optional[Dict]:
+        """Cache-Lookup von fetch_data: exakter Schlüssel (ggf. veraltet), sonst Zuschnitt
+        
+        Returns:
+            Daten aus dem Cache oder None, wenn abgerufen werden muss
+        """
+        max_staleness = self._get_max_staleness(source_name, dataset_id) if allow_stale else 0
+        cached_data, stale = self._get_cached(source_name, cache_key, max_staleness)
+        if cached_data is not None:
+            self._on_cache_hit(source_name, dataset_id, params, cache_key, stale, span)
+            return cached_data
         
-        # Versuchen, aus dem Cache zu laden
-        if cache_key in self.data_cache:
-            cache_entry = self.data_cache[cache_key]
-            # Wenn Cache noch frisch ist (weniger als 1 Stunde alt)
-            if time.time() - cache_entry['timestamp'] < 3600:  
-                logger.info(f"Using cached data for {cache_key}")
-                return cache_entry['data']
+        # Engere Abfrage aus einem gecachten, umfassenderen Ergebnis zuschneiden
+        subsumed = self._get_subsumed(source_name, dataset_id, params)
+        if subsumed is not None:
+            logger.info(f"Serving {cache_key} from a cached superset")
+            span.set(cache='subsumed')
+        return subsumed
+    
+    def _fetch_uncached(self, source_name: str, dataset_id: str, params: Optional[Dict], cache_key: str,
+                        fetch: Callable[[], Dict] = None) -> Dict:
+        """Ruft einen Datensatz von der Quelle ab und speichert ihn im Cache
+        
+        Returns:
+            Abgerufene Daten oder {'error': ...}
+        """
+        # Rate-Limiting prüfen und einhalten
+        self._respect_rate_limit(source_name)
         
         try:
             source_module = self.sources[source_name]
@@ -114,20 +262,12 @@ class APIManager:
             # API-Schlüssel bereitstellen, wenn verfügbar
             api_key = self.get_api_key(source_name)
             
-            # Startzeit für Protokollierung und Rate-Limiting
-            start_time = time.time()
-            
             # API-Aufruf mit dem spezifischen Modul
-            result = source_module.fetch_dataset(dataset_id, params)
-            
-            # Rate-Limit aktualisieren
-            self.rate_limits[source_name]['last_call'] = start_time
+            with metrics.timer('wed_fetch_duration_seconds', source=source_name, dataset=dataset_id):
+                result = fetch() if fetch is not None else source_module.fetch_dataset(dataset_id, params)
             
             # Ergebnis im Cache speichern
-            self.data_cache[cache_key] = {
-                'data': result,
-                'timestamp': time.time()
-            }
+            self._store_cached(source_name, cache_key, result)
             
             logger.info(f"Successfully fetched data from {source_name} for {dataset_id}")
             return result
@@ -135,22 +275,352 @@ class APIManager:
         except Exception as e:
             error_msg = f"Error fetching data from {source_name}: {str(e)}"
             logger.error(error_msg)
+            metrics.inc('wed_fetch_errors_total', source=source_name, dataset=dataset_id)
             return {'error': error_msg}
     
+    def _join_inflight(self, source_name: str, cache_key: str) -> Tuple[Future, bool]:
+        """Meldet einen Abruf an oder schließt sich einem laufenden an (Single-Flight)
+        
+        Args:
+            source_name: Name der Datenquelle
+            cache_key: Cache-Schlüssel des Abrufs
+            
+        Returns:
+            (Future mit dem Ergebnis, True wenn der Aufrufer selbst abrufen muss)
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(cache_key)
+            if future is not None:
+                metrics.inc('wed_fetch_coalesced_total', source=source_name)
+                logger.info(f"Waiting for in-flight request {cache_key}")
+                return future, False
+            future = self._inflight[cache_key] = Future()
+            return future, True
+    
+    def _finish_inflight(self, cache_key: str, future: Future, result: Optional[Dict]) -> None:
+        """Gibt das Ergebnis eines Abrufs an alle wartenden Aufrufer weiter
+        
+        Args:
+            cache_key: Cache-Schlüssel des Abrufs
+            future: Future aus _join_inflight
+            result: Ergebnis; None, falls der Abruf abgebrochen wurde
+        """
+        with self._inflight_lock:
+            self._inflight.pop(cache_key, None)
+        if result is None:
+            result = {'error': f"Request {cache_key} was aborted"}
+        future.set_result(result)
+    
+    @staticmethod
+    def _cache_key(source_name: str, dataset_id: str, params: Optional[Dict]) -> str:
+        """Cache-Schlüssel aus Quelle, Datensatz und kanonischen Parametern"""
+        return f"{source_name}_{dataset_id}_{canonical_params(params)}"
+    
+    def _get_subsumed(self, source_name: str, dataset_id: str, params: Optional[Dict]) -> Optional[Dict]:
+        """Beantwortet eine Abfrage aus einem frischen Cache-Eintrag, der sie vollständig enthält
+        
+        Die Quelle beschreibt per describe_query, welchen Ausschnitt (Zeitraum, Limit,
+        Sortierung) eine Abfrage liefert; gecachte Ergebnisse tragen in meta.coverage
+        den vollständig enthaltenen Zeitraum. So wird z.B. limit=1 aus dem Standard-
+        Abruf mit 60 Beobachtungen bedient, ohne Netzwerkzugriff.
+        
+        Returns:
+            Zugeschnittenes Ergebnis oder None
+        """
+        source_module = self.sources[source_name]
+        if not hasattr(source_module, 'describe_query'):
+            return None
+        query = source_module.describe_query(dataset_id, params)
+        if query is None:
+            return None
+        
+        prefix = f"{source_name}_{dataset_id}_"
+        ttl = self._get_cache_ttl(source_name)
+        now = time.time()
+        
+        candidates = self.data_cache.keys_with_prefix(prefix)
+        if self.persistent_cache is not None:
+            in_memory = set(candidates)
+            candidates.extend(key for key in self.persistent_cache.keys_with_prefix(prefix)
+                              if key not in in_memory)
+        
+        for key in candidates:
+            try:
+                cached_params = json.loads(key[len(prefix):])
+            except ValueError:
+                # Anderer Datensatz mit gleichem Präfix oder Schlüssel aus älteren Versionen
+                continue
+            if not isinstance(cached_params, dict):
+                continue
+            cached_query = source_module.describe_query(dataset_id, cached_params)
+            if cached_query is None or cached_query['variant'] != query['variant']:
+                continue
+            
+            cache_entry = self._load_cached(key, ttl, now)
+            if cache_entry is None or now - cache_entry['timestamp'] >= ttl:
+                continue
+            
+            result = serve_from_superset(cache_entry['data'], query)
+            if result is not None:
+                metrics.inc('wed_cache_subsumed_total', source=source_name)
+                return result
+        return None
+    
+    def _get_cache_ttl(self, source_name: str) -> float:
+        """Gibt die Cache-Lebensdauer für eine Quelle zurück (Standard: 1 Stunde)"""
+        cache_config = self.config.get('cache', {})
+        return cache_config.get('source_ttls', {}).get(source_name, cache_config.get('ttl', 3600))
+    
+    def _get_max_staleness(self, source_name: str, dataset_id: str) -> float:
+        """Maximales Alter, bis zu dem ein abgelaufener Eintrag noch sofort geliefert wird
+        
+        Konfiguration (cache.stale_while_revalidate), spezifischste Angabe gewinnt:
+        {"max_staleness": 86400, "sources": {"fred": 172800}, "datasets": {"fred/gdp": 604800}}
+        
+        Returns:
+            Alter in Sekunden; 0 bzw. ein Wert unter der TTL schaltet das Verhalten ab
+        """
+        swr_config = self.config.get('cache', {}).get('stale_while_revalidate', {})
+        dataset_key = f"{source_name}/{dataset_id}"
+        if dataset_key in swr_config.get('datasets', {}):
+            return swr_config['datasets'][dataset_key]
+        return swr_config.get('sources', {}).get(source_name, swr_config.get('max_staleness', 0))
+    
+    def _get_cached(self, source_name: str, cache_key: str, max_staleness: float = 0) -> Tuple[Optional[Dict], bool]:
+        """Sucht Daten im In-Memory-Cache und danach im persistenten Cache
+        
+        Args:
+            source_name: Name der Datenquelle
+            cache_key: Cache-Schlüssel
+            max_staleness: Abgelaufene Einträge bis zu diesem Alter (Sekunden) als veraltet liefern
+            
+        Returns:
+            (Gecachte Daten oder None, True wenn die Daten veraltet sind)
+        """
+        ttl = self._get_cache_ttl(source_name)
+        now = time.time()
+        
+        cache_entry = self._load_cached(cache_key, ttl, now)
+        if cache_entry is None:
+            metrics.inc('wed_cache_requests_total', source=source_name, result='miss')
+            return None, False
+        age = now - cache_entry['timestamp']
+        if age < ttl:
+            metrics.inc('wed_cache_requests_total', source=source_name, result='hit')
+            return cache_entry['data'], False
+        if age < max_staleness:
+            metrics.inc('wed_cache_requests_total', source=source_name, result='stale')
+            return cache_entry['data'], True
+        metrics.inc('wed_cache_requests_total', source=source_name, result='expired')
+        return None, False
+    
+    def _load_cached(self, cache_key: str, ttl: float, now: float) -> Optional[Dict]:
+        """Eintrag aus dem In-Memory-Cache, bei Fehlen oder Ablauf aus dem persistenten Cache
+        
+        Ein abgelaufener Eintrag im Speicher verdeckt so keinen frischeren, den ein
+        überlappender Lauf inzwischen in den persistenten Cache geschrieben hat.
+        
+        Returns:
+            Dictionary mit 'data' und 'timestamp' (ggf. abgelaufen) oder None
+        """
+        cache_entry = self.data_cache.get(cache_key)
+        if self.persistent_cache is not None and (cache_entry is None or now - cache_entry['timestamp'] >= ttl):
+            stored = self.persistent_cache.get(cache_key)
+            if stored is not None and (cache_entry is None or stored['timestamp'] > cache_entry['timestamp']):
+                # Für weitere Zugriffe in diesem Prozess im Speicher halten
+                cache_entry = self.data_cache[cache_key] = stored
+        return cache_entry
+    
+    def _on_cache_hit(self, source_name: str, dataset_id: str, params: Optional[Dict], cache_key: str,
+                      stale: bool, span) -> None:
+        """Protokolliert einen Cache-Treffer und stößt bei veralteten Daten die Aktualisierung an"""
+        if stale:
+            logger.info(f"Using stale cached data for {cache_key}, refreshing in background")
+            span.set(cache='stale')
+            self._schedule_refresh(source_name, dataset_id, params, cache_key)
+        else:
+            logger.info(f"Using cached data for {cache_key}")
+            span.set(cache='hit')
+    
+    def _schedule_refresh(self, source_name: str, dataset_id: str, params: Optional[Dict], cache_key: str) -> None:
+        """Aktualisiert einen veralteten Eintrag im Hintergrund (höchstens ein Abruf je Schlüssel)
+        
+        Der Abruf wird wie ein normaler Abruf im Single-Flight-Verzeichnis geführt;
+        blockierende Aufrufer für denselben Schlüssel warten also auf ihn.
+        """
+        with self._inflight_lock:
+            if cache_key in self._inflight:
+                return
+            future = self._inflight[cache_key] = Future()
+            if self._refresh_executor is None:
+                workers = self.config.get('cache', {}).get('stale_while_revalidate', {}).get('refresh_workers', 2)
+                self._refresh_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cache-refresh')
+            executor = self._refresh_executor
+        
+        try:
+            executor.submit(self._refresh_cached, source_name, dataset_id, params, cache_key, future)
+        except RuntimeError as e:
+            # Executor bereits heruntergefahren (close)
+            logger.warning(f"Could not schedule refresh of {cache_key}: {str(e)}")
+            self._finish_inflight(cache_key, future, None)
+    
+    def _refresh_cached(self, source_name: str, dataset_id: str, params: Optional[Dict], cache_key: str,
+                        future: Future) -> None:
+        """Hintergrund-Abruf für _schedule_refresh; bei Fehlern bleibt der veraltete Eintrag erhalten"""
+        result = None
+        try:
+            with tracer.span('refresh_cached', source=source_name, dataset=dataset_id):
+                result = self._fetch_uncached(source_name, dataset_id, params, cache_key)
+            if 'error' in result:
+                logger.warning(f"Background refresh of {cache_key} failed, keeping stale entry")
+                metrics.inc('wed_cache_refreshes_total', source=source_name, result='error')
+            else:
+                metrics.inc('wed_cache_refreshes_total', source=source_name, result='ok')
+        finally:
+            self._finish_inflight(cache_key, future, result)
+    
+    def _peek_cached(self, source_name: str, cache_key: str) -> Optional[Dict]:
+        """Frischer Eintrag im In-Memory-Cache, ohne Metriken und ohne persistenten Cache
+        
+        Schließt die Lücke zwischen einem Cache-Fehlschlag und _join_inflight: Ein
+        gerade beendeter Abruf hat sein Ergebnis bereits im Speicher abgelegt.
+        """
+        cache_entry = self.data_cache.get(cache_key)
+        if cache_entry is None or time.time() - cache_entry['timestamp'] >= self._get_cache_ttl(source_name):
+            return None
+        return cache_entry['data']
+    
+    def _store_cached(self, source_name: str, cache_key: str, data: Dict) -> None:
+        """Speichert Daten im In-Memory-Cache und im persistenten Cache"""
+        timestamp = time.time()
+        self.data_cache[cache_key] = {
+            'data': data,
+            'timestamp': timestamp
+        }
+        if self.persistent_cache is not None:
+            self.persistent_cache.set(cache_key, source_name, data, timestamp)
+    
+    def _reserve_rate_limit(self, source_name: str) -> float:
+        """Reserviert ein Token im Rate-Limiter einer Quelle
+        
+        Quellen mit eigenem Token-Bucket (BaseAPISource) werden hier nicht
+        zusätzlich begrenzt, damit Requests nicht doppelt warten.
+        
+        Returns:
+            Wartezeit in Sekunden bis zur Freigabe
+        """
+        rate_limiter = self.rate_limits.get(source_name)
+        if rate_limiter is None:
+            return 0.0
+        return rate_limiter.reserve()
+    
     def _respect_rate_limit(self, source_name: str) -> None:
         """Stellt sicher, dass Rate-Limits eingehalten werden"""
-        if source_name in self.rate_limits:
-            last_call = self.rate_limits[source_name]['last_call']
-            min_interval = self.rate_limits[source_name]['min_interval']
+        wait_time = self._reserve_rate_limit(source_name)
+        
+        # Wenn nötig, warten bis zum nächsten erlaubten Aufruf
+        if wait_time > 0:
+            logger.info(f"Rate limit: Waiting {wait_time:.2f}s before calling {source_name}")
+            metrics.inc('wed_rate_limit_wait_seconds_total', wait_time, source=source_name, layer='manager')
+            time.sleep(wait_time)
+    
+    async def _respect_rate_limit_async(self, source_name: str) -> None:
+        """Wie _respect_rate_limit, blockiert aber nicht die Event-Loop"""
+        wait_time = self._reserve_rate_limit(source_name)
+        if wait_time > 0:
+            logger.info(f"Rate limit: Waiting {wait_time:.2f}s before calling {source_name}")
+            metrics.inc('wed_rate_limit_wait_seconds_total', wait_time, source=source_name, layer='manager')
+            import asyncio
+            await asyncio.sleep(wait_time)
+    
+    async def fetch_data_async(self, source_name: str, dataset_id: str, params: Dict = None,
+                               allow_stale: bool = True, refresh: bool = False) -> Dict:
+        """Asynchrone Variante von fetch_data mit identischem Caching und Fehlerformat
+        
+        Quellen mit eigener fetch_dataset_async-Methode werden direkt awaited,
+        alle anderen laufen in einem Worker-Thread. Cache-Zugriffe (SQLite,
+        Subsumption) laufen ebenfalls in einem Worker-Thread, damit die
+        Event-Loop nicht blockiert.
+        
+        Args:
+            source_name: Name der registrierten Datenquelle
+            dataset_id: ID des Datensatzes in der Datenquelle
+            params: Zusätzliche Parameter für den API-Aufruf
+            
+        Returns:
+            Abgerufene Daten als Dictionary
+        """
+        if source_name not in self.sources:
+            error_msg = f"Source {source_name} not registered"
+            logger.error(error_msg)
+            return {'error': error_msg}
+        
+        import asyncio
+        cache_key = self._cache_key(source_name, dataset_id, params)
+        
+        with tracer.span('fetch_data', source=source_name, dataset=dataset_id) as span:
+            # Versuchen, aus dem Cache zu laden (vor dem Rate-Limiting, Treffer kosten keine Wartezeit)
+            cached_data = None if refresh else await asyncio.to_thread(
+                self._lookup_cache, source_name, dataset_id, params, cache_key, allow_stale, span
+            )
+            if cached_data is not None:
+                return cached_data
             
-            # Zeit seit dem letzten Aufruf berechnen
-            time_since_last = time.time() - last_call
+            future, leader = self._join_inflight(source_name, cache_key)
+            if not leader:
+                span.set(coalesced=True)
+                return await asyncio.wrap_future(future)
             
-            # Wenn nötig, warten bis zum nächsten erlaubten Aufruf
-            if time_since_last < min_interval:
-                wait_time = min_interval - time_since_last
-                logger.info(f"Rate limit: Waiting {wait_time:.2f}s before calling {source_name}")
-                time.sleep(wait_time)
+            result = None
+            try:
+                result = None if refresh else self._peek_cached(source_name, cache_key)
+                if result is None:
+                    result = await self._fetch_uncached_async(source_name, dataset_id, params, cache_key)
+                return result
+            finally:
+                self._finish_inflight(cache_key, future, result)
+    
+    async def _fetch_uncached_async(self, source_name: str, dataset_id: str, params: Optional[Dict],
+                                    cache_key: str) -> Dict:
+        """Asynchrone Variante von _fetch_uncached"""
+        import asyncio
+        await self._respect_rate_limit_async(source_name)
+        
+        try:
+            source_module = self.sources[source_name]
+            
+            with metrics.timer('wed_fetch_duration_seconds', source=source_name, dataset=dataset_id):
+                if hasattr(source_module, 'fetch_dataset_async'):
+                    result = await source_module.fetch_dataset_async(dataset_id, params)
+                else:
+                    result = await asyncio.to_thread(source_module.fetch_dataset, dataset_id, params)
+            
+            # Persistenter Cache schreibt in SQLite - nicht auf der Event-Loop
+            await asyncio.to_thread(self._store_cached, source_name, cache_key, result)
+            
+            logger.info(f"Successfully fetched data from {source_name} for {dataset_id}")
+            return result
+            
+        except Exception as e:
+            error_msg = f"Error fetching data from {source_name}: {str(e)}"
+            logger.error(error_msg)
+            metrics.inc('wed_fetch_errors_total', source=source_name, dataset=dataset_id)
+            return {'error': error_msg}
+    
+    async def fetch_many_async(self, requests: List[Tuple[str, str, Optional[Dict]]]) -> List[Dict]:
+        """Ruft viele Datensätze gleichzeitig von einer Event-Loop aus ab
+        
+        Args:
+            requests: Liste von (source_name, dataset_id, params)
+            
+        Returns:
+            Ergebnisse in der Reihenfolge der Anfragen
+        """
+        import asyncio
+        return await asyncio.gather(*(
+            self.fetch_data_async(source_name, dataset_id, params)
+            for source_name, dataset_id, params in requests
+        ))
     
     def get_available_datasets(self, source_name: str) -> List[Dict]:
         """Gibt verfügbare Datensätze für eine Quelle zurück
@@ -168,7 +638,8 @@ class APIManager:
         try:
             source_module = self.sources[source_name]
             if hasattr(source_module, 'get_available_datasets'):
-                return source_module.get_available_datasets(self.get_api_key(source_name))
+                # Quellen kennen ihren API-Schlüssel bereits aus der Registrierung
+                return source_module.get_available_datasets()
             else:
                 logger.warning(f"Source {source_name} does not support dataset listing")
                 return []
@@ -185,17 +656,36 @@ class APIManager:
         """
         if source_name:
             # Nur Einträge für die angegebene Quelle löschen
-            keys_to_delete = [k for k in self.data_cache if k.startswith(f"{source_name}_")]
-            for key in keys_to_delete:
-                del self.data_cache[key]
+            self.data_cache.delete_prefix(f"{source_name}_")
+            if self.persistent_cache is not None:
+                self.persistent_cache.delete_source(source_name)
             logger.info(f"Cleared cache for source {source_name}")
         else:
             # Gesamten Cache leeren
-            self.data_cache = {}
+            self.data_cache.clear()
+            if self.persistent_cache is not None:
+                self.persistent_cache.clear()
             logger.info("Cleared entire cache")
 
-# Singleton-Instanz erstellen
-api_manager = APIManager()
+# Singleton-Instanz wird erst beim ersten Zugriff erstellt (liest api_config.json)
+_api_manager = None
+_api_manager_lock = threading.Lock()
+
+def get_api_manager() -> APIManager:
+    """Gibt die gemeinsame APIManager-Instanz zurück und erstellt sie bei Bedarf"""
+    global _api_manager
+    if _api_manager is None:
+        with _api_manager_lock:
+            if _api_manager is None:
+                configure_logging()
+                _api_manager = APIManager()
+    return _api_manager
+
+def __getattr__(name: str):
+    """Erhält `from api_manager import api_manager`, ohne den Singleton beim Import zu bauen"""
+    if name == 'api_manager':
+        return get_api_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Hilfsfunktion zum einfachen Abrufen von Daten
 def get_data(source: str, dataset: str, params: Dict = None) -> Dict:
@@ -209,4 +699,17 @@ def get_data(source: str, dataset: str, params: Dict = None) -> Dict:
     Returns:
         Abgerufene Daten
     """
-    return api_manager.fetch_data(source, dataset, params)
\ No newline at end of file
+    return get_api_manager().fetch_data(source, dataset, params)
+
+async def get_data_async(source: str, dataset: str, params: Dict = None) -> Dict:
+    """Asynchrone Variante von get_data
+    
+    Args:
+        source: Name der Datenquelle
+        dataset: ID des Datensatzes
+        params: Zusätzliche Parameter
+        
+    Returns:
+        Abgerufene Daten
+    """
+    return await get_api_manager().fetch_data_async(source, dataset, params)
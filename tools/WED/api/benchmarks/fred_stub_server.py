@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# benchmarks/fred_stub_server.py - Lokaler FRED-Ersatz für reproduzierbare Benchmarks (offline)
+
+import json
+import math
+import time
+import random
+import threading
+from datetime import date
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+class FREDStubServer:
+    """HTTP-Server, der /fred/series/observations und /fred/series nachbildet
+
+    Zusätzlich liefern /fred/release/series und /fred/category/series die
+    Metadaten von jeweils release_size Serien: Release bzw. Kategorie n enthält
+    BENCH{n * release_size:05d} bis BENCH{(n + 1) * release_size - 1:05d}.
+
+    Jede Serie ist eine deterministische Zufallsreihe (Seed = Serien-ID), damit
+    Läufe vergleichbar bleiben. Unterstützt werden die von FREDSource genutzten
+    Parameter: sort_order, limit, offset, observation_start, observation_end.
+
+    Einstellbar:
+    - latency: Antwortverzögerung pro Request in Sekunden
+    - error_rate: Anteil der Requests mit HTTP 500
+    - throttle_rate: Anteil der Requests mit HTTP 429 und Retry-After
+    - series_length: Anzahl Beobachtungen pro Serie (monatlich ab 1950)
+    """
+
+    def __init__(self, series_length: int = 240, latency: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: float = 1, seed: int = 0,
+                 release_size: int = 100, host: str = '127.0.0.1', port: int = 0):
+        """Initialisiert den Server (gestartet wird mit start())
+
+        Args:
+            series_length: Beobachtungen pro Serie
+            latency: Verzögerung pro Antwort in Sekunden
+            error_rate: Wahrscheinlichkeit für HTTP 500 (0-1)
+            throttle_rate: Wahrscheinlichkeit für HTTP 429 (0-1)
+            retry_after: Wert des Retry-After-Headers bei 429 in Sekunden
+            seed: Seed für Fehler-/Drosselungsentscheidungen
+            release_size: Serien pro Release bzw. Kategorie
+            host: Bind-Adresse
+            port: Port (0 = freier Port)
+        """
+        self.series_length = series_length
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.release_size = release_size
+        self.host = host
+        self.port = port
+
+        self.stats = {'requests': 0, 'errors': 0, 'throttled': 0, 'bytes': 0}
+        self._stats_lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Basis-URL für die FRED-Konfiguration (sources.fred.base_url)"""
+        return f"http://{self.host}:{self._server.server_port}/fred"
+
+    def start(self) -> str:
+        """Startet den Server in einem Hintergrund-Thread
+
+        Returns:
+            Basis-URL
+        """
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                status, headers, body = stub._handle(self.path)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fred-stub', daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        """Beendet den Server"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _handle(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        """Beantwortet einen Request (Status, Header, Body)"""
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            roll = self._random.random()
+            if roll < self.throttle_rate:
+                self.stats['throttled'] += 1
+                return 429, {'Retry-After': str(self.retry_after)}, b''
+            if roll < self.throttle_rate + self.error_rate:
+                self.stats['errors'] += 1
+                return 500, {}, b''
+
+        url = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path.endswith('/series/observations'):
+            body = self._observations(query)
+        elif url.path.endswith('/release/series') or url.path.endswith('/category/series'):
+            body = self._bulk_series(query)
+        elif url.path.endswith('/series'):
+            body = self._series(query)
+        else:
+            return 404, {}, b''
+
+        payload = json.dumps(body).encode('utf-8')
+        with self._stats_lock:
+            self.stats['bytes'] += len(payload)
+        return 200, {'Content-Type': 'application/json'}, payload
+
+    def _observations(self, query: Dict[str, str]) -> Dict:
+        """Antwort von /fred/series/observations"""
+        observations = _generate_series(query.get('series_id', ''), self.series_length)
+
+        start = query.get('observation_start')
+        end = query.get('observation_end')
+        if start or end:
+            observations = [
+                entry for entry in observations
+                if (not start or entry['date'] >= start) and (not end or entry['date'] <= end)
+            ]
+        if query.get('sort_order') == 'desc':
+            observations = observations[::-1]
+
+        count = len(observations)
+        offset = int(query.get('offset', 0))
+        limit = int(query.get('limit', 100000))
+        return {
+            'count': count,
+            'offset': offset,
+            'limit': limit,
+            'sort_order': query.get('sort_order', 'asc'),
+            'observations': observations[offset:offset + limit]
+        }
+
+    def _series(self, query: Dict[str, str]) -> Dict:
+        """Antwort von /fred/series (Metadaten)"""
+        return {'seriess': [self._series_info(query.get('series_id', ''))]}
+
+    def _bulk_series(self, query: Dict[str, str]) -> Dict:
+        """Antwort von /fred/release/series bzw. /fred/category/series (seitenweise)"""
+        group = int(query.get('release_id', query.get('category_id', 0)))
+        series_ids = [f"BENCH{index:05d}" for index in
+                      range(group * self.release_size, (group + 1) * self.release_size)]
+        offset = int(query.get('offset', 0))
+        limit = int(query.get('limit', 1000))
+        return {
+            'count': len(series_ids),
+            'offset': offset,
+            'limit': limit,
+            'seriess': [self._series_info(series_id) for series_id in series_ids[offset:offset + limit]]
+        }
+
+    def _series_info(self, series_id: str) -> Dict:
+        """Metadaten einer Serie im Format von /fred/series"""
+        observations = _generate_series(series_id, self.series_length)
+        return {
+            'id': series_id,
+            'title': f"Benchmark series {series_id}",
+            'units': 'Index',
+            'frequency': 'Monthly',
+            'frequency_short': 'M',
+            'seasonal_adjustment_short': 'NSA',
+            'observation_start': observations[0]['date'] if observations else None,
+            'observation_end': observations[-1]['date'] if observations else None,
+            'last_updated': '2024-01-01 08:00:00-05'
+        }
+
+
+@lru_cache(maxsize=4096)
+def _generate_series(series_id: str, length: int) -> List[Dict[str, str]]:
+    """Deterministische Monatsreihe (Random Walk) im FRED-Format, älteste zuerst"""
+    rng = random.Random(series_id)
+    value = 100.0
+    observations = []
+    for index in range(length):
+        year, month = divmod(index, 12)
+        value = max(0.01, value * math.exp(rng.gauss(0.002, 0.01)))
+        # Vereinzelt fehlende Werte wie bei echten FRED-Serien
+        raw = '.' if rng.random() < 0.005 else f"{value:.3f}"
+        observations.append({
+            'realtime_start': '2024-01-01',
+            'realtime_end': '2024-01-01',
+            'date': date(1950 + year, month + 1, 1).isoformat(),
+            'value': raw
+        })
+    return observations
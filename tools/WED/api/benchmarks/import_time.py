@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# benchmarks/import_time.py - Misst die Importzeit der API-Module (Kaltstart von CLI und Workern)
+
+"""
+Import-Benchmark für api_manager, data_updater und das sources-Paket
+
+Jedes Modul wird mehrfach in einem frischen Interpreter mit `python -X importtime`
+importiert. Gemeldet werden der Median der kumulierten Importzeit und die
+teuersten Abhängigkeiten. Mit --max-ms eignet sich das Skript als Regressions-
+prüfung: Überschreitet ein Modul die Schwelle, endet es mit Exit-Code 1.
+
+Aufruf aus tools/WED/api:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --modules api_manager --runs 10 --max-ms 100
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+import statistics
+from typing import Dict, Any, List, Tuple
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ('api_manager', 'data_updater', 'sources', 'sources.fred_source')
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Wertet die Ausgabe von -X importtime aus
+
+    Returns:
+        Liste von (modul, eigene Zeit [µs], kumulierte Zeit [µs], Tiefe) in Importreihenfolge
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            # Kopfzeile "self [us] | cumulative | imported package"
+            continue
+        name = parts[2].rstrip()
+        depth = len(name) - len(name.lstrip())
+        entries.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return entries
+
+
+def module_subtree(entries: List[Tuple[str, int, int, int]], module: str) -> List[Tuple[str, int, int, int]]:
+    """Einträge, die durch den Import von `module` ausgelöst wurden (ohne Interpreter-Start)
+
+    -X importtime gibt Abhängigkeiten vor dem importierenden Modul und tiefer
+    eingerückt aus; der Teilbaum endet am ersten Eintrag gleicher oder
+    geringerer Tiefe.
+    """
+    for index in range(len(entries) - 1, -1, -1):
+        if entries[index][0] == module:
+            depth = entries[index][3]
+            start = index
+            while start > 0 and entries[start - 1][3] > depth:
+                start -= 1
+            return entries[start:index + 1]
+    return []
+
+
+def measure_module(module: str, runs: int) -> Dict[str, Any]:
+    """Importiert ein Modul `runs`-mal in frischen Prozessen
+
+    Args:
+        module: Modulname relativ zu tools/WED/api, z.B. "data_updater"
+        runs: Anzahl der Messungen
+
+    Returns:
+        Median und Maximum der Importzeit in ms sowie die teuersten Einzelimporte
+    """
+    totals = []
+    own_times: Dict[str, List[int]] = {}
+
+    for _ in range(runs):
+        # Leeres Arbeitsverzeichnis: Ein Import darf keine Dateien (Log, Cache) anlegen
+        with tempfile.TemporaryDirectory(prefix='wed-import-') as workdir:
+            env = dict(os.environ, PYTHONPATH=API_DIR, PYTHONDONTWRITEBYTECODE='1')
+            completed = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                cwd=workdir, env=env, capture_output=True, text=True
+            )
+            if completed.returncode != 0:
+                raise RuntimeError(f"import {module} failed:\n{completed.stderr.strip()}")
+            side_effects = sorted(os.listdir(workdir))
+
+        entries = module_subtree(parse_importtime(completed.stderr), module)
+        totals.append(entries[-1][2] if entries else 0)
+        for name, own, _, _ in entries:
+            own_times.setdefault(name, []).append(own)
+
+    top = sorted(((statistics.median(values), name) for name, values in own_times.items()), reverse=True)[:10]
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": round(statistics.median(totals) / 1000, 1),
+        "max_ms": round(max(totals) / 1000, 1),
+        "top_imports": [{"module": name, "self_ms": round(own / 1000, 1)} for own, name in top],
+        "files_created": side_effects
+    }
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Measure import time of the WED API modules')
+    parser.add_argument('--modules', nargs='+', default=list(DEFAULT_MODULES))
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per module')
+    parser.add_argument('--top', type=int, default=5, help='Slowest imports to print per module')
+    parser.add_argument('--max-ms', type=float,
+                        help='Fail (exit code 1) if a median import time exceeds this value')
+    parser.add_argument('--json', dest='json_file', help='Write results as JSON to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(argv)
+    results = []
+    failed = False
+
+    for module in args.modules:
+        result = measure_module(module, args.runs)
+        results.append(result)
+        print(f"{module:<22} median {result['median_ms']:7.1f} ms   max {result['max_ms']:7.1f} ms")
+        for entry in result["top_imports"][:args.top]:
+            print(f"    {entry['self_ms']:7.1f} ms  {entry['module']}")
+        if result["files_created"]:
+            print(f"    WARNING: import created files: {', '.join(result['files_created'])}")
+        if args.max_ms is not None and result["median_ms"] > args.max_ms:
+            print(f"    FAIL: median above {args.max_ms} ms")
+            failed = True
+
+    if args.json_file:
+        with open(args.json_file, 'w') as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"Results written to {args.json_file}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# benchmarks/run_benchmarks.py - Reproduzierbare Performance-Messungen gegen den lokalen FRED-Ersatz
+
+"""
+Benchmark-Harness für FREDSource, APIManager.fetch_data und WEDDataUpdater.update_all_data
+
+Alle Requests gehen an einen lokalen FRED-Ersatz (fred_stub_server.py), es wird
+weder Internet noch ein API-Key benötigt. Jeder Fall läuft in einem eigenen
+Prozess, damit Peak-RSS und Modulzustand (api_manager-Singleton, Caches) nicht
+zwischen den Fällen durchsickern.
+
+Aufruf aus tools/WED/api:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 10 100 --latency 0.05 --throttle-rate 0.02
+    python benchmarks/run_benchmarks.py --json results.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import statistics
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
+
+# Module aus tools/WED/api importierbar machen (Skript liegt in benchmarks/)
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if API_DIR not in sys.path:
+    sys.path.insert(0, API_DIR)
+
+from benchmarks.fred_stub_server import FREDStubServer
+
+SCENARIOS = ('source', 'manager', 'updater')
+
+def build_config(base_url: str, size: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Erstellt eine api_config.json-Struktur mit `size` Serien gegen den FRED-Ersatz"""
+    return {
+        "api_keys": {"fred": "benchmark"},
+        "cache": {"backend": "memory"},
+        "updater": {"max_workers": args.workers},
+        "sources": {
+            "fred": {
+                "name": "FRED Benchmark",
+                "base_url": base_url,
+                "rate_limit": args.rate_limit,
+                "timeout": 30,
+                "retries": args.retries,
+                "pool_size": max(10, args.workers),
+                "datasets": {f"series_{index}": f"BENCH{index:05d}" for index in range(size)}
+            }
+        }
+    }
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Perzentil per linearer Interpolation (values muss nicht sortiert sein)"""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[int(fraction * 100) - 1]
+
+
+def peak_rss_bytes() -> int:
+    """Peak-RSS des aktuellen Prozesses in Bytes (0, falls nicht ermittelbar)"""
+    try:
+        import resource
+    except ImportError:  # z.B. Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux meldet KiB, macOS Bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _timed_fetches(fetch, dataset_ids: List[str], workers: int) -> Dict[str, Any]:
+    """Führt fetch(dataset_id) für alle IDs aus und misst Latenz pro Aufruf"""
+    def run(dataset_id):
+        started = time.perf_counter()
+        result = fetch(dataset_id)
+        return time.perf_counter() - started, 'error' not in result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run, dataset_ids))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in results]
+    return {
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "failed": sum(1 for _, ok in results if not ok)
+    }
+
+
+def run_case(scenario: str, config: Dict[str, Any], workdir: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    """Führt einen Benchmark-Fall aus (läuft im Kindprozess)
+
+    Args:
+        scenario: 'source', 'manager' oder 'updater'
+        config: Konfiguration aus build_config
+        workdir: Leeres Arbeitsverzeichnis für Konfiguration und Output
+        args: Kommandozeilenoptionen als Dictionary
+
+    Returns:
+        Messwerte des Falls
+    """
+    logging.basicConfig(level=logging.WARNING)
+    logging.disable(logging.INFO)
+    os.chdir(workdir)
+
+    config_file = os.path.join(workdir, 'api_config.json')
+    with open(config_file, 'w') as f:
+        json.dump(config, f)
+
+    fred_config = config['sources']['fred']
+    dataset_ids = list(fred_config['datasets'])
+    params = {'limit': args['series_length']}
+    latencies = []
+    failed = 0
+    output_bytes = 0
+
+    if scenario == 'source':
+        from sources.fred_source import create_fred_source
+        source = create_fred_source(fred_config, config['api_keys']['fred'])
+
+        def fetch(dataset_id):
+            try:
+                return source.fetch_dataset(dataset_id, params)
+            except Exception as e:
+                return {'error': str(e)}
+
+        with source:
+            measured = _timed_fetches(fetch, dataset_ids, args['workers'])
+        elapsed, latencies, failed = measured['elapsed'], measured['latencies'], measured['failed']
+
+    elif scenario == 'manager':
+        from api_manager import APIManager
+        from sources.fred_source import create_fred_source
+        manager = APIManager(config_file)
+        manager.register_source('fred', create_fred_source(fred_config, config['api_keys']['fred']))
+        try:
+            measured = _timed_fetches(lambda dataset_id: manager.fetch_data('fred', dataset_id, params),
+                                      dataset_ids, args['workers'])
+        finally:
+            manager.close()
+        elapsed, latencies, failed = measured['elapsed'], measured['latencies'], measured['failed']
+
+    else:
+        from data_updater import WEDDataUpdater
+        output_file = os.path.join(workdir, 'economic_data.json')
+        updater = WEDDataUpdater(config_file, output_file, max_workers=args['workers'])
+        try:
+            started = time.perf_counter()
+            output = updater.update_all_data()
+            elapsed = time.perf_counter() - started
+        finally:
+            updater.close()
+        summary = output['meta']['update_summary'].get('fred', {})
+        failed = summary.get('failed', 0)
+        for root, _, files in os.walk(workdir):
+            output_bytes += sum(os.path.getsize(os.path.join(root, name)) for name in files
+                                if name != 'api_config.json')
+
+    return {
+        "scenario": scenario,
+        "series": len(dataset_ids),
+        "elapsed_s": round(elapsed, 4),
+        "throughput_per_s": round(len(dataset_ids) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        "failed": failed,
+        "peak_rss_mb": round(peak_rss_bytes() / (1024 * 1024), 1),
+        "output_bytes": output_bytes or None
+    }
+
+
+def run_benchmarks(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Startet den FRED-Ersatz und führt alle Szenarien für alle Größen aus"""
+    context = multiprocessing.get_context('spawn')
+    results = []
+
+    with FREDStubServer(series_length=args.series_length, latency=args.latency,
+                        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                        retry_after=args.retry_after, seed=args.seed) as server:
+        for size in args.sizes:
+            config = build_config(server.base_url, size, args)
+            for scenario in args.scenarios:
+                workdir = tempfile.mkdtemp(prefix=f"wed-bench-{scenario}-{size}-")
+                requests_before = server.stats['requests']
+                try:
+                    with context.Pool(1) as pool:
+                        result = pool.apply(run_case, (scenario, config, workdir, vars(args)))
+                finally:
+                    shutil.rmtree(workdir, ignore_errors=True)
+                result["http_requests"] = server.stats['requests'] - requests_before
+                results.append(result)
+                print_row(result)
+
+    return results
+
+
+COLUMNS = [
+    ('scenario', 'scenario', 9), ('series', 'series', 7), ('elapsed_s', 'time [s]', 9),
+    ('throughput_per_s', 'series/s', 9), ('p50_ms', 'p50 [ms]', 9), ('p95_ms', 'p95 [ms]', 9),
+    ('failed', 'failed', 7), ('http_requests', 'requests', 9), ('peak_rss_mb', 'RSS [MB]', 9),
+    ('output_bytes', 'output [B]', 11)
+]
+
+
+def print_header() -> None:
+    print(' '.join(title.rjust(width) for _, title, width in COLUMNS))
+
+
+def print_row(result: Dict[str, Any]) -> None:
+    print(' '.join(str(result.get(key) if result.get(key) is not None else '-').rjust(width)
+                   for key, _, width in COLUMNS), flush=True)
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='WED API benchmarks against a local FRED stand-in')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000],
+                        help='Number of series per run (default: 10 100 1000)')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--series-length', type=int, default=240, help='Observations per series')
+    parser.add_argument('--latency', type=float, default=0.02, help='Server latency per request [s]')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of HTTP 500 responses')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of HTTP 429 responses')
+    parser.add_argument('--retry-after', type=float, default=1, help='Retry-After of 429 responses [s]')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent fetches')
+    parser.add_argument('--rate-limit', type=float, default=0,
+                        help='Client rate limit in seconds between requests (0 = unlimited)')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', dest='json_file', help='Write results as JSON to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(argv)
+    print(f"FRED stand-in: latency {args.latency}s, error rate {args.error_rate}, "
+          f"throttle rate {args.throttle_rate}, {args.series_length} observations/series, "
+          f"{args.workers} workers")
+    print_header()
+    results = run_benchmarks(args)
+
+    if args.json_file:
+        with open(args.json_file, 'w') as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"Results written to {args.json_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
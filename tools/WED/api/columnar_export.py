@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# columnar_export.py - Spaltenbasierter Binär-Export (Arrow IPC oder Rohformat) mit mmap-Leser
+
+import sys
+import json
+import mmap
+import struct
+import logging
+from array import array
+from datetime import date
+from typing import Dict, Any, List, Optional, Tuple
+from sources.timeseries import TimeSeries
+from output_writer import atomic_write_bytes
+
+try:
+    import numpy as np
+except ImportError:  # NumPy ist nur für den Leser nötig
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # Ohne pyarrow wird das Rohformat geschrieben
+    pa = None
+
+logger = logging.getLogger('data_updater')
+
+# Tagesnummer (date.toordinal()) von 1970-01-01; Datumsspalten zählen Tage seit Epoche (wie Arrow date32)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+ARROW_MAGIC = b"ARROW1"
+
+# Rohformat (ohne pyarrow), alle Zahlen little-endian:
+#
+#   Offset 0   8 Bytes   Magic b"WEDCOL1\0"
+#   Offset 8   uint32    Länge L des JSON-Headers in Bytes
+#   Offset 12  L Bytes   JSON-Header (UTF-8), mit Leerzeichen auf ein Vielfaches von 8 aufgefüllt
+#   danach               Datenbereich
+#
+# Der Header enthält {"version": 1, "meta": {...}, "datasets": {id: {"length": n,
+# "dates_offset": o1, "values_offset": o2, "title": ..., "unit": ...}}}. Offsets sind absolut
+# ab Dateianfang und 8-Byte-ausgerichtet. Pro Datensatz liegen n int32-Werte (Tage seit
+# 1970-01-01) bei dates_offset und n float64-Werte bei values_offset, älteste Beobachtung zuerst.
+RAW_MAGIC = b"WEDCOL1\0"
+RAW_VERSION = 1
+
+def _historical_series(dataset: Dict) -> TimeSeries:
+    """Liefert data.historical eines Output-Datensatzes als TimeSeries"""
+    historical = (dataset or {}).get('data', {}).get('historical') or []
+    if isinstance(historical, TimeSeries):
+        return historical
+    return TimeSeries.from_records(historical)
+
+
+def _epoch_days(series: TimeSeries) -> array:
+    """Tagesnummern einer Zeitreihe als Tage seit 1970-01-01"""
+    return array('i', (ordinal - _EPOCH_ORDINAL for ordinal in series.ordinals))
+
+
+def _little_endian(values: array) -> bytes:
+    """Array-Inhalt in little-endian Byte-Reihenfolge"""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pad(length: int) -> int:
+    """Anzahl Füllbytes bis zur nächsten 8-Byte-Grenze"""
+    return -length % 8
+
+
+def resolve_format(columnar_format: str = 'auto') -> str:
+    """Bestimmt das Exportformat
+
+    Args:
+        columnar_format: 'auto', 'arrow' oder 'raw'
+
+    Returns:
+        'arrow' oder 'raw' ('auto' = Arrow, wenn pyarrow installiert ist)
+    """
+    if columnar_format == 'arrow' and pa is None:
+        logger.warning("pyarrow not installed. Writing raw columnar format instead.")
+        return 'raw'
+    if columnar_format == 'auto':
+        return 'arrow' if pa is not None else 'raw'
+    return columnar_format
+
+
+def serialize_columnar(output_data: Dict[str, Any], columnar_format: str = 'auto') -> bytes:
+    """Serialisiert alle Zeitreihen der Output-Struktur spaltenbasiert
+
+    Args:
+        output_data: Output-Struktur mit 'meta' und 'datasets'
+        columnar_format: 'auto', 'arrow' oder 'raw'
+
+    Returns:
+        Dateiinhalt
+    """
+    datasets = output_data.get('datasets', {})
+    entries = {}
+    all_days = array('i')
+    all_values = array('d')
+
+    for dataset_id, dataset in datasets.items():
+        if not dataset:
+            continue
+        series = _historical_series(dataset)
+        entries[dataset_id] = {
+            "start": len(all_days),
+            "length": len(series),
+            "title": dataset.get('title'),
+            "unit": dataset.get('unit')
+        }
+        all_days.extend(_epoch_days(series))
+        all_values.extend(series.values)
+
+    if resolve_format(columnar_format) == 'arrow':
+        return _serialize_arrow(output_data.get('meta', {}), entries, all_days, all_values)
+    return _serialize_raw(output_data.get('meta', {}), entries, all_days, all_values)
+
+
+def _serialize_arrow(meta: Dict, entries: Dict, all_days: array, all_values: array) -> bytes:
+    """Arrow-IPC-Datei: ein Record-Batch mit den Spalten date (date32) und value (float64)
+
+    Alle Datensätze liegen hintereinander; Start und Länge pro Datensatz stehen in
+    den Schema-Metadaten unter b"wed" (JSON).
+    """
+    schema = pa.schema(
+        [pa.field('date', pa.date32(), nullable=False), pa.field('value', pa.float64(), nullable=False)],
+        metadata={b"wed": json.dumps({"meta": meta, "datasets": entries}, ensure_ascii=False).encode('utf-8')}
+    )
+    batch = pa.record_batch(
+        [pa.array(all_days, type=pa.int32()).cast(pa.date32()), pa.array(all_values, type=pa.float64())],
+        schema=schema
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _serialize_raw(meta: Dict, entries: Dict, all_days: array, all_values: array) -> bytes:
+    """Rohformat gemäß Beschreibung oben (RAW_MAGIC)"""
+    def build_header(data_start: int) -> bytes:
+        days_start = data_start
+        values_start = days_start + len(all_days) * 4
+        values_start += _pad(values_start)
+        header = {
+            "version": RAW_VERSION,
+            "meta": meta,
+            "datasets": {
+                dataset_id: {
+                    "length": entry["length"],
+                    "dates_offset": days_start + entry["start"] * 4,
+                    "values_offset": values_start + entry["start"] * 8,
+                    "title": entry["title"],
+                    "unit": entry["unit"]
+                }
+                for dataset_id, entry in entries.items()
+            }
+        }
+        raw = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return raw + b" " * _pad(len(RAW_MAGIC) + 4 + len(raw))
+
+    # Header-Länge hängt von den Offsets ab - so lange neu bauen, bis sie stabil ist
+    data_start = 0
+    header = build_header(data_start)
+    while len(RAW_MAGIC) + 4 + len(header) != data_start:
+        data_start = len(RAW_MAGIC) + 4 + len(header)
+        header = build_header(data_start)
+
+    days = _little_endian(all_days)
+    return b"".join([
+        RAW_MAGIC,
+        struct.pack('<I', len(header)),
+        header,
+        days,
+        b"\0" * _pad(data_start + len(days)),
+        _little_endian(all_values)
+    ])
+
+
+def write_columnar(path: str, output_data: Dict[str, Any], columnar_format: str = 'auto') -> bytes:
+    """Schreibt den spaltenbasierten Export atomar
+
+    Returns:
+        Die geschriebenen Bytes
+    """
+    payload = serialize_columnar(output_data, columnar_format)
+    atomic_write_bytes(path, payload)
+    logger.info(f"Columnar export saved to {path}")
+    return payload
+
+
+class ColumnarReader:
+    """Liest einen spaltenbasierten Export per Memory-Mapping
+
+    Die Datei wird nicht geparst, sondern eingeblendet; get() liefert NumPy-Views
+    direkt auf den gemappten Speicher (ohne Kopie). Das Laden aller Reihen ist
+    damit unabhängig von der Historienlänge praktisch sofort möglich.
+
+    Beispiel:
+        with ColumnarReader("economic_data.arrow") as reader:
+            days, values = reader.get("gdp")
+            dates = days.astype('datetime64[D]')  # Kopie nur bei Bedarf
+    """
+
+    def __init__(self, path: str):
+        """Öffnet und mappt die Datei
+
+        Args:
+            path: Pfad zum Export (Arrow IPC oder Rohformat, wird am Magic erkannt)
+        """
+        if np is None:
+            raise ImportError("ColumnarReader requires numpy")
+
+        self.path = path
+        self._mmap = None
+        self._arrow_source = None
+        self._days = None
+        self._values = None
+        self._file = open(path, 'rb')
+
+        # Bei Fehlern (leere Datei, beschädigter Header, fehlendes pyarrow) Datei und Mapping freigeben
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mmap[:len(ARROW_MAGIC)] == ARROW_MAGIC:
+                self._open_arrow()
+            elif self._mmap[:len(RAW_MAGIC)] == RAW_MAGIC:
+                self._open_raw()
+            else:
+                raise ValueError(f"Unknown columnar format: {path}")
+        except BaseException:
+            self.close()
+            raise
+
+    def _open_arrow(self) -> None:
+        """Arrow-IPC: Batch über pyarrows eigenes Memory-Mapping lesen (zero-copy)"""
+        if pa is None:
+            raise ImportError("Reading Arrow IPC exports requires pyarrow")
+
+        self._arrow_source = pa.memory_map(self.path, 'r')
+        batch = pa.ipc.open_file(self._arrow_source).get_batch(0)
+        header = json.loads(batch.schema.metadata[b"wed"].decode('utf-8'))
+        self.meta = header.get('meta', {})
+        self._entries = header.get('datasets', {})
+
+        # date32 ist intern int32 - Datenpuffer direkt als Tage seit Epoche ansehen
+        dates = batch.column(0)
+        self._days = np.frombuffer(dates.buffers()[1], dtype='<i4', count=len(dates) + dates.offset)[dates.offset:]
+        self._values = batch.column(1).to_numpy(zero_copy_only=True)
+
+    def _open_raw(self) -> None:
+        """Rohformat: Header lesen, Daten bleiben im gemappten Speicher"""
+        header_length, = struct.unpack_from('<I', self._mmap, len(RAW_MAGIC))
+        start = len(RAW_MAGIC) + 4
+        header = json.loads(self._mmap[start:start + header_length].decode('utf-8'))
+        if header.get('version') != RAW_VERSION:
+            raise ValueError(f"Unsupported columnar format version: {header.get('version')}")
+        self.meta = header.get('meta', {})
+        self._entries = header.get('datasets', {})
+
+    def datasets(self) -> List[str]:
+        """IDs aller enthaltenen Datensätze"""
+        return list(self._entries)
+
+    def info(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        """Titel, Einheit und Länge eines Datensatzes (oder None)"""
+        entry = self._entries.get(dataset_id)
+        if entry is None:
+            return None
+        return {"title": entry.get('title'), "unit": entry.get('unit'), "length": entry['length']}
+
+    def get(self, dataset_id: str) -> Optional[Tuple['np.ndarray', 'np.ndarray']]:
+        """Zeitreihe eines Datensatzes als Views ohne Kopie
+
+        Args:
+            dataset_id: ID des Datensatzes
+
+        Returns:
+            (days, values): int32-Tage seit 1970-01-01 und float64-Werte, älteste zuerst;
+            None, falls der Datensatz nicht enthalten ist
+        """
+        entry = self._entries.get(dataset_id)
+        if entry is None:
+            return None
+
+        length = entry['length']
+        if self._arrow_source is not None:
+            start = entry['start']
+            return self._days[start:start + length], self._values[start:start + length]
+
+        days = np.frombuffer(self._mmap, dtype='<i4', count=length, offset=entry['dates_offset'])
+        values = np.frombuffer(self._mmap, dtype='<f8', count=length, offset=entry['values_offset'])
+        return days, values
+
+    def load_all(self) -> Dict[str, Tuple['np.ndarray', 'np.ndarray']]:
+        """Alle Zeitreihen als Views (siehe get)"""
+        return {dataset_id: self.get(dataset_id) for dataset_id in self._entries}
+
+    def to_timeseries(self, dataset_id: str) -> Optional[TimeSeries]:
+        """Kopiert einen Datensatz in eine TimeSeries (z.B. für die Weiterverarbeitung im Updater)"""
+        views = self.get(dataset_id)
+        if views is None:
+            return None
+        days, values = views
+        ordinals = array('i')
+        ordinals.frombytes((days.astype(np.int32) + _EPOCH_ORDINAL).tobytes())
+        value_array = array('d')
+        value_array.frombytes(values.astype(np.float64).tobytes())
+        return TimeSeries(ordinals, value_array)
+
+    def close(self) -> None:
+        """Gibt das Mapping frei (vorher erzeugte Views dürfen danach nicht mehr benutzt werden)"""
+        self._days = None
+        self._values = None
+        if self._arrow_source is not None:
+            self._arrow_source.close()
+            self._arrow_source = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Noch existierende Views halten das Mapping - wird mit ihnen freigegeben
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
@@ -2,19 +2,26 @@
 # data_updater.py - Orchestriert regelmäßige Datenaktualisierung für WED
 
 import os
+import sys
 import json
+import signal
 import logging
+import argparse
+import time
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
-from api_manager import api_manager
-from sources.fred_source import create_fred_source
+from typing import Dict, List, Set, Tuple, Optional
+from api_manager import get_api_manager
+from sources import SOURCE_FACTORIES, create_source
+from sources.timeseries import TimeSeries
+from sources.metrics import metrics
+from sources.tracing import tracer, profiling, env_flag, TRACE_ENV, PROFILE_ENV
+from output_writer import ShardedOutputWriter, ArtifactPublisher, atomic_write_json
+from downsampling import build_views, validate_view_targets
 
-# Logging konfigurieren
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging wird zusammen mit dem API-Manager konfiguriert (configure_logging)
 logger = logging.getLogger('data_updater')
 
 class WEDDataUpdater:
@@ -25,13 +32,108 @@ class WEDDataUpdater:
     - Orchestriert Datenabfrage von verschiedenen APIs
     - Konsolidiert Daten in einheitliche JSON-Struktur
     - Behandelt Fehler und Fallbacks
+    - Optional paralleler Abruf über einen begrenzten Thread-Pool
+    - Optional inkrementeller Abruf (nur neue Beobachtungen)
+    - Optional Änderungserkennung per Revisionsstempel vor dem Abruf (probe)
+    - Atomares Schreiben, optional zusätzlich als Shard pro Datensatz
+    - Optional spaltenbasierter Binär-Export (Arrow IPC bzw. Rohformat) für Analysen
+    - Optional abgeleitete Reihen (yoy, rolling_mean, Spreads) aus deklarativen Ausdrücken
+    - Optional auf einen gemeinsamen Kalender ausgerichtete Multi-Serien-Ansichten
     """
     
-    def __init__(self, config_file: str = "api_config.json", output_file: str = "economic_data.json"):
+    def __init__(self, config_file: str = "api_config.json", output_file: str = "economic_data.json",
+                 max_workers: int = None, incremental: bool = None, trace: bool = None,
+                 probe: bool = None):
         self.config_file = config_file
         self.output_file = output_file
         self.config = self._load_config()
         self.registered_sources = {}
+        self.api_manager = get_api_manager()
+        
+        # Anzahl paralleler Abrufe (1 = sequentiell wie bisher)
+        updater_config = self.config.get('updater', {})
+        self.max_workers = max_workers if max_workers is not None else updater_config.get('max_workers', 1)
+        
+        # Inkrementeller Modus: nur Beobachtungen ab dem letzten gespeicherten Datum abrufen
+        self.incremental = incremental if incremental is not None else updater_config.get('incremental', False)
+        # Anzahl der zuletzt gespeicherten Beobachtungen, die erneut abgefragt werden (Revisionen)
+        self.incremental_overlap = max(1, updater_config.get('incremental_overlap', 1))
+        # Anzahl der nach dem Zusammenführen behaltenen Beobachtungen - wie das Standard-Fenster
+        # des vollständigen Abrufs (60); 0/null behält die gesamte aufgelaufene Historie
+        self.incremental_retention = updater_config.get('incremental_retention', 60) or None
+        
+        # Probe-then-fetch: Revisionsstempel der Quelle prüfen, unveränderte Datensätze übernehmen
+        self.probe = probe if probe is not None else updater_config.get('probe', False)
+        
+        # Output: monolithische Datei (Dashboard) und/oder ein Shard pro Datensatz plus Manifest
+        output_config = self.config.get('output', {})
+        self.write_monolithic = output_config.get('monolithic', True)
+        self.shard_writer = None
+        if output_config.get('sharded', False):
+            shard_dir = output_config.get('shard_dir', os.path.splitext(self.output_file)[0])
+            self.shard_writer = ShardedOutputWriter(shard_dir)
+        
+        # Vorkomprimierte .gz/.br-Varianten und Manifest mit Content-Hashes (ETag, Cache-Busting)
+        self.artifact_publisher = None
+        if output_config.get('precompress', False):
+            manifest_path = output_config.get(
+                'artifact_manifest', os.path.join(os.path.dirname(self.output_file), 'artifacts.json')
+            )
+            self.artifact_publisher = ArtifactPublisher(manifest_path)
+        
+        # Spaltenbasierter Binär-Export für Analysen (Arrow IPC oder Rohformat ohne pyarrow)
+        self.columnar_file = None
+        if output_config.get('columnar', False):
+            # Erst hier importieren - columnar_export lädt optional NumPy/pyarrow
+            from columnar_export import resolve_format
+            self.columnar_format = resolve_format(output_config.get('columnar_format', 'auto'))
+            extension = '.arrow' if self.columnar_format == 'arrow' else '.wedcol'
+            self.columnar_file = output_config.get(
+                'columnar_file', os.path.splitext(self.output_file)[0] + extension
+            )
+        
+        # Reduzierte Chart-Ansichten pro Datensatz, z.B. "views": [200, 1000, "full"]
+        self.view_targets = validate_view_targets(output_config.get('views', []))
+        self.view_method = output_config.get('view_method', 'lttb')
+        
+        # Abgeleitete Reihen, z.B. "derived": {"series": {"inflation_yoy": "yoy(inflation)"}}
+        self.derived_engine = None
+        derived_config = self.config.get('derived', {})
+        if derived_config.get('series'):
+            try:
+                # Erst hier importieren - derived lädt NumPy
+                from derived import DerivedEngine
+                self.derived_engine = DerivedEngine(derived_config)
+            except ImportError as e:
+                logger.error(f"Derived series disabled: {str(e)}")
+        
+        # Ausgerichtete Multi-Serien-Ansichten (gemeinsamer Datumsindex) als eigene Datei,
+        # z.B. "aligned": {"views": {"macro": {"datasets": ["gdp", "inflation"], "frequency": "M"}}}
+        self.alignment_engine = None
+        aligned_config = self.config.get('aligned', {})
+        if aligned_config.get('views'):
+            try:
+                # Erst hier importieren - resampling lädt NumPy
+                from resampling import AlignmentEngine
+                self.alignment_engine = AlignmentEngine(aligned_config)
+            except ImportError as e:
+                logger.error(f"Aligned views disabled: {str(e)}")
+        self.aligned_file = aligned_config.get('file', os.path.splitext(self.output_file)[0] + '.aligned.json')
+        
+        # Prometheus-Textfile für den node_exporter, z.B. "metrics": {"textfile": "wed.prom"}
+        self.metrics_textfile = self.config.get('metrics', {}).get('textfile')
+        
+        # Tracing (Chrome-Trace-JSON) und optionales Profiling, aktivierbar auch per WED_TRACE / WED_PROFILE
+        tracing_config = self.config.get('tracing', {})
+        if trace is None:
+            trace = tracing_config.get('enabled', False) or env_flag(TRACE_ENV)
+        self.trace = trace
+        self.trace_file = tracing_config.get('file', os.path.splitext(self.output_file)[0] + '.trace.json')
+        self.profile = os.environ.get(PROFILE_ENV) or tracing_config.get('profile')
+        
+        # Bestehende Output-Datei wird pro Lauf nur einmal gelesen
+        self._existing_output = None
+        self._existing_output_lock = threading.Lock()
         
         # API-Manager vorbereiten
         self._setup_api_sources()
@@ -53,30 +155,60 @@ class WEDDataUpdater:
     def _setup_api_sources(self):
         """Registriert alle konfigurierten API-Quellen im API-Manager"""
         
-        # FRED-Quelle registrieren
-        if 'fred' in self.config.get('sources', {}):
-            fred_config = self.config['sources']['fred']
-            fred_api_key = self.config.get('api_keys', {}).get('fred', '')
+        # Alle konfigurierten Quellen mit Implementierung in der Registry (sources.SOURCE_FACTORIES);
+        # Quellen-Module werden erst hier importiert. Dateien der Quellen (z.B. Metadaten-Cache)
+        # liegen wie der Antwort-Cache neben der Konfigurationsdatei
+        config_dir = os.path.dirname(os.path.abspath(self.config_file)) if os.path.exists(self.config_file) else None
+        for source_name, source_config in self.config.get('sources', {}).items():
+            if source_name not in SOURCE_FACTORIES:
+                logger.warning(f"No implementation for source '{source_name}' - skipping")
+                continue
             
-            if fred_api_key:
-                fred_source = create_fred_source(fred_config, fred_api_key)
-                api_manager.register_source('fred', fred_source)
-                self.registered_sources['fred'] = fred_config['datasets']
-                logger.info("FRED source registered")
+            api_key = self.config.get('api_keys', {}).get(source_name, '')
+            if api_key:
+                source = create_source(source_name, source_config, api_key, config_dir)
+                self.api_manager.register_source(source_name, source)
+                self.registered_sources[source_name] = source_config['datasets']
+                logger.info(f"{source_name.upper()} source registered")
             else:
-                logger.warning("FRED API key missing - skipping FRED registration")
-        
-        # Hier können weitere Quellen hinzugefügt werden:
-        # self._setup_eurostat()
-        # self._setup_tradingeconomics()
+                logger.warning(f"{source_name.upper()} API key missing - skipping {source_name.upper()} registration")
     
-    def update_all_data(self) -> Dict:
+    def update_all_data(self, max_workers: int = None) -> Dict:
         """Aktualisiert alle konfigurierten Datensätze
         
+        Args:
+            max_workers: Anzahl paralleler Abrufe, überschreibt die Konfiguration.
+                         Bei 1 werden die Datensätze nacheinander abgerufen.
+        
         Returns:
             Vollständige Datenstruktur für economic_data.json
         """
-        logger.info("Starting full data update...")
+        workers = max_workers if max_workers is not None else self.max_workers
+        mode = "incremental" if self.incremental else "full"
+        
+        # Tracing nur für diesen Lauf einschalten; ein bereits aktiver Tracer (z.B. des Aufrufers) bleibt unberührt
+        own_trace = self.trace and not tracer.enabled
+        if own_trace:
+            tracer.enable()
+        try:
+            with profiling(self.profile, os.path.splitext(self.output_file)[0]), \
+                    tracer.span('update_all_data', mode=mode, workers=workers):
+                return self._run_update(workers, mode)
+        finally:
+            if self.trace:
+                self._write_trace()
+            if own_trace:
+                # Globalen Tracer zurücksetzen, damit spätere Läufe im Prozess nicht weiter sammeln
+                tracer.disable()
+                tracer.reset()
+    
+    def _run_update(self, workers: int, mode: str) -> Dict:
+        """Führt einen vollständigen Update-Lauf aus (siehe update_all_data)"""
+        logger.info(f"Starting {mode} data update (workers: {workers})...")
+        started = time.perf_counter()
+        
+        # Bestehende Output-Datei für diesen Lauf neu einlesen
+        self._existing_output = None
         
         # Basis-Struktur für Output
         output_data = {
@@ -88,63 +220,289 @@ class WEDDataUpdater:
             "datasets": {}
         }
         
-        total_datasets = 0
+        # Alle Aufträge in Konfigurationsreihenfolge - bestimmt auch die Reihenfolge im Output
+        jobs = [
+            (source_name, dataset_id)
+            for source_name, datasets in self.registered_sources.items()
+            for dataset_id in datasets.keys()
+        ]
+        
+        results, unchanged = self._run_jobs(jobs, workers)
+        
+        total_datasets = len(jobs)
         successful_updates = 0
         
-        # Alle registrierten Quellen durchgehen
+        # Ergebnisse deterministisch in Auftragsreihenfolge zusammenführen
         for source_name, datasets in self.registered_sources.items():
-            logger.info(f"Updating data from {source_name}...")
-            
-            source_summary = {
+            output_data["meta"]["update_summary"][source_name] = {
                 "total": len(datasets),
                 "successful": 0,
+                "unchanged": 0,
                 "failed": 0,
                 "errors": []
             }
+        
+        for (source_name, dataset_id), (formatted, error) in zip(jobs, results):
+            source_summary = output_data["meta"]["update_summary"][source_name]
             
-            # Alle Datensätze der Quelle aktualisieren
-            for dataset_id in datasets.keys():
-                try:
-                    total_datasets += 1
-                    
-                    # Daten über API-Manager abrufen
-                    data = api_manager.fetch_data(source_name, dataset_id)
-                    
-                    if 'error' not in data:
-                        # Erfolgreiche Aktualisierung
-                        output_data['datasets'][dataset_id] = self._format_dataset_for_output(data, dataset_id)
-                        successful_updates += 1
-                        source_summary["successful"] += 1
-                        logger.info(f"✅ Updated {dataset_id}")
-                    else:
-                        # Fehler beim Abrufen
-                        source_summary["failed"] += 1
-                        source_summary["errors"].append(f"{dataset_id}: {data['error']}")
-                        logger.error(f"❌ Failed to update {dataset_id}: {data['error']}")
-                        
-                        # Fallback: Alte Daten beibehalten wenn möglich
-                        old_data = self._load_existing_dataset(dataset_id)
-                        if old_data:
-                            output_data['datasets'][dataset_id] = old_data
-                            logger.info(f"🔄 Using cached data for {dataset_id}")
-                
-                except Exception as e:
-                    source_summary["failed"] += 1
-                    error_msg = f"Unexpected error: {str(e)}"
-                    source_summary["errors"].append(f"{dataset_id}: {error_msg}")
-                    logger.error(f"❌ Exception updating {dataset_id}: {error_msg}")
-                    logger.debug(traceback.format_exc())
+            if error is None:
+                successful_updates += 1
+                source_summary["successful"] += 1
+                if dataset_id in unchanged:
+                    source_summary["unchanged"] += 1
+            else:
+                source_summary["failed"] += 1
+                source_summary["errors"].append(f"{dataset_id}: {error}")
             
-            output_data["meta"]["update_summary"][source_name] = source_summary
+            if formatted is not None:
+                output_data['datasets'][dataset_id] = formatted
         
         # Update-Statistiken
         logger.info(f"Update complete: {successful_updates}/{total_datasets} datasets updated successfully")
+        metrics.set('wed_update_datasets', successful_updates, status='successful')
+        metrics.set('wed_update_datasets', total_datasets - successful_updates, status='failed')
+        metrics.set('wed_update_datasets', len(unchanged), status='unchanged')
+        metrics.set('wed_update_duration_seconds', time.perf_counter() - started)
+        
+        # Metriken pro Quelle (Latenzen, Cache, Retries, Wartezeiten, Bytes) in den Output übernehmen
+        for source_name, source_summary in output_data["meta"]["update_summary"].items():
+            source_summary["metrics"] = metrics.snapshot(source=source_name)
         
-        # Daten speichern
-        self._save_data(output_data)
+        if self.derived_engine is not None:
+            derived_summary, carried = self._apply_derived(output_data['datasets'])
+            output_data["meta"]["derived_summary"] = derived_summary
+            unchanged = unchanged | carried
+        
+        if self.alignment_engine is not None:
+            output_data["meta"]["aligned_summary"] = self._save_aligned(output_data['datasets'])
+        
+        # Daten speichern (unveränderte Shards ohne erneute Serialisierung)
+        self._save_data(output_data, unchanged=unchanged)
+        
+        metrics.set('wed_update_last_success_timestamp_seconds', time.time())
+        self._write_metrics()
         
         return output_data
     
+    def _run_jobs(self, jobs: List[Tuple[str, str]], workers: int,
+                  refresh: bool = False) -> Tuple[List[Tuple[Optional[Dict], Optional[str]]], Set[str]]:
+        """Aktualisiert Datensätze, bei workers > 1 parallel
+        
+        Mit probe werden zuerst die Revisionsstempel der Quellen geprüft: Datensätze,
+        deren gespeicherter Stempel noch aktuell ist, werden ohne Abruf aus dem
+        bestehenden Output übernommen.
+        
+        Args:
+            jobs: Liste von (source_name, dataset_id)
+            workers: Anzahl paralleler Abrufe
+            refresh: Cache des API-Managers umgehen
+            
+        Returns:
+            Tupel (Ergebnis je Auftrag wie bei _update_dataset, IDs übernommener Datensätze)
+        """
+        revisions = self._probe_revisions(jobs) if self.probe else {}
+        results = [None] * len(jobs)
+        unchanged = set()
+        pending = []
+        
+        for index, (source_name, dataset_id) in enumerate(jobs):
+            revision = revisions.get((source_name, dataset_id))
+            existing = self._load_existing_dataset(dataset_id) if revision is not None else None
+            if existing is not None and existing.get('revision') == revision:
+                results[index] = (existing, None)
+                unchanged.add(dataset_id)
+            else:
+                pending.append((index, source_name, dataset_id, revision))
+        
+        if unchanged:
+            logger.info(f"{len(unchanged)} datasets unchanged since last update - skipping download")
+        
+        def run(job):
+            _, source_name, dataset_id, revision = job
+            # Geänderter Stempel: ein noch frischer Cache-Eintrag enthält die alte Revision
+            return self._update_dataset(source_name, dataset_id, refresh or revision is not None, revision)
+        
+        if workers > 1 and len(pending) > 1:
+            # Parallel abrufen; Rate-Limits werden pro Quelle im API-Manager und in der Quelle eingehalten
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='wed-fetch') as executor:
+                for job, result in zip(pending, executor.map(run, pending)):
+                    results[job[0]] = result
+        else:
+            for job in pending:
+                results[job[0]] = run(job)
+        
+        return results, unchanged
+    
+    def _probe_revisions(self, jobs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """Fragt die Revisionsstempel aller Datensätze pro Quelle ab
+        
+        Returns:
+            {(source_name, dataset_id): stempel}; schlägt die Abfrage fehl, fehlen
+            die Datensätze der Quelle und werden normal abgerufen
+        """
+        datasets_by_source = {}
+        for source_name, dataset_id in jobs:
+            datasets_by_source.setdefault(source_name, []).append(dataset_id)
+        
+        revisions = {}
+        for source_name, dataset_ids in datasets_by_source.items():
+            source_module = self.api_manager.sources.get(source_name)
+            if not hasattr(source_module, 'get_revision_stamps'):
+                continue
+            try:
+                with tracer.span('probe_revisions', source=source_name, datasets=len(dataset_ids)):
+                    stamps = source_module.get_revision_stamps(dataset_ids)
+            except Exception as e:
+                logger.warning(f"Revision probe failed for {source_name}: {str(e)}. Fetching all datasets.")
+                continue
+            revisions.update({(source_name, dataset_id): stamp for dataset_id, stamp in stamps.items()})
+        return revisions
+    
+    def _write_metrics(self) -> None:
+        """Schreibt die Metriken als Prometheus-Textfile, falls konfiguriert"""
+        if not self.metrics_textfile:
+            return
+        try:
+            metrics.write_textfile(self.metrics_textfile)
+        except OSError as e:
+            logger.warning(f"Could not write metrics textfile: {str(e)}")
+    
+    def _write_trace(self) -> None:
+        """Schreibt die gesammelten Spans als Chrome-Trace-JSON"""
+        try:
+            tracer.write(self.trace_file)
+        except OSError as e:
+            logger.warning(f"Could not write trace file: {str(e)}")
+    
+    def _update_dataset(self, source_name: str, dataset_id: str, refresh: bool = False,
+                        revision: str = None) -> Tuple[Optional[Dict], Optional[str]]:
+        """Ruft einen einzelnen Datensatz ab und formatiert ihn für den Output
+        
+        Wird sowohl sequentiell als auch aus Worker-Threads aufgerufen und verändert
+        daher keinen gemeinsamen Zustand.
+        
+        Args:
+            source_name: Name der Datenquelle
+            dataset_id: ID des Datensatzes
+            refresh: Cache des API-Managers umgehen
+            revision: Revisionsstempel aus der Änderungserkennung, wird im Datensatz gespeichert
+            
+        Returns:
+            Tupel (formatierte Daten oder Fallback oder None, Fehlermeldung oder None)
+        """
+        with tracer.span('update_dataset', source=source_name, dataset=dataset_id):
+            try:
+                # Daten über API-Manager abrufen
+                data = self._fetch_dataset(source_name, dataset_id, refresh)
+                
+                if 'error' not in data:
+                    # Erfolgreiche Aktualisierung
+                    logger.info(f"✅ Updated {dataset_id}")
+                    formatted = self._format_dataset_for_output(data, dataset_id)
+                    if revision is not None:
+                        formatted['revision'] = revision
+                    return formatted, None
+                
+                # Fehler beim Abrufen
+                logger.error(f"❌ Failed to update {dataset_id}: {data['error']}")
+                
+                # Fallback: Alte Daten beibehalten wenn möglich
+                old_data = self._load_existing_dataset(dataset_id)
+                if old_data:
+                    logger.info(f"🔄 Using cached data for {dataset_id}")
+                return old_data, data['error']
+            
+            except Exception as e:
+                error_msg = f"Unexpected error: {str(e)}"
+                logger.error(f"❌ Exception updating {dataset_id}: {error_msg}")
+                logger.debug(traceback.format_exc())
+                return None, error_msg
+    
+    def _fetch_dataset(self, source_name: str, dataset_id: str, refresh: bool = False) -> Dict:
+        """Ruft einen Datensatz über den API-Manager ab
+        
+        Im inkrementellen Modus werden nur Beobachtungen ab dem letzten gespeicherten
+        Datum angefragt und mit den bestehenden Daten zusammengeführt. Ohne bestehende
+        Daten oder bei Quellen ohne Delta-Unterstützung wird vollständig abgerufen.
+        
+        Args:
+            source_name: Name der Datenquelle
+            dataset_id: ID des Datensatzes
+            refresh: Cache des API-Managers umgehen
+            
+        Returns:
+            Standardisierte Daten oder {'error': ...}
+        """
+        if self.incremental:
+            existing = self._load_existing_dataset(dataset_id)
+            historical = (existing or {}).get('data', {}).get('historical') or []
+            if not isinstance(historical, TimeSeries):
+                historical = TimeSeries.from_records(historical)
+            source_module = self.api_manager.sources.get(source_name)
+            
+            if historical and hasattr(source_module, 'get_incremental_params'):
+                # Ab dem Datum der n-letzten Beobachtung erneut abfragen, um Revisionen zu erfassen
+                start_date, _ = historical[-min(self.incremental_overlap, len(historical))]
+                params = source_module.get_incremental_params(start_date)
+                
+                if params is not None:
+                    delta = self.api_manager.fetch_data(source_name, dataset_id, params,
+                                                        allow_stale=False, refresh=refresh)
+                    if 'error' in delta:
+                        return delta
+                    
+                    logger.info(f"Incremental update for {dataset_id}: "
+                                f"{delta.get('meta', {}).get('count', 0)} observations since {start_date}")
+                    return self._merge_incremental(historical, delta, start_date)
+        
+        # Der Updater schreibt die Ausgabedatei - veraltete Cache-Einträge hier nicht verwenden
+        return self.api_manager.fetch_data(source_name, dataset_id, allow_stale=False, refresh=refresh)
+    
+    def _merge_incremental(self, existing: TimeSeries, delta: Dict, start_date: str) -> Dict:
+        """Führt neu abgerufene Beobachtungen mit den bestehenden zusammen
+        
+        Alle gespeicherten Beobachtungen ab start_date werden durch die frisch
+        abgerufenen ersetzt; dadurch werden revidierte Werte korrigiert. Danach
+        werden nur die neuesten incremental_retention Beobachtungen behalten, damit
+        die Historie nicht über das Fenster des vollständigen Abrufs hinauswächst.
+        
+        Args:
+            existing: Bestehende Beobachtungen
+            delta: Standardisierte Daten ab start_date
+            start_date: Startdatum der Delta-Abfrage (YYYY-MM-DD)
+            
+        Returns:
+            Standardisierte Datenstruktur mit zusammengeführter Historie
+        """
+        fresh = delta.get('data', {}).get('historical')
+        if not isinstance(fresh, TimeSeries):
+            fresh = TimeSeries.from_records(fresh or [])
+        
+        if fresh:
+            merged = existing.between(end_date=start_date)
+            if merged and merged.end_date == start_date:
+                merged = merged[:-1]
+            merged = merged.merge(fresh)
+        else:
+            # Keine neuen Daten - Bestand unverändert übernehmen
+            merged = existing
+        
+        if self.incremental_retention and len(merged) > self.incremental_retention:
+            merged = merged[-self.incremental_retention:]
+        
+        meta = dict(delta.get('meta', {}))
+        meta['count'] = len(merged)
+        # Abdeckung des Deltas gilt nicht für die zusammengeführte Reihe
+        meta.pop('coverage', None)
+        
+        return {
+            "meta": meta,
+            "data": {
+                "latest": merged.latest(),
+                "historical": merged
+            }
+        }
+    
     def _format_dataset_for_output(self, raw_data: Dict, dataset_id: str) -> Dict:
         """Formatiert API-Daten für economic_data.json
         
@@ -155,15 +513,169 @@ class WEDDataUpdater:
         Returns:
             Formatierte Daten für Output-JSON
         """
-        # Basis-Struktur aus der API-Antwort übernehmen
-        formatted = {
-            "title": self._get_dataset_title(dataset_id),
-            "unit": self._get_dataset_unit(dataset_id),
-            "data": raw_data.get('data', {})
-        }
+        with tracer.span('format_output', dataset=dataset_id):
+            # Basis-Struktur aus der API-Antwort übernehmen
+            formatted = {
+                "title": self._get_dataset_title(dataset_id),
+                "unit": self._get_dataset_unit(dataset_id),
+                "data": raw_data.get('data', {})
+            }
+            
+            if self.view_targets:
+                # Vorberechnete Ansichten neben der vollen Reihe, Frontend wählt passend zum Viewport
+                historical = formatted['data'].get('historical') or []
+                if not isinstance(historical, TimeSeries):
+                    historical = TimeSeries.from_records(historical)
+                views = build_views(historical, self.view_targets, self.view_method)
+                if views:
+                    formatted["views"] = {
+                        "method": self.view_method,
+                        "points": views
+                    }
+            
+            return formatted
+    
+    def _apply_derived(self, datasets: Dict[str, Dict], changed: List[str] = None) -> Tuple[Dict, Set[str]]:
+        """Berechnet abgeleitete Reihen und trägt sie in `datasets` ein
+        
+        Fehlende Eingaben werden aus dem bestehenden Output geladen. Reihen, deren
+        Eingaben sich seit dem gespeicherten Ergebnis nicht geändert haben (gleicher
+        Hash), werden unverändert übernommen; bei Fehlern bleibt die alte Reihe erhalten.
         
+        Args:
+            datasets: Formatierte Datensätze nach ID (wird ergänzt)
+            changed: Optional, nur Reihen bewerten, die von diesen Datensätzen abhängen (Teil-Update)
+            
+        Returns:
+            Tupel (Zusammenfassung, IDs unverändert übernommener Reihen)
+        """
+        engine = self.derived_engine
+        derived_ids = engine.dependents(changed) if changed is not None else engine.order
+        summary = {"total": len(derived_ids), "computed": 0, "cached": 0, "failed": 0, "errors": []}
+        if not derived_ids:
+            return summary, set()
+        
+        inputs = {}
+        for name in {name for derived_id in derived_ids for name in engine.definitions[derived_id]['inputs']}:
+            if name in derived_ids:
+                continue
+            historical = self._historical(datasets.get(name) or self._load_existing_dataset(name))
+            if historical is not None:
+                inputs[name] = historical
+        
+        stored_entries = {}
+        
+        def stored(derived_id):
+            entry = self._load_existing_dataset(derived_id)
+            digest = (entry or {}).get('derived', {}).get('hash')
+            if digest is None:
+                return None
+            stored_entries[derived_id] = entry
+            return digest, self._historical(entry) or TimeSeries()
+        
+        with tracer.span('derived', series=len(derived_ids)):
+            results = engine.compute(inputs, derived_ids, stored)
+        
+        carried = set()
+        for derived_id, result in results.items():
+            if result['status'] == 'error':
+                summary["failed"] += 1
+                summary["errors"].append(f"{derived_id}: {result['error']}")
+                old_data = self._load_existing_dataset(derived_id)
+                if old_data:
+                    datasets[derived_id] = old_data
+                continue
+            
+            summary[result['status']] += 1
+            entry = stored_entries.get(derived_id)
+            if result['status'] == 'cached' and entry is not None:
+                # Gespeicherte Reihe samt Ansichten übernehmen
+                datasets[derived_id] = entry
+                carried.add(derived_id)
+            else:
+                datasets[derived_id] = self._format_derived(derived_id, result['series'], result['hash'])
+        
+        logger.info(f"Derived series: {summary['computed']} computed, {summary['cached']} unchanged, "
+                    f"{summary['failed']} failed")
+        return summary, carried
+    
+    def _format_derived(self, derived_id: str, series: TimeSeries, digest: str) -> Dict:
+        """Formatiert eine abgeleitete Reihe wie einen abgerufenen Datensatz"""
+        definition = self.derived_engine.definitions[derived_id]
+        formatted = self._format_dataset_for_output(
+            {"data": {"latest": series.latest(), "historical": series}}, derived_id
+        )
+        if definition['title']:
+            formatted['title'] = definition['title']
+        if definition['unit']:
+            formatted['unit'] = definition['unit']
+        formatted['derived'] = {"expr": definition['expr'], "hash": digest}
         return formatted
     
+    def _save_aligned(self, datasets: Dict[str, Dict], changed: List[str] = None) -> Dict:
+        """Aktualisiert die ausgerichteten Ansichten und schreibt sie atomar
+        
+        Ansichten, deren Eingaben sich nicht geändert haben (gleicher Hash), werden
+        unverändert übernommen; ist keine neu berechnet, bleibt die Datei unberührt.
+        
+        Args:
+            datasets: Formatierte Datensätze nach ID, fehlende werden aus dem bestehenden Output geladen
+            changed: Optional, nur Ansichten mit diesen Datensätzen neu bewerten (Teil-Update)
+            
+        Returns:
+            Zusammenfassung (total, computed, cached, failed, errors)
+        """
+        engine = self.alignment_engine
+        view_ids = engine.dependents(changed) if changed is not None else list(engine.views)
+        summary = {"total": len(view_ids), "computed": 0, "cached": 0, "failed": 0, "errors": []}
+        if not view_ids:
+            return summary
+        
+        stored = {}
+        try:
+            if os.path.exists(self.aligned_file):
+                with open(self.aligned_file, 'r') as f:
+                    stored = json.load(f).get('views', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read aligned views {self.aligned_file}: {str(e)}")
+        
+        inputs = {}
+        for name in {name for view_id in view_ids for name in engine.views[view_id]['datasets']}:
+            historical = self._historical(datasets.get(name) or self._load_existing_dataset(name))
+            if historical is not None:
+                inputs[name] = historical
+        
+        with tracer.span('align_views', views=len(view_ids)):
+            results = engine.build(inputs, view_ids, stored)
+        
+        # Nicht mehr konfigurierte Ansichten entfernen, bei Fehlern die alte Fassung behalten
+        views = {view_id: view for view_id, view in stored.items() if view_id in engine.views}
+        for view_id, result in results.items():
+            if result['status'] == 'error':
+                summary["failed"] += 1
+                summary["errors"].append(f"{view_id}: {result['error']}")
+                continue
+            summary[result['status']] += 1
+            views[view_id] = result['view']
+        
+        if summary["computed"] or views.keys() != stored.keys():
+            atomic_write_json(self.aligned_file, {
+                "meta": {"last_updated": datetime.now().strftime("%d.%m.%Y %H:%M")},
+                "views": views
+            })
+            logger.info(f"Aligned views saved to {self.aligned_file} ({summary['computed']} rebuilt)")
+            if self.artifact_publisher is not None:
+                self.artifact_publisher.publish([self.aligned_file])
+        return summary
+    
+    @staticmethod
+    def _historical(dataset: Optional[Dict]) -> Optional[TimeSeries]:
+        """Zeitreihe eines formatierten oder gespeicherten Datensatzes oder None"""
+        historical = (dataset or {}).get('data', {}).get('historical')
+        if historical is None or isinstance(historical, TimeSeries):
+            return historical
+        return TimeSeries.from_records(historical)
+    
     def _get_dataset_title(self, dataset_id: str) -> str:
         """Gibt menschenlesbaren Titel für Dataset zurück"""
         titles = {
@@ -199,24 +711,90 @@ class WEDDataUpdater:
         Returns:
             Bestehende Daten oder None
         """
-        try:
-            if os.path.exists(self.output_file):
-                with open(self.output_file, 'r') as f:
-                    existing_data = json.load(f)
-                    return existing_data.get('datasets', {}).get(dataset_id)
-        except:
-            pass
-        return None
-    
-    def _save_data(self, data: Dict):
-        """Speichert konsolidierte Daten in JSON-Datei"""
-        try:
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            logger.info(f"Data saved to {self.output_file}")
-        except Exception as e:
-            logger.error(f"Failed to save data: {str(e)}")
-            raise
+        if self.shard_writer is not None and not self._existing_output:
+            # Nur den Shard dieses Datensatzes lesen statt der gesamten Datei
+            # (auch wenn eine fehlende Output-Datei bereits als leer geladen wurde)
+            dataset = self.shard_writer.load_dataset(dataset_id)
+            if dataset is not None:
+                return dataset
+        return self._load_existing_output().get('datasets', {}).get(dataset_id)
+    
+    def _load_existing_output(self) -> Dict:
+        """Lädt die bestehende Output-Datei (einmal pro Lauf, thread-sicher)
+        
+        Returns:
+            Bestehende Output-Struktur oder leeres Dictionary
+        """
+        with self._existing_output_lock:
+            if self._existing_output is None:
+                self._existing_output = {}
+                try:
+                    if os.path.exists(self.output_file):
+                        with open(self.output_file, 'r') as f:
+                            self._existing_output = json.load(f)
+                except:
+                    pass
+            return self._existing_output
+    
+    def _save_data(self, data: Dict, dataset_ids: List[str] = None, unchanged: Set[str] = frozenset()):
+        """Speichert konsolidierte Daten atomar (Temp-Datei + rename)
+        
+        Args:
+            data: Vollständige Output-Struktur
+            dataset_ids: Optional, nur diese Datensätze haben sich geändert
+                         (Shards der übrigen werden nicht angefasst)
+            unchanged: Datensätze, die unverändert aus dem bestehenden Output stammen;
+                       sind es alle, bleiben monolithische Datei und Binär-Export
+                       unberührt (Meta-Daten dort zeigen den letzten geänderten Lauf)
+        """
+        with tracer.span('save_data', datasets=len(dataset_ids) if dataset_ids is not None else 'all'):
+            try:
+                written = []
+                
+                if self.shard_writer is not None:
+                    self.shard_writer.write(data, dataset_ids, unchanged)
+                    written.extend(self.shard_writer.artifact_paths(dataset_ids))
+                
+                # Nur überspringen, wenn die Datei genau diese Datensätze enthält
+                all_unchanged = (dataset_ids is None and bool(data['datasets'])
+                                 and unchanged.issuperset(data['datasets'])
+                                 and self._load_existing_output().get('datasets', {}).keys() == data['datasets'].keys())
+                if self.write_monolithic and all_unchanged:
+                    logger.info(f"All datasets unchanged - {self.output_file} not rewritten")
+                elif self.write_monolithic:
+                    # Zeitreihen werden erst hier in die Dictionary-Form gebracht
+                    atomic_write_json(self.output_file, data, indent=2)
+                    written.append(self.output_file)
+                    logger.info(f"Data saved to {self.output_file}")
+                
+                if (self.columnar_file is not None and (dataset_ids is None or self.write_monolithic)
+                        and not (all_unchanged and os.path.exists(self.columnar_file))):
+                    # Nur mit vollständigen Daten - Teil-Updates ohne Monolith enthalten nur einen Datensatz
+                    from columnar_export import write_columnar
+                    write_columnar(self.columnar_file, data, self.columnar_format)
+                    written.append(self.columnar_file)
+                
+                if self.artifact_publisher is not None:
+                    self.artifact_publisher.publish(written)
+                
+                # Gespeicherter Stand ist ab jetzt die Basis für Fallbacks und Deltas
+                with self._existing_output_lock:
+                    if dataset_ids is None or self.write_monolithic:
+                        self._existing_output = data
+                    elif self._existing_output is not None:
+                        # Teil-Update ohne monolithische Datei: nur geänderte Datensätze übernehmen
+                        for dataset_id in dataset_ids:
+                            self._existing_output.setdefault('datasets', {})[dataset_id] = data['datasets'][dataset_id]
+            except Exception as e:
+                logger.error(f"Failed to save data: {str(e)}")
+                raise
+    
+    def close(self) -> None:
+        """Schließt die HTTP-Sessions aller von diesem Updater registrierten Quellen"""
+        for source_name in self.registered_sources:
+            source_module = self.api_manager.sources.get(source_name)
+            if source_module is not None and hasattr(source_module, 'close'):
+                source_module.close()
     
     def update_single_dataset(self, source: str, dataset_id: str) -> Dict:
         """Aktualisiert nur einen spezifischen Datensatz
@@ -231,22 +809,11 @@ class WEDDataUpdater:
         logger.info(f"Updating single dataset: {source}.{dataset_id}")
         
         try:
-            data = api_manager.fetch_data(source, dataset_id)
+            data = self._fetch_dataset(source, dataset_id)
             
             if 'error' not in data:
-                # Existierende Datei laden und updaten
-                try:
-                    with open(self.output_file, 'r') as f:
-                        existing_data = json.load(f)
-                except:
-                    existing_data = {"meta": {}, "datasets": {}}
-                
-                # Einzelnen Datensatz aktualisieren
-                existing_data['datasets'][dataset_id] = self._format_dataset_for_output(data, dataset_id)
-                existing_data['meta']['last_updated'] = datetime.now().strftime("%d.%m.%Y %H:%M")
-                
-                # Speichern
-                self._save_data(existing_data)
+                formatted = self._format_dataset_for_output(data, dataset_id)
+                self._save_datasets({dataset_id: formatted})
                 
                 logger.info(f"✅ Successfully updated {dataset_id}")
                 return data
@@ -259,18 +826,117 @@ class WEDDataUpdater:
             logger.error(error_msg)
             return {"error": error_msg}
 
+    def update_datasets(self, jobs: List[Tuple[str, str]], refresh: bool = False) -> List[Tuple[Optional[Dict], Optional[str]]]:
+        """Aktualisiert mehrere Datensätze und speichert nur die erfolgreich abgerufenen
+        
+        Args:
+            jobs: Liste von (source_name, dataset_id)
+            refresh: Cache des API-Managers umgehen (z.B. für den Scheduler)
+            
+        Returns:
+            Pro Auftrag (formatierte Daten oder None, Fehlermeldung oder None)
+        """
+        logger.info(f"Updating {len(jobs)} datasets...")
+        
+        results, unchanged = self._run_jobs(jobs, self.max_workers, refresh)
+        
+        updated = {dataset_id: formatted for (_, dataset_id), (formatted, error) in zip(jobs, results)
+                   if error is None and formatted is not None and dataset_id not in unchanged}
+        if updated:
+            self._save_datasets(updated)
+        
+        return [(formatted if error is None else None, error) for formatted, error in results]
+    
+    def _save_datasets(self, updated: Dict[str, Dict]) -> None:
+        """Speichert einzelne aktualisierte Datensätze (Teil-Update)
+        
+        Args:
+            updated: {dataset_id: formatierte Daten}
+        """
+        last_updated = datetime.now().strftime("%d.%m.%Y %H:%M")
+        
+        if self.derived_engine is not None:
+            # Abhängige abgeleitete Reihen neu bewerten, unveränderte nicht erneut speichern
+            updated = dict(updated)
+            _, carried = self._apply_derived(updated, list(updated))
+            for derived_id in carried:
+                del updated[derived_id]
+        
+        if self.alignment_engine is not None:
+            self._save_aligned(updated, list(updated))
+        
+        if self.shard_writer is not None and not self.write_monolithic:
+            # Nur die betroffenen Shards und das Manifest schreiben - O(geänderte Serien)
+            self._save_data({"meta": {"last_updated": last_updated}, "datasets": updated}, list(updated))
+        else:
+            # Existierende Datei laden und updaten
+            existing_data = self._load_existing_output() or {"meta": {}, "datasets": {}}
+            existing_data.setdefault('meta', {})
+            existing_data.setdefault('datasets', {})
+            
+            # Geänderte Datensätze übernehmen
+            existing_data['datasets'].update(updated)
+            existing_data['meta']['last_updated'] = last_updated
+            
+            # Speichern
+            self._save_data(existing_data, list(updated))
+
 # Hauptfunktionen für externe Verwendung
-def update_all():
-    """Aktualisiert alle Datensätze - Entry Point für Cron-Jobs"""
-    updater = WEDDataUpdater()
-    return updater.update_all_data()
+def update_all(max_workers: int = None, incremental: bool = None, trace: bool = None, probe: bool = None):
+    """Aktualisiert alle Datensätze - Entry Point für Cron-Jobs
+    
+    Args:
+        max_workers: Optional, Anzahl paralleler Abrufe (Standard aus der Konfiguration)
+        incremental: Optional, nur neue Beobachtungen abrufen (Standard aus der Konfiguration)
+        trace: Optional, Chrome-Trace des Laufs schreiben (Standard aus Konfiguration bzw. WED_TRACE)
+        probe: Optional, unveränderte Datensätze per Revisionsstempel überspringen (Standard aus der Konfiguration)
+    """
+    updater = WEDDataUpdater(max_workers=max_workers, incremental=incremental, trace=trace, probe=probe)
+    try:
+        return updater.update_all_data()
+    finally:
+        updater.close()
 
 def update_dataset(source: str, dataset_id: str):
     """Aktualisiert einzelnen Datensatz - Entry Point für gezielte Updates"""
     updater = WEDDataUpdater()
-    return updater.update_single_dataset(source, dataset_id)
+    try:
+        return updater.update_single_dataset(source, dataset_id)
+    finally:
+        updater.close()
+
+def run_scheduler(max_batches: int = None):
+    """Startet den frequenzbewussten Scheduler - Entry Point für den Daemon-Betrieb
+    
+    Aktualisiert nur fällige Serien statt aller (siehe scheduler.RefreshScheduler);
+    SIGTERM/SIGINT beenden ihn nach dem laufenden Durchlauf.
+    
+    Args:
+        max_batches: Optional, nach so vielen Durchläufen beenden
+    """
+    from scheduler import RefreshScheduler
+    
+    updater = WEDDataUpdater()
+    scheduler = RefreshScheduler(updater)
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: scheduler.stop())
+    try:
+        scheduler.run(max_batches=max_batches)
+    finally:
+        updater.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='WED data updater')
+    parser.add_argument('--schedule', action='store_true',
+                        help='Run as a long-running scheduler that refreshes only due series')
+    parser.add_argument('--max-batches', type=int, help='Scheduler: stop after this many refresh batches')
+    args = parser.parse_args()
+    
+    if args.schedule:
+        run_scheduler(max_batches=args.max_batches)
+        sys.exit(0)
+    
     # Vollständige Aktualisierung ausführen
     try:
         result = update_all()
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# derived.py - Abgeleitete Reihen (Veränderungsraten, gleitende Mittel, Spreads) zur Update-Zeit
+
+import ast
+import hashlib
+import logging
+import multiprocessing
+from array import array
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, Iterable, List, Optional, Set, Tuple
+from sources.timeseries import TimeSeries
+from sources.metrics import metrics
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger('data_updater')
+
+# Maximaler Abstand (Tage) zwischen Zieldatum und gefundener Beobachtung bei yoy/mom,
+# damit Tagesreihen mit Wochenenden und Feiertagen einen Vorjahreswert finden
+ASOF_TOLERANCE_DAYS = 7
+
+# Funktion -> (Anzahl Reihen-Argumente, Standardwert des optionalen Ganzzahl-Arguments oder None)
+FUNCTIONS = {
+    'yoy': (1, None),
+    'mom': (1, None),
+    'pct_change': (1, 1),
+    'diff': (1, 1),
+    'rolling_mean': (1, 12),
+    'rolling_sum': (1, 12),
+}
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+
+class DerivedExpressionError(ValueError):
+    """Ungültiger Ausdruck oder nicht auswertbare Eingaben"""
+
+
+def parse_expression(expr: str) -> Tuple[ast.Expression, Set[str]]:
+    """Parst und prüft einen Ausdruck wie "yoy(inflation)" oder "interest_rate_fed - interest_rate_ecb"
+
+    Erlaubt sind nur Datensatz-IDs, Zahlen, + - * /, Vorzeichen und die
+    Funktionen aus FUNCTIONS. Es wird nie Python-Code ausgeführt.
+
+    Args:
+        expr: Ausdruck
+
+    Returns:
+        Tupel (AST, referenzierte Datensatz-IDs)
+
+    Raises:
+        DerivedExpressionError: Bei Syntaxfehlern oder nicht erlaubten Konstrukten
+    """
+    try:
+        tree = ast.parse(expr, mode='eval')
+    except SyntaxError as e:
+        raise DerivedExpressionError(f"Invalid expression '{expr}': {e.msg}")
+
+    names = set()
+
+    def check(node):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise DerivedExpressionError(f"Unsupported constant {node.value!r} in '{expr}'")
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, _BINARY_OPERATORS):
+            check(node.left)
+            check(node.right)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, _UNARY_OPERATORS):
+            check(node.operand)
+        elif isinstance(node, ast.Call):
+            name = node.func.id if isinstance(node.func, ast.Name) else None
+            if name not in FUNCTIONS or node.keywords:
+                raise DerivedExpressionError(f"Unsupported function call in '{expr}'")
+            series_args, default = FUNCTIONS[name]
+            allowed = series_args + (1 if default is not None else 0)
+            if not series_args <= len(node.args) <= allowed:
+                raise DerivedExpressionError(f"{name}() takes {allowed} argument(s) in '{expr}'")
+            for arg in node.args[:series_args]:
+                check(arg)
+            for arg in node.args[series_args:]:
+                if not (isinstance(arg, ast.Constant) and type(arg.value) is int and arg.value > 0):
+                    raise DerivedExpressionError(f"{name}() expects a positive integer window in '{expr}'")
+        else:
+            kind = type(getattr(node, 'op', node)).__name__
+            raise DerivedExpressionError(f"Unsupported syntax '{kind}' in '{expr}'")
+
+    check(tree.body)
+    return tree, names
+
+
+def evaluate(expr: str, inputs: Dict[str, TimeSeries]) -> TimeSeries:
+    """Wertet einen Ausdruck vektorisiert mit NumPy aus
+
+    Reihen werden bei + - * / über gemeinsame Datumswerte verknüpft (Schnittmenge);
+    Zahlen wirken auf alle Werte. Nicht endliche Ergebnisse (z.B. Division durch 0)
+    werden verworfen. Läuft auch in Worker-Prozessen (nur picklebare Argumente).
+
+    Args:
+        expr: Ausdruck (siehe parse_expression)
+        inputs: Eingangsreihen nach Datensatz-ID
+
+    Returns:
+        Ergebnisreihe (älteste zuerst)
+
+    Raises:
+        DerivedExpressionError: Bei ungültigem Ausdruck, fehlenden Eingaben oder reinem Zahlenergebnis
+    """
+    if np is None:
+        raise ImportError("Derived series require numpy")
+    tree, _ = parse_expression(expr)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        result = _evaluate_node(tree.body, inputs)
+    if not isinstance(result, tuple):
+        raise DerivedExpressionError(f"Expression '{expr}' does not reference a series")
+
+    ordinals, values = result
+    finite = np.isfinite(values)
+    ordinals, values = ordinals[finite], values[finite]
+    out_ordinals = array('i')
+    out_ordinals.frombytes(ordinals.astype(np.int32).tobytes())
+    out_values = array('d')
+    out_values.frombytes(values.astype(np.float64).tobytes())
+    return TimeSeries(out_ordinals, out_values)
+
+
+def _evaluate_node(node: ast.AST, inputs: Dict[str, TimeSeries]):
+    """Liefert (ordinals, values) als NumPy-Arrays oder eine Zahl"""
+    if isinstance(node, ast.Name):
+        series = inputs.get(node.id)
+        if series is None:
+            raise DerivedExpressionError(f"Input '{node.id}' not available")
+        return (np.frombuffer(series.ordinals, dtype=np.int32).astype(np.int64),
+                np.frombuffer(series.values, dtype=np.float64))
+    if isinstance(node, ast.Constant):
+        return float(node.value)
+    if isinstance(node, ast.UnaryOp):
+        operand = _evaluate_node(node.operand, inputs)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        return (operand[0], -operand[1]) if isinstance(operand, tuple) else -operand
+    if isinstance(node, ast.BinOp):
+        return _apply_binary(node.op, _evaluate_node(node.left, inputs), _evaluate_node(node.right, inputs))
+
+    # ast.Call (durch parse_expression geprüft)
+    name = node.func.id
+    series_args, default = FUNCTIONS[name]
+    series = _evaluate_node(node.args[0], inputs)
+    if not isinstance(series, tuple):
+        raise DerivedExpressionError(f"{name}() expects a series")
+    window = node.args[1].value if len(node.args) > series_args else default
+    ordinals, values = series
+
+    if name == 'yoy':
+        return _calendar_change(ordinals, values, 12)
+    if name == 'mom':
+        return _calendar_change(ordinals, values, 1)
+    if name == 'pct_change':
+        return ordinals[window:], (values[window:] / values[:-window] - 1.0) * 100.0
+    if name == 'diff':
+        return ordinals[window:], values[window:] - values[:-window]
+
+    # rolling_mean / rolling_sum über `window` Beobachtungen per kumulierter Summe in O(n)
+    if len(values) < window:
+        return ordinals[:0], values[:0]
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    rolling = sums[window:] - sums[:-window]
+    if name == 'rolling_mean':
+        rolling = rolling / window
+    return ordinals[window - 1:], rolling
+
+
+def _apply_binary(op: ast.operator, left, right):
+    """Verknüpft zwei Operanden; zwei Reihen über ihre gemeinsamen Datumswerte"""
+    if isinstance(left, tuple) and isinstance(right, tuple):
+        ordinals, left_index, right_index = np.intersect1d(left[0], right[0], assume_unique=True,
+                                                           return_indices=True)
+        left_values, right_values = left[1][left_index], right[1][right_index]
+    elif isinstance(left, tuple):
+        ordinals, left_values, right_values = left[0], left[1], right
+    elif isinstance(right, tuple):
+        ordinals, left_values, right_values = right[0], left, right[1]
+    else:
+        ordinals, left_values, right_values = None, left, right
+
+    if isinstance(op, ast.Add):
+        values = left_values + right_values
+    elif isinstance(op, ast.Sub):
+        values = left_values - right_values
+    elif isinstance(op, ast.Mult):
+        values = left_values * right_values
+    else:
+        values = np.divide(left_values, right_values) if ordinals is not None else (
+            left_values / right_values if right_values else float('nan'))
+    return values if ordinals is None else (ordinals, values)
+
+
+def _calendar_change(ordinals, values, months: int):
+    """Prozentuale Veränderung gegenüber dem Wert `months` Kalendermonate zuvor
+
+    Gesucht wird die letzte Beobachtung am oder vor dem Zieldatum, höchstens
+    ASOF_TOLERANCE_DAYS davor; ohne passenden Vorwert entfällt der Punkt. Das
+    Zieldatum wird auf das Ende des Zielmonats begrenzt (31.03. -> 29.02.).
+    """
+    days = (ordinals - _EPOCH_ORDINAL).astype('datetime64[D]')
+    month_starts = days.astype('datetime64[M]')
+    offsets = days - month_starts.astype('datetime64[D]')
+    target_months = month_starts - months
+    targets = np.minimum(target_months.astype('datetime64[D]') + offsets,
+                         (target_months + 1).astype('datetime64[D]') - 1)
+    targets = targets.astype(np.int64) + _EPOCH_ORDINAL
+
+    index = np.searchsorted(ordinals, targets, side='right') - 1
+    found = index >= 0
+    clipped = np.where(found, index, 0)
+    found &= (targets - ordinals[clipped]) <= ASOF_TOLERANCE_DAYS
+    return ordinals[found], (values[found] / values[clipped[found]] - 1.0) * 100.0
+
+
+class DerivedEngine:
+    """Berechnet deklarativ konfigurierte abgeleitete Reihen aus den Datensätzen
+
+    Konfiguration (Abschnitt 'derived' in api_config.json), z.B.:
+        {"workers": 4, "parallel_min_points": 1000000,
+         "series": {"inflation_yoy": {"expr": "yoy(inflation)", "title": "Inflationsrate (USA)", "unit": "%"},
+                    "unemployment_avg": "rolling_mean(unemployment, 12)",
+                    "rate_spread": "interest_rate_fed - interest_rate_ecb"}}
+
+    Ausdrücke dürfen auch andere abgeleitete Reihen referenzieren. Jedes Ergebnis
+    ist mit einem SHA-256 über Ausdruck und Inhalt aller Eingangsreihen verknüpft;
+    stimmt der Hash mit dem des letzten Ergebnisses überein, wird nicht neu
+    berechnet. Große Stapel (mehr als parallel_min_points Eingangspunkte) werden
+    mit workers > 1 in einem Prozess-Pool ausgewertet.
+    """
+
+    def __init__(self, derived_config: Dict[str, Any]):
+        """Initialisiert die Engine und prüft alle Ausdrücke
+
+        Ungültige Ausdrücke und Zyklen werden protokolliert und ausgelassen.
+
+        Args:
+            derived_config: Abschnitt 'derived' der Konfiguration
+
+        Raises:
+            ImportError: Wenn NumPy nicht installiert ist
+        """
+        if np is None:
+            raise ImportError("Derived series require numpy")
+        self.workers = max(1, derived_config.get('workers', 1))
+        self.parallel_min_points = derived_config.get('parallel_min_points', 1000000)
+
+        # derived_id -> {"expr", "canonical", "inputs", "title", "unit"}
+        self.definitions: Dict[str, Dict[str, Any]] = {}
+        for derived_id, spec in derived_config.get('series', {}).items():
+            if isinstance(spec, str):
+                spec = {'expr': spec}
+            try:
+                tree, names = parse_expression(spec['expr'])
+            except (DerivedExpressionError, KeyError) as e:
+                logger.error(f"Skipping derived series {derived_id}: {str(e)}")
+                continue
+            self.definitions[derived_id] = {
+                'expr': spec['expr'],
+                'canonical': ast.dump(tree),
+                'inputs': sorted(names),
+                'title': spec.get('title'),
+                'unit': spec.get('unit')
+            }
+        self.order = self._dependency_order()
+
+        # derived_id -> (Hash, Ergebnis) des letzten Laufs in diesem Prozess
+        self._cache: Dict[str, Tuple[str, TimeSeries]] = {}
+
+    def _dependency_order(self) -> List[str]:
+        """Sortiert die Reihen so, dass abgeleitete Eingaben vorher berechnet werden"""
+        order = []
+        state = {}  # derived_id -> 'visiting' | 'done'
+
+        def visit(derived_id, path):
+            if state.get(derived_id) == 'done':
+                return True
+            if state.get(derived_id) == 'visiting':
+                logger.error(f"Skipping derived series {derived_id}: cycle {' -> '.join(path + [derived_id])}")
+                return False
+            state[derived_id] = 'visiting'
+            ok = all(visit(name, path + [derived_id])
+                     for name in self.definitions[derived_id]['inputs'] if name in self.definitions)
+            state[derived_id] = 'done'
+            if ok:
+                order.append(derived_id)
+            return ok
+
+        for derived_id in self.definitions:
+            visit(derived_id, [])
+        return order
+
+    def source_inputs(self) -> Set[str]:
+        """IDs aller referenzierten Datensätze, die keine abgeleiteten Reihen sind"""
+        return {name for definition in self.definitions.values()
+                for name in definition['inputs'] if name not in self.definitions}
+
+    def dependents(self, changed: Iterable[str]) -> List[str]:
+        """Abgeleitete Reihen, die direkt oder indirekt von `changed` abhängen (in Berechnungsreihenfolge)"""
+        affected = set(changed)
+        result = []
+        for derived_id in self.order:
+            if affected.intersection(self.definitions[derived_id]['inputs']):
+                affected.add(derived_id)
+                result.append(derived_id)
+        return result
+
+    def compute(self, inputs: Dict[str, TimeSeries], derived_ids: Iterable[str] = None,
+                stored: Callable[[str], Optional[Tuple[str, TimeSeries]]] = None) -> Dict[str, Dict[str, Any]]:
+        """Berechnet abgeleitete Reihen, unveränderte Eingaben werden nicht neu berechnet
+
+        Args:
+            inputs: Verfügbare Datensätze nach ID
+            derived_ids: Optional, nur diese Reihen (Standard: alle); abgeleitete
+                         Eingaben, die nicht berechnet werden, müssen in inputs stehen
+            stored: Optional, liefert (Hash, Reihe) eines gespeicherten Ergebnisses,
+                    z.B. aus der bestehenden Output-Datei
+
+        Returns:
+            {derived_id: {"series": Reihe oder None, "hash": Hash oder None,
+                          "status": "computed" | "cached" | "error", "error": Meldung}}
+        """
+        wanted = set(derived_ids) if derived_ids is not None else set(self.order)
+        available = dict(inputs)
+        results = {}
+        executor = None
+
+        try:
+            # Wellen: jede Welle enthält nur Reihen, deren Eingaben bereits vorliegen
+            remaining = [derived_id for derived_id in self.order if derived_id in wanted]
+            while remaining:
+                wave = [derived_id for derived_id in remaining
+                        if not any(name in wanted and name not in results
+                                   for name in self.definitions[derived_id]['inputs'])]
+                remaining = [derived_id for derived_id in remaining if derived_id not in wave]
+
+                pending = []
+                for derived_id in wave:
+                    result = self._lookup(derived_id, available, stored)
+                    if result['status'] == 'computed':
+                        pending.append(derived_id)
+                    results[derived_id] = result
+
+                points = sum(len(available[name]) for derived_id in pending
+                             for name in self.definitions[derived_id]['inputs'] if name in available)
+                if self.workers > 1 and len(pending) > 1 and points >= self.parallel_min_points:
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=min(self.workers, len(pending)),
+                                                       mp_context=multiprocessing.get_context('spawn'))
+                    futures = {derived_id: executor.submit(evaluate, self.definitions[derived_id]['expr'],
+                                                           self._inputs_for(derived_id, available))
+                               for derived_id in pending}
+                    outcomes = {derived_id: future.exception() or future.result()
+                                for derived_id, future in futures.items()}
+                else:
+                    outcomes = {}
+                    for derived_id in pending:
+                        try:
+                            outcomes[derived_id] = evaluate(self.definitions[derived_id]['expr'],
+                                                            self._inputs_for(derived_id, available))
+                        except Exception as e:
+                            outcomes[derived_id] = e
+
+                for derived_id, outcome in outcomes.items():
+                    result = results[derived_id]
+                    if isinstance(outcome, Exception):
+                        result.update(status='error', error=str(outcome), series=None)
+                    else:
+                        result['series'] = outcome
+                        self._cache[derived_id] = (result['hash'], outcome)
+
+                for derived_id in wave:
+                    result = results[derived_id]
+                    if result['series'] is not None:
+                        available[derived_id] = result['series']
+                    else:
+                        available.pop(derived_id, None)
+                    metrics.inc('wed_derived_series_total', result=result['status'])
+                    if result['status'] == 'error':
+                        logger.error(f"❌ Failed to compute {derived_id}: {result['error']}")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        return results
+
+    def _inputs_for(self, derived_id: str, available: Dict[str, TimeSeries]) -> Dict[str, TimeSeries]:
+        """Nur die Eingaben einer Reihe (begrenzt die Daten, die an Worker gehen)"""
+        return {name: available[name] for name in self.definitions[derived_id]['inputs'] if name in available}
+
+    def _lookup(self, derived_id: str, available: Dict[str, TimeSeries],
+                stored: Callable[[str], Optional[Tuple[str, TimeSeries]]]) -> Dict[str, Any]:
+        """Hash der Eingaben bilden und ein passendes früheres Ergebnis suchen"""
+        definition = self.definitions[derived_id]
+        missing = [name for name in definition['inputs'] if name not in available]
+        if missing:
+            return {"series": None, "hash": None, "status": "error",
+                    "error": f"Input(s) not available: {', '.join(missing)}"}
+
+        hasher = hashlib.sha256(definition['canonical'].encode('utf-8'))
+        for name in definition['inputs']:
+            hasher.update(name.encode('utf-8'))
+            available[name].update_hash(hasher)
+        digest = hasher.hexdigest()
+
+        cached = self._cache.get(derived_id)
+        if cached is None and stored is not None:
+            cached = stored(derived_id)
+        if cached is not None and cached[0] == digest:
+            self._cache[derived_id] = cached
+            return {"series": cached[1], "hash": digest, "status": "cached", "error": None}
+        return {"series": None, "hash": digest, "status": "computed", "error": None}
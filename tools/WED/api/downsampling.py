@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# downsampling.py - Reduzierte Chart-Ansichten (LTTB, Min/Max) für lange Zeitreihen
+
+import logging
+from array import array
+from typing import Dict, Iterable, List, Union
+from sources.timeseries import TimeSeries
+
+logger = logging.getLogger('data_updater')
+
+# Kleinste sinnvolle Ansicht: erster, ein mittlerer und letzter Punkt
+MIN_VIEW_POINTS = 3
+
+def lttb(series: TimeSeries, threshold: int) -> TimeSeries:
+    """Largest-Triangle-Three-Buckets: reduziert auf `threshold` Punkte
+
+    Erhält die visuelle Form (Spitzen, Knicke) deutlich besser als jedes n-te
+    Element. Erster und letzter Punkt bleiben immer erhalten. Laufzeit O(n).
+
+    Args:
+        series: Zeitreihe (älteste zuerst)
+        threshold: Gewünschte Anzahl Punkte (>= 3)
+
+    Returns:
+        Reduzierte Zeitreihe (unverändert, wenn sie bereits kurz genug ist)
+    """
+    n = len(series)
+    if threshold >= n or threshold < 3:
+        return series
+
+    xs = series.ordinals
+    ys = series.values
+    out_x = array('i', [xs[0]])
+    out_y = array('d', [ys[0]])
+
+    # Innere Punkte gleichmäßig auf threshold - 2 Buckets verteilen
+    bucket_size = (n - 2) / (threshold - 2)
+    selected = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Durchschnitt des nächsten Buckets als dritter Dreieckspunkt
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            avg_x, avg_y = xs[n - 1], ys[n - 1]
+        else:
+            count = next_end - next_start
+            avg_x = sum(xs[next_start:next_end]) / count
+            avg_y = sum(ys[next_start:next_end]) / count
+
+        ax, ay = xs[selected], ys[selected]
+        max_area = -1.0
+        best = start
+        for i in range(start, end):
+            area = abs((ax - avg_x) * (ys[i] - ay) - (ax - xs[i]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                best = i
+
+        out_x.append(xs[best])
+        out_y.append(ys[best])
+        selected = best
+
+    out_x.append(xs[n - 1])
+    out_y.append(ys[n - 1])
+    return TimeSeries(out_x, out_y)
+
+
+def minmax(series: TimeSeries, threshold: int) -> TimeSeries:
+    """Min/Max-Bucketing: pro Bucket Minimum und Maximum in zeitlicher Reihenfolge
+
+    Garantiert, dass alle Extremwerte sichtbar bleiben (z.B. für volatile
+    Tagesreihen). Erster und letzter Punkt bleiben erhalten.
+
+    Args:
+        series: Zeitreihe (älteste zuerst)
+        threshold: Maximale Anzahl Punkte (>= 4)
+
+    Returns:
+        Reduzierte Zeitreihe (unverändert, wenn sie bereits kurz genug ist)
+    """
+    n = len(series)
+    if threshold >= n or threshold < 4:
+        return series
+
+    xs = series.ordinals
+    ys = series.values
+    indices = [0]
+
+    buckets = (threshold - 2) // 2
+    bucket_size = (n - 2) / buckets
+    for bucket in range(buckets):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        if start >= end:
+            continue
+        lo = hi = start
+        for i in range(start + 1, end):
+            if ys[i] < ys[lo]:
+                lo = i
+            elif ys[i] > ys[hi]:
+                hi = i
+        indices.extend(sorted({lo, hi}))
+
+    indices.append(n - 1)
+    return TimeSeries(array('i', (xs[i] for i in indices)), array('d', (ys[i] for i in indices)))
+
+
+METHODS = {
+    'lttb': lttb,
+    'minmax': minmax
+}
+
+
+def build_views(series: TimeSeries, targets: Iterable[Union[int, str]], method: str = 'lttb') -> Dict[str, TimeSeries]:
+    """Berechnet reduzierte Ansichten einer Zeitreihe für mehrere Zielgrößen
+
+    Ansichten, die nicht kleiner als die volle Reihe wären (auch Zielgrößen unter
+    der Mindestgröße des Verfahrens), werden ausgelassen; die volle Auflösung steht
+    immer in data.historical.
+
+    Args:
+        series: Vollständige Zeitreihe
+        targets: Zielgrößen in Punkten, z.B. [200, 1000, "full"] ("full" wird übersprungen;
+                 siehe validate_view_targets)
+        method: 'lttb' oder 'minmax'
+
+    Returns:
+        Ansichten nach Punktanzahl als String-Schlüssel, z.B. {"200": TimeSeries}
+    """
+    downsample = METHODS.get(method)
+    if downsample is None:
+        logger.warning(f"Unknown downsampling method '{method}'. Using 'lttb'.")
+        downsample = lttb
+
+    views = {}
+    for target in targets:
+        if target == 'full':
+            continue
+        target = int(target)
+        if target >= len(series):
+            continue
+        view = downsample(series, target)
+        if len(view) < len(series):
+            views[str(target)] = view
+    return views
+
+
+def validate_view_targets(targets: Iterable[Union[int, str]]) -> List[int]:
+    """Prüft die konfigurierten Zielgrößen (output.views) einmalig beim Start
+
+    Ungültige Angaben (keine ganze Zahl, kleiner als MIN_VIEW_POINTS) werden
+    protokolliert und verworfen, statt später die Formatierung jedes Datensatzes
+    scheitern zu lassen.
+
+    Args:
+        targets: Zielgrößen aus der Konfiguration, z.B. [200, 1000, "full"]
+
+    Returns:
+        Gültige Zielgrößen ohne "full" und ohne Duplikate
+    """
+    valid = []
+    for target in targets:
+        if target == 'full':
+            continue
+        try:
+            points = int(target)
+            if isinstance(target, float) and points != target:
+                raise ValueError(target)
+        except (TypeError, ValueError):
+            logger.error(f"Invalid view target {target!r} - ignoring (expected an integer or \"full\")")
+            continue
+        if points < MIN_VIEW_POINTS:
+            logger.error(f"View target {target!r} is below {MIN_VIEW_POINTS} points - ignoring")
+            continue
+        if points not in valid:
+            valid.append(points)
+    return valid
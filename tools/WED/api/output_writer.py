@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# output_writer.py - Atomares Schreiben von economic_data.json und Shards pro Datensatz
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional
+from sources.timeseries import json_default
+
+try:
+    import brotli
+except ImportError:  # Brotli ist optional - dann nur .gz
+    brotli = None
+
+logger = logging.getLogger('data_updater')
+
+def atomic_write_bytes(path: str, payload: bytes) -> None:
+    """Schreibt eine Datei atomar (Temp-Datei im Zielverzeichnis + rename)
+
+    Leser sehen immer entweder die alte oder die vollständige neue Datei,
+    nie einen halb geschriebenen Stand.
+
+    Args:
+        path: Zielpfad
+        payload: Dateiinhalt
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    # mkstemp legt Dateien mit 0600 an - Rechte der bestehenden Datei übernehmen (Webserver muss lesen)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def serialize_json(data: Any, indent: Optional[int] = None) -> bytes:
+    """Serialisiert Output-Daten (inkl. TimeSeries) zu UTF-8-JSON"""
+    separators = None if indent else (',', ':')
+    return json.dumps(data, ensure_ascii=False, indent=indent, separators=separators,
+                      default=json_default).encode('utf-8')
+
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = None) -> bytes:
+    """Serialisiert Daten und schreibt sie atomar
+
+    Returns:
+        Die geschriebenen Bytes
+    """
+    payload = serialize_json(data, indent)
+    atomic_write_bytes(path, payload)
+    return payload
+
+
+class ShardedOutputWriter:
+    """Schreibt jeden Datensatz in eine eigene Shard-Datei plus kleines Manifest
+
+    Struktur im Zielverzeichnis:
+    - <dataset_id>.json: Ein Datensatz im Format von economic_data.json['datasets'][id]
+    - manifest.json: Output-Meta und pro Datensatz Dateiname, SHA-256 und Größe
+
+    Shards werden nur neu geschrieben, wenn sich ihr Inhalt (Hash) geändert hat;
+    das Manifest wird als letztes atomar ersetzt.
+    """
+
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, output_dir: str):
+        """Initialisiert den Writer
+
+        Args:
+            output_dir: Verzeichnis für Shards und Manifest
+        """
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, self.MANIFEST_FILE)
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Lädt das Manifest (oder ein leeres, falls noch keines existiert)"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifest = {}
+        manifest.setdefault('meta', {})
+        manifest.setdefault('datasets', {})
+        return manifest
+
+    def load_dataset(self, dataset_id: str) -> Optional[Dict]:
+        """Lädt einen einzelnen Datensatz aus seinem Shard
+
+        Returns:
+            Datensatz oder None, falls kein Shard existiert
+        """
+        try:
+            with open(self._shard_path(dataset_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def load_all(self) -> Dict[str, Any]:
+        """Setzt die vollständige Output-Struktur aus Manifest und Shards zusammen"""
+        manifest = self.load_manifest()
+        datasets = {}
+        for dataset_id in manifest['datasets']:
+            dataset = self.load_dataset(dataset_id)
+            if dataset is not None:
+                datasets[dataset_id] = dataset
+        return {"meta": manifest['meta'], "datasets": datasets}
+
+    def write(self, output_data: Dict[str, Any], dataset_ids: Iterable[str] = None,
+              unchanged: Iterable[str] = ()) -> List[str]:
+        """Schreibt geänderte Shards und das Manifest
+
+        Args:
+            output_data: Output-Struktur mit 'meta' und 'datasets'
+            dataset_ids: Nur diese Datensätze prüfen/schreiben (Teil-Update); alle
+                         anderen Einträge des Manifests bleiben unverändert. Bei None
+                         gilt output_data als vollständig und verwaiste Shards werden
+                         entfernt.
+            unchanged: Datensätze, die bekanntermaßen unverändert sind (z.B. per
+                       Revisionsstempel) - ohne Serialisierung und Hash übernommen,
+                       sofern ihr Shard existiert
+
+        Returns:
+            IDs der tatsächlich neu geschriebenen Shards
+        """
+        manifest = self.load_manifest()
+        datasets = output_data.get('datasets', {})
+        full_write = dataset_ids is None
+        ids = list(datasets) if full_write else [i for i in dataset_ids if i in datasets]
+
+        unchanged = set(unchanged)
+        changed = []
+        for dataset_id in ids:
+            if (dataset_id in unchanged and dataset_id in manifest['datasets']
+                    and os.path.exists(self._shard_path(dataset_id))):
+                continue
+
+            payload = serialize_json(datasets[dataset_id])
+            digest = hashlib.sha256(payload).hexdigest()
+
+            entry = manifest['datasets'].get(dataset_id)
+            if entry and entry.get('sha256') == digest and os.path.exists(self._shard_path(dataset_id)):
+                continue
+
+            atomic_write_bytes(self._shard_path(dataset_id), payload)
+            manifest['datasets'][dataset_id] = {
+                "file": self._shard_file(dataset_id),
+                "sha256": digest,
+                "bytes": len(payload),
+                "updated": datetime.now().isoformat(timespec='seconds')
+            }
+            changed.append(dataset_id)
+
+        if full_write:
+            # Datensätze, die nicht mehr im Output sind, entfernen
+            for dataset_id in [i for i in manifest['datasets'] if i not in datasets]:
+                del manifest['datasets'][dataset_id]
+                try:
+                    os.unlink(self._shard_path(dataset_id))
+                except FileNotFoundError:
+                    pass
+            manifest['meta'] = output_data.get('meta', {})
+        else:
+            manifest['meta'].update(output_data.get('meta', {}))
+
+        atomic_write_json(self.manifest_path, manifest, indent=2)
+        logger.info(f"Wrote {len(changed)} changed shard(s) to {self.output_dir}")
+        return changed
+
+    def artifact_paths(self, dataset_ids: Iterable[str] = None) -> List[str]:
+        """Pfade der Shards (alle oder die angegebenen) plus Manifest"""
+        if dataset_ids is None:
+            dataset_ids = self.load_manifest()['datasets'].keys()
+        paths = [self._shard_path(dataset_id) for dataset_id in dataset_ids]
+        paths.append(self.manifest_path)
+        return [path for path in paths if os.path.exists(path)]
+
+    def _shard_file(self, dataset_id: str) -> str:
+        """Dateiname eines Shards"""
+        return f"{dataset_id}.json"
+
+    def _shard_path(self, dataset_id: str) -> str:
+        """Vollständiger Pfad eines Shards"""
+        return os.path.join(self.output_dir, self._shard_file(dataset_id))
+
+
+class ArtifactPublisher:
+    """Erzeugt vorkomprimierte Geschwister (.gz, .br) und ein Manifest mit Content-Hashes
+
+    Für jede Datei enthält das Manifest SHA-256, einen ETag-Wert und einen
+    Cache-Busting-Dateinamen (z.B. economic_data.3f2a9c1b.json). Dateien, deren
+    Hash sich seit dem letzten Lauf nicht geändert hat, werden nicht erneut
+    komprimiert.
+    """
+
+    def __init__(self, manifest_path: str, gzip_level: int = 9, brotli_quality: int = 11):
+        """Initialisiert den Publisher
+
+        Args:
+            manifest_path: Pfad des Artefakt-Manifests; Einträge sind relativ zu dessen Verzeichnis
+            gzip_level: Kompressionsstufe für .gz (1-9)
+            brotli_quality: Qualitätsstufe für .br (0-11), nur wenn brotli installiert ist
+        """
+        self.manifest_path = manifest_path
+        self.base_dir = os.path.dirname(os.path.abspath(manifest_path))
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Lädt das Artefakt-Manifest (leer, falls nicht vorhanden)"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def publish(self, paths: Iterable[str]) -> List[str]:
+        """Aktualisiert Hashes und komprimierte Varianten der angegebenen Dateien
+
+        Args:
+            paths: Pfade frisch geschriebener (oder unveränderter) Artefakte
+
+        Returns:
+            Relative Pfade der Artefakte, die neu komprimiert wurden
+        """
+        manifest = self.load_manifest()
+        recompressed = []
+
+        for path in paths:
+            with open(path, 'rb') as f:
+                payload = f.read()
+            digest = hashlib.sha256(payload).hexdigest()
+            name = os.path.relpath(os.path.abspath(path), self.base_dir).replace(os.sep, '/')
+
+            entry = manifest.get(name)
+            if entry and entry.get('sha256') == digest and self._siblings_exist(path):
+                continue
+
+            stem, extension = os.path.splitext(os.path.basename(name))
+            entry = {
+                "sha256": digest,
+                "etag": f'"{digest[:32]}"',
+                "bytes": len(payload),
+                "hashed_name": f"{stem}.{digest[:8]}{extension}"
+            }
+
+            # mtime=0: gleicher Inhalt ergibt byte-identische .gz-Dateien
+            compressed = gzip.compress(payload, compresslevel=self.gzip_level, mtime=0)
+            atomic_write_bytes(path + '.gz', compressed)
+            entry["gzip_bytes"] = len(compressed)
+
+            if brotli is not None:
+                compressed = brotli.compress(payload, quality=self.brotli_quality)
+                atomic_write_bytes(path + '.br', compressed)
+                entry["br_bytes"] = len(compressed)
+
+            manifest[name] = entry
+            recompressed.append(name)
+
+        if recompressed:
+            atomic_write_json(self.manifest_path, manifest, indent=2)
+            logger.info(f"Precompressed {len(recompressed)} artifact(s)")
+        return recompressed
+
+    @staticmethod
+    def _siblings_exist(path: str) -> bool:
+        """Prüft, ob alle erwarteten komprimierten Varianten vorhanden sind"""
+        if not os.path.exists(path + '.gz'):
+            return False
+        return brotli is None or os.path.exists(path + '.br')
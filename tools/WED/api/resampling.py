@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# resampling.py - Ausrichtung gemischter Frequenzen auf einen gemeinsamen Kalender (Multi-Serien-Ansichten)
+
+import json
+import hashlib
+import logging
+from datetime import date
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+from sources.timeseries import TimeSeries
+from sources.metrics import metrics
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger('data_updater')
+
+# Zielfrequenzen (Kürzel wie FRED frequency_short); Perioden werden mit ihrem ersten Tag bezeichnet
+FREQUENCIES = ('D', 'W', 'M', 'Q', 'A')
+AGGREGATIONS = ('last', 'first', 'mean', 'sum', 'min', 'max')
+INTERPOLATIONS = ('none', 'ffill', 'linear')
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def period_ids(ordinals: 'np.ndarray', frequency: str) -> 'np.ndarray':
+    """Fortlaufende Periodennummern (seit 1970) für Tagesnummern
+
+    Wochen beginnen am Montag; Quartale im Januar, April, Juli und Oktober.
+    """
+    days = ordinals.astype(np.int64) - _EPOCH_ORDINAL
+    if frequency == 'D':
+        return days
+    if frequency == 'W':
+        # 1970-01-01 war ein Donnerstag
+        return (days + 3) // 7
+    months = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    if frequency == 'M':
+        return months
+    if frequency == 'Q':
+        return months // 3
+    return months // 12
+
+
+def period_starts(ids: 'np.ndarray', frequency: str) -> 'np.ndarray':
+    """Gegenstück zu period_ids: Tagesnummer des ersten Tags jeder Periode"""
+    if frequency == 'D':
+        days = ids
+    elif frequency == 'W':
+        days = ids * 7 - 3
+    else:
+        months = ids * {'M': 1, 'Q': 3, 'A': 12}[frequency]
+        days = months.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+    return days + _EPOCH_ORDINAL
+
+
+def aggregate(ordinals: 'np.ndarray', values: 'np.ndarray', frequency: str,
+              how: str = 'last') -> Tuple['np.ndarray', 'np.ndarray']:
+    """Fasst Beobachtungen pro Periode zusammen (z.B. Tageswerte zu Monatsmitteln)
+
+    Args:
+        ordinals: Aufsteigende Tagesnummern
+        values: Zugehörige Werte
+        frequency: Zielfrequenz aus FREQUENCIES
+        how: Aggregation aus AGGREGATIONS
+
+    Returns:
+        Tupel (Periodennummern, ein Wert pro Periode)
+    """
+    ids = period_ids(ordinals, frequency)
+    if not len(ids):
+        return ids, values.astype(np.float64)
+    # Eingabe ist sortiert - jede Periode ist ein zusammenhängender Abschnitt
+    starts = np.flatnonzero(np.concatenate(([True], ids[1:] != ids[:-1])))
+    counts = np.diff(np.concatenate((starts, [len(ids)])))
+
+    if how == 'last':
+        result = values[starts + counts - 1]
+    elif how == 'first':
+        result = values[starts]
+    elif how == 'sum':
+        result = np.add.reduceat(values, starts)
+    elif how == 'mean':
+        result = np.add.reduceat(values, starts) / counts
+    elif how == 'min':
+        result = np.minimum.reduceat(values, starts)
+    else:
+        result = np.maximum.reduceat(values, starts)
+    return ids[starts], result.astype(np.float64)
+
+
+def interpolate(column: 'np.ndarray', positions: 'np.ndarray', method: str,
+                coverage_end: Optional[float] = None) -> 'np.ndarray':
+    """Füllt Lücken einer ausgerichteten Spalte (NaN = kein Wert)
+
+    Es wird nie über die Daten hinaus extrapoliert: 'linear' füllt nur zwischen
+    zwei bekannten Werten, 'ffill' zusätzlich bis coverage_end (Ende der
+    Periode der letzten Beobachtung in der Ursprungsfrequenz).
+
+    Args:
+        column: Werte auf dem gemeinsamen Kalender
+        positions: Tagesnummern der Periodenanfänge (x-Achse für 'linear')
+        method: Interpolation aus INTERPOLATIONS
+        coverage_end: Erste Tagesnummer nach dem Gültigkeitsbereich der letzten Beobachtung
+
+    Returns:
+        Neue Spalte
+    """
+    known = ~np.isnan(column)
+    if method == 'none' or not known.any() or known.all():
+        return column
+
+    if method == 'linear':
+        filled = np.interp(positions, positions[known], column[known])
+        inside = (positions >= positions[known][0]) & (positions <= positions[known][-1])
+        return np.where(inside, filled, np.nan)
+
+    # ffill: Index des letzten bekannten Werts bis zu jeder Position
+    last = np.maximum.accumulate(np.where(known, np.arange(len(column)), -1))
+    filled = np.where(last >= 0, column[np.maximum(last, 0)], np.nan)
+    if coverage_end is not None:
+        filled[(positions >= coverage_end) & ~known] = np.nan
+    return filled
+
+
+def align(inputs: Dict[str, TimeSeries], frequency: str, aggregation: Dict[str, str] = None,
+          interpolation: Dict[str, str] = None, join: str = 'outer', start: str = None,
+          end: str = None) -> Tuple['np.ndarray', Dict[str, 'np.ndarray']]:
+    """Richtet mehrere Reihen auf einen gemeinsamen, lückenlosen Kalender aus
+
+    Feinere Reihen werden pro Periode aggregiert (z.B. täglich -> monatlich),
+    gröbere landen auf dem ersten Tag ihrer Periode und werden optional
+    interpoliert (z.B. quartalsweise -> monatlich).
+
+    Args:
+        inputs: Reihen nach Datensatz-ID (Reihenfolge = Spaltenreihenfolge)
+        frequency: Zielfrequenz aus FREQUENCIES
+        aggregation: Optional, Aggregation pro Datensatz (Standard 'last')
+        interpolation: Optional, Interpolation pro Datensatz (Standard 'none')
+        join: 'outer' (vom frühesten Beginn bis zum spätesten Ende) oder
+              'inner' (nur der Zeitraum, den alle Reihen abdecken)
+        start: Optional, erstes Datum (YYYY-MM-DD)
+        end: Optional, letztes Datum (YYYY-MM-DD)
+
+    Returns:
+        Tupel (Tagesnummern der Periodenanfänge, {Datensatz-ID: Werte mit NaN für Lücken})
+    """
+    aggregation = aggregation or {}
+    interpolation = interpolation or {}
+
+    aggregated = {}
+    for name, series in inputs.items():
+        ordinals = np.frombuffer(series.ordinals, dtype=np.int32).astype(np.int64)
+        values = np.frombuffer(series.values, dtype=np.float64)
+        ids, period_values = aggregate(ordinals, values, frequency, aggregation.get(name, 'last'))
+        # Gültigkeitsende der letzten Beobachtung: Median-Abstand der Ursprungsreihe
+        spacing = float(np.median(np.diff(ordinals))) if len(ordinals) > 1 else 1.0
+        coverage_end = float(ordinals[-1]) + spacing if len(ordinals) else None
+        aggregated[name] = (ids, period_values, coverage_end)
+
+    bounds = [(ids[0], ids[-1]) for ids, _, _ in aggregated.values() if len(ids)]
+    if not bounds:
+        return np.empty(0, dtype=np.int64), {name: np.empty(0) for name in inputs}
+    if join == 'inner':
+        first, last = max(lo for lo, _ in bounds), min(hi for _, hi in bounds)
+    else:
+        first, last = min(lo for lo, _ in bounds), max(hi for _, hi in bounds)
+    if start:
+        first = max(first, period_ids(np.array([date.fromisoformat(start).toordinal()]), frequency)[0])
+    if end:
+        last = min(last, period_ids(np.array([date.fromisoformat(end).toordinal()]), frequency)[0])
+    if last < first:
+        return np.empty(0, dtype=np.int64), {name: np.empty(0) for name in inputs}
+
+    calendar = np.arange(first, last + 1, dtype=np.int64)
+    positions = period_starts(calendar, frequency)
+
+    columns = {}
+    for name, (ids, period_values, coverage_end) in aggregated.items():
+        column = np.full(len(calendar), np.nan)
+        inside = (ids >= first) & (ids <= last)
+        column[ids[inside] - first] = period_values[inside]
+        method = interpolation.get(name, 'none')
+        if method != 'none' and len(ids):
+            column = _interpolate_with_context(column, positions, method, coverage_end,
+                                               ids, period_values, first, last, frequency)
+        columns[name] = column
+    return positions, columns
+
+
+def _interpolate_with_context(column, positions, method, coverage_end, ids, period_values,
+                              first, last, frequency):
+    """Interpoliert eine Spalte; die nächsten Werte vor und nach dem Fenster (start/end)
+    dienen als zusätzliche Stützstellen, damit die Ränder nicht leer bleiben"""
+    before = np.flatnonzero(ids < first)
+    after = np.flatnonzero(ids > last)
+    prefix = [before[-1]] if len(before) else []
+    suffix = [after[0]] if len(after) else []
+    if not prefix and not suffix:
+        return interpolate(column, positions, method, coverage_end)
+
+    extended_positions = np.concatenate((period_starts(ids[prefix], frequency), positions,
+                                         period_starts(ids[suffix], frequency)))
+    extended = np.concatenate((period_values[prefix], column, period_values[suffix]))
+    filled = interpolate(extended, extended_positions, method, coverage_end)
+    return filled[len(prefix):len(prefix) + len(column)]
+
+
+class AlignmentEngine:
+    """Erzeugt ausgerichtete Multi-Serien-Ansichten mit gemeinsamem Datumsindex
+
+    Konfiguration (Abschnitt 'aligned' in api_config.json), z.B.:
+        {"views": {"macro_monthly": {"datasets": ["gdp", "inflation", "unemployment", "interest_rate_fed"],
+                                     "frequency": "M", "aggregation": {"default": "last", "baltic_dry": "mean"},
+                                     "interpolation": {"gdp": "linear"}, "join": "outer", "start": "2000-01-01"}}}
+
+    aggregation und interpolation sind entweder ein Wert für alle Datensätze oder
+    ein Dictionary pro Datensatz mit optionalem "default". Jede Ansicht trägt einen
+    SHA-256 über Konfiguration und Inhalt der Eingangsreihen; solange er sich nicht
+    ändert, wird die gespeicherte Ansicht unverändert übernommen.
+    """
+
+    def __init__(self, aligned_config: Dict[str, Any]):
+        """Initialisiert die Engine und prüft alle Ansichten
+
+        Ungültige Ansichten werden protokolliert und ausgelassen.
+
+        Args:
+            aligned_config: Abschnitt 'aligned' der Konfiguration
+
+        Raises:
+            ImportError: Wenn NumPy nicht installiert ist
+        """
+        if np is None:
+            raise ImportError("Aligned views require numpy")
+
+        self.views: Dict[str, Dict[str, Any]] = {}
+        for view_id, spec in aligned_config.get('views', {}).items():
+            try:
+                self.views[view_id] = self._normalize(spec)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error(f"Skipping aligned view {view_id}: {str(e)}")
+
+    @staticmethod
+    def _normalize(spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Prüft eine Ansicht und löst Standardwerte pro Datensatz auf"""
+        datasets = list(spec['datasets'])
+        if not datasets:
+            raise ValueError("no datasets")
+        frequency = spec.get('frequency', 'M')
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"unknown frequency '{frequency}'")
+        join = spec.get('join', 'outer')
+        if join not in ('outer', 'inner'):
+            raise ValueError(f"unknown join '{join}'")
+
+        def per_dataset(value, default, allowed, kind):
+            if not isinstance(value, dict):
+                value = {'default': value if value is not None else default}
+            resolved = {name: value.get(name, value.get('default', default)) for name in datasets}
+            for name, method in resolved.items():
+                if method not in allowed:
+                    raise ValueError(f"unknown {kind} '{method}' for {name}")
+            return resolved
+
+        for key in ('start', 'end'):
+            if spec.get(key):
+                date.fromisoformat(spec[key])
+
+        return {
+            'datasets': datasets,
+            'frequency': frequency,
+            'aggregation': per_dataset(spec.get('aggregation'), 'last', AGGREGATIONS, 'aggregation'),
+            'interpolation': per_dataset(spec.get('interpolation'), 'none', INTERPOLATIONS, 'interpolation'),
+            'join': join,
+            'start': spec.get('start'),
+            'end': spec.get('end')
+        }
+
+    def inputs(self) -> Set[str]:
+        """IDs aller Datensätze, die in Ansichten vorkommen"""
+        return {name for view in self.views.values() for name in view['datasets']}
+
+    def dependents(self, changed: Iterable[str]) -> List[str]:
+        """Ansichten, die mindestens einen der geänderten Datensätze enthalten"""
+        changed = set(changed)
+        return [view_id for view_id, view in self.views.items() if changed.intersection(view['datasets'])]
+
+    def build(self, inputs: Dict[str, TimeSeries], view_ids: Iterable[str] = None,
+              stored: Dict[str, Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """Berechnet Ansichten, deren Eingaben sich seit der gespeicherten Fassung geändert haben
+
+        Args:
+            inputs: Verfügbare Datensätze nach ID
+            view_ids: Optional, nur diese Ansichten (Standard: alle)
+            stored: Optional, zuletzt gespeicherte Ansichten nach ID (mit "hash")
+
+        Returns:
+            {view_id: {"view": Ansicht oder None, "status": "computed" | "cached" | "error", "error": Meldung}}
+        """
+        stored = stored or {}
+        results = {}
+        for view_id in (view_ids if view_ids is not None else list(self.views)):
+            view = self.views[view_id]
+            missing = [name for name in view['datasets'] if name not in inputs]
+            if missing:
+                result = {"view": None, "status": "error",
+                          "error": f"Dataset(s) not available: {', '.join(missing)}"}
+            else:
+                digest = self._digest(view, inputs)
+                previous = stored.get(view_id)
+                if previous is not None and previous.get('hash') == digest:
+                    result = {"view": previous, "status": "cached", "error": None}
+                else:
+                    try:
+                        result = {"view": self._render(view, inputs, digest), "status": "computed", "error": None}
+                    except Exception as e:
+                        result = {"view": None, "status": "error", "error": str(e)}
+
+            if result['status'] == 'error':
+                logger.error(f"❌ Failed to build aligned view {view_id}: {result['error']}")
+            metrics.inc('wed_aligned_views_total', result=result['status'])
+            results[view_id] = result
+        return results
+
+    @staticmethod
+    def _digest(view: Dict[str, Any], inputs: Dict[str, TimeSeries]) -> str:
+        """SHA-256 über Konfiguration und Inhalt der Eingangsreihen"""
+        hasher = hashlib.sha256(json.dumps(view, sort_keys=True).encode('utf-8'))
+        for name in view['datasets']:
+            hasher.update(name.encode('utf-8'))
+            inputs[name].update_hash(hasher)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _render(view: Dict[str, Any], inputs: Dict[str, TimeSeries], digest: str) -> Dict[str, Any]:
+        """Richtet die Reihen aus und bringt sie in die JSON-Form (Lücken als null)"""
+        positions, columns = align(
+            {name: inputs[name] for name in view['datasets']}, view['frequency'],
+            view['aggregation'], view['interpolation'], view['join'], view['start'], view['end']
+        )
+        fromordinal = date.fromordinal
+        return {
+            "frequency": view['frequency'],
+            "aggregation": view['aggregation'],
+            "interpolation": view['interpolation'],
+            "hash": digest,
+            "dates": [fromordinal(ordinal).isoformat() for ordinal in positions.tolist()],
+            "columns": {
+                name: [None if value != value else value for value in column.tolist()]
+                for name, column in columns.items()
+            }
+        }
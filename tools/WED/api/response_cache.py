@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# response_cache.py - Persistenter Antwort-Cache für den API-Manager
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+from sources.timeseries import TimeSeries
+
+logger = logging.getLogger('api_manager')
+
+class MemoryResponseCache:
+    """Begrenzter In-Memory-Cache (LRU) vor dem persistenten Cache
+
+    Hält nur die zuletzt genutzten Einträge, damit lange laufende Prozesse
+    (z.B. der Scheduler mit wechselnden inkrementellen Parametern) nicht
+    unbegrenzt wachsen. Threadsicher für die Worker-Threads des Updaters.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """Erstellt den Cache
+
+        Args:
+            max_entries: Maximale Anzahl gehaltener Einträge
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Gibt den Eintrag ({'data', 'timestamp'}) zurück und markiert ihn als zuletzt genutzt"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def __setitem__(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def values(self) -> List[Dict[str, Any]]:
+        """Alle Einträge (Kopie der Liste, ohne LRU-Reihenfolge zu ändern)"""
+        with self._lock:
+            return list(self._entries.values())
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        """Gibt alle Schlüssel zurück, die mit prefix beginnen"""
+        with self._lock:
+            return [key for key in self._entries if key.startswith(prefix)]
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Löscht alle Einträge, deren Schlüssel mit prefix beginnt"""
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Löscht alle Einträge"""
+        with self._lock:
+            self._entries.clear()
+
+
+class PersistentResponseCache:
+    """SQLite-basierter Cache für API-Antworten, der zwischen Läufen erhalten bleibt
+
+    Funktionen:
+    - Überlebt Prozess-Neustarts (z.B. aufeinanderfolgende Cron-Läufe)
+    - TTL pro Datenquelle
+    - LRU-Verdrängung mit Obergrenze für Einträge und Bytes
+    - Kompakte Speicherung (zlib-komprimiertes JSON)
+    - WAL-Modus, damit sich überlappende Läufe nicht gegenseitig blockieren
+    """
+
+    def __init__(self, path: str = "api_cache.sqlite", default_ttl: float = 3600,
+                 source_ttls: Dict[str, float] = None, max_entries: int = 1000,
+                 max_bytes: int = 50 * 1024 * 1024, keep_stale: float = 0):
+        """Öffnet (oder erstellt) die Cache-Datenbank
+
+        Args:
+            path: Pfad zur SQLite-Datei
+            default_ttl: Standard-Lebensdauer eines Eintrags in Sekunden
+            source_ttls: Abweichende Lebensdauer pro Datenquelle
+            max_entries: Maximale Anzahl gespeicherter Einträge
+            max_bytes: Maximale Gesamtgröße der komprimierten Einträge
+            keep_stale: Mindestaufbewahrung in Sekunden ab Erstellung, auch über die TTL
+                        hinaus (für Stale-While-Revalidate im APIManager)
+        """
+        self.path = path
+        self.default_ttl = default_ttl
+        self.source_ttls = source_ttls or {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.keep_stale = keep_stale
+
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+        logger.info(f"Persistent cache opened at {self.path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Stellt die Datenbankverbindung her und legt das Schema an"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                   key TEXT PRIMARY KEY,
+                   source TEXT NOT NULL,
+                   created REAL NOT NULL,
+                   expires REAL NOT NULL,
+                   accessed REAL NOT NULL,
+                   size INTEGER NOT NULL,
+                   payload BLOB NOT NULL
+               )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_source ON entries (source)")
+        conn.commit()
+        return conn
+
+    def ttl_for(self, source_name: str) -> float:
+        """Gibt die Lebensdauer für Einträge einer Datenquelle zurück"""
+        return self.source_ttls.get(source_name, self.default_ttl)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Liest einen Eintrag aus dem Cache
+
+        Args:
+            key: Cache-Schlüssel
+
+        Returns:
+            Dictionary mit 'data' und 'timestamp' oder None
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT created, payload FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                # Zugriffszeit für LRU-Verdrängung aktualisieren
+                self._conn.execute(
+                    "UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key)
+                )
+                self._conn.commit()
+
+            created, payload = row
+            return {
+                'data': self._decode(payload),
+                'timestamp': created
+            }
+        except (sqlite3.Error, ValueError, zlib.error) as e:
+            logger.warning(f"Persistent cache read failed for {key}: {str(e)}")
+            return None
+
+    def set(self, key: str, source_name: str, data: Dict, timestamp: float = None) -> None:
+        """Schreibt einen Eintrag in den Cache
+
+        Args:
+            key: Cache-Schlüssel
+            source_name: Name der Datenquelle (für TTL und gezieltes Löschen)
+            data: Zu speichernde Daten (JSON-serialisierbar)
+            timestamp: Erstellungszeitpunkt, Standard ist jetzt
+        """
+        created = timestamp if timestamp is not None else time.time()
+        try:
+            payload = self._encode(data)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(key, source, created, expires, accessed, size, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, source_name, created, created + max(self.ttl_for(source_name), self.keep_stale),
+                     time.time(), len(payload), payload)
+                )
+                self._evict()
+                self._conn.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Persistent cache write failed for {key}: {str(e)}")
+
+    def _evict(self) -> None:
+        """Entfernt abgelaufene und am längsten ungenutzte Einträge (Lock muss gehalten werden)"""
+        self._conn.execute("DELETE FROM entries WHERE expires < ?", (time.time(),))
+
+        count, total_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        # Älteste Zugriffe zuerst verdrängen, bis beide Grenzen eingehalten sind
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC").fetchall()
+        to_delete = []
+        for key, size in rows:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            count -= 1
+            total_bytes -= size
+
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", to_delete)
+        logger.info(f"Persistent cache evicted {len(to_delete)} entries")
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        """Gibt alle Schlüssel zurück, die mit prefix beginnen (z.B. alle Abfragen eines Datensatzes)"""
+        pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key FROM entries WHERE key LIKE ? ESCAPE '\\'", (pattern,)
+                ).fetchall()
+            return [row[0] for row in rows]
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache key lookup failed: {str(e)}")
+            return []
+
+    def delete_source(self, source_name: str) -> None:
+        """Löscht alle Einträge einer Datenquelle"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE source = ?", (source_name,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Löscht den gesamten Cache"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Schließt die Datenbankverbindung"""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _encode(data: Dict) -> bytes:
+        """Serialisiert Daten kompakt (JSON ohne Leerzeichen, zlib-komprimiert)
+
+        Zeitreihen werden als Tagesnummern- und Werteliste gespeichert und beim
+        Lesen wieder als TimeSeries hergestellt.
+        """
+        raw = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=_encode_default)
+        return zlib.compress(raw.encode('utf-8'), 6)
+
+    @staticmethod
+    def _decode(payload: bytes) -> Dict:
+        """Gegenstück zu _encode"""
+        return json.loads(zlib.decompress(payload).decode('utf-8'), object_hook=_decode_hook)
+
+
+def _encode_default(obj: Any) -> Any:
+    """default-Hook für json.dumps: Zeitreihen kompakt markieren"""
+    if isinstance(obj, TimeSeries):
+        return {'__timeseries__': obj.to_compact()}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _decode_hook(obj: Dict) -> Any:
+    """object_hook für json.loads: markierte Zeitreihen wiederherstellen"""
+    if '__timeseries__' in obj and len(obj) == 1:
+        return TimeSeries.from_compact(obj['__timeseries__'])
+    return obj
+
+
+def canonical_params(params: Optional[Dict[str, Any]]) -> str:
+    """Kanonische Form von Abfrageparametern für Cache-Schlüssel
+
+    Sortierte Schlüssel und kompaktes JSON: {'a': 1, 'b': 2} und {'b': 2, 'a': 1}
+    ergeben denselben Schlüssel, None und {} ebenfalls.
+    """
+    return json.dumps(params or {}, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def covers(coverage: Dict[str, Optional[str]], start: Optional[str], end: Optional[str]) -> Dict[str, bool]:
+    """Prüft, ob ein vollständig abgedeckter Zeitraum die Grenzen eines anderen einschließt
+
+    None steht für eine offene Grenze (ohne Beginn bzw. bis heute).
+
+    Returns:
+        {'start': True wenn der Beginn abgedeckt ist, 'end': entsprechend für das Ende}
+    """
+    covered_start, covered_end = coverage.get('start'), coverage.get('end')
+    return {
+        'start': covered_start is None or (start is not None and covered_start <= start),
+        'end': covered_end is None or (end is not None and end <= covered_end)
+    }
+
+
+def query_coverage(series: TimeSeries, query: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """Zeitraum, für den das Ergebnis einer Abfrage alle Beobachtungen enthält
+
+    Ohne Limit oder mit weniger Treffern als dem Limit ist das der angefragte
+    Zeitraum; sonst endet er an der ältesten (newest_first) bzw. neuesten
+    gelieferten Beobachtung.
+    """
+    limit = query.get('limit')
+    if limit is None or len(series) < limit:
+        return {'start': query.get('start'), 'end': query.get('end')}
+    if query.get('newest_first', False):
+        return {'start': series.start_date, 'end': query.get('end')}
+    return {'start': query.get('start'), 'end': series.end_date}
+
+
+def serve_from_superset(data: Dict[str, Any], query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Beantwortet eine Abfrage durch Zuschneiden eines gecachten, umfassenderen Ergebnisses
+
+    Das Limit zählt hier gültige Beobachtungen. Fehlende Werte der Quelle wurden
+    schon beim Konvertieren verworfen; ein Zuschnitt kann daher bis zu `limit`
+    Werte liefern, wo die Quelle selbst einzelne Lücken mitgezählt hätte.
+
+    Args:
+        data: Gecachtes Standard-Ergebnis mit meta.coverage (vollständig enthaltener Zeitraum)
+        query: Abfrage aus describe_query der Quelle mit 'start', 'end' (YYYY-MM-DD oder
+               None), 'limit' (int oder None) und 'newest_first' (Limit zählt ab dem Ende)
+
+    Returns:
+        Standard-Ergebnis für die Abfrage oder None, wenn der Eintrag sie nicht abdeckt
+    """
+    coverage = data.get('meta', {}).get('coverage')
+    historical = data.get('data', {}).get('historical')
+    if coverage is None or not isinstance(historical, TimeSeries):
+        return None
+
+    start, end, limit = query.get('start'), query.get('end'), query.get('limit')
+    newest_first = query.get('newest_first', False)
+    covered = covers(coverage, start, end)
+
+    # Nur Beobachtungen im abgedeckten Teil des angefragten Zeitraums sind sicher vollständig
+    lower = start if covered['start'] else coverage['start']
+    upper = end if covered['end'] else coverage['end']
+    series = historical.between(lower, upper)
+
+    if not (covered['start'] and covered['end']):
+        # Mit Limit genügt es, wenn die `limit` Beobachtungen vom verankerten Ende
+        # (neueste bzw. älteste) her vollständig im abgedeckten Bereich liegen
+        anchored = covered['end'] if newest_first else covered['start']
+        if not anchored or limit is None or len(series) < limit:
+            return None
+
+    if limit is not None and len(series) > limit:
+        series = series[-limit:] if newest_first else series[:limit]
+
+    meta = dict(data['meta'])
+    meta['count'] = len(series)
+    meta['coverage'] = query_coverage(series, query)
+    return {
+        "meta": meta,
+        "data": {
+            "latest": series.latest(),
+            "historical": series
+        }
+    }
+
+
+def max_staleness_limit(cache_config: Dict[str, Any]) -> float:
+    """Längste konfigurierte max_staleness (0, wenn Stale-While-Revalidate aus ist)
+
+    Args:
+        cache_config: 'cache'-Abschnitt der Konfiguration
+    """
+    swr_config = cache_config.get('stale_while_revalidate', {})
+    values = [swr_config.get('max_staleness', 0)]
+    values.extend(swr_config.get('sources', {}).values())
+    values.extend(swr_config.get('datasets', {}).values())
+    return max(values)
+
+
+def create_response_cache(cache_config: Dict[str, Any], base_dir: str = None) -> Optional[PersistentResponseCache]:
+    """Erstellt den persistenten Cache aus dem 'cache'-Abschnitt der Konfiguration
+
+    Ohne "backend" wird nur mit bekanntem Basisverzeichnis (Verzeichnis der
+    Konfigurationsdatei) persistent gecacht, sonst nur im Speicher - so legt ein
+    APIManager ohne Konfiguration keine Datei im aktuellen Arbeitsverzeichnis an.
+
+    Args:
+        cache_config: Konfiguration, z.B. {"backend": "sqlite", "path": "api_cache.sqlite",
+                      "ttl": 3600, "source_ttls": {"fred": 21600}, "max_entries": 1000,
+                      "max_bytes": 52428800}; "memory_entries" (Standard 256) begrenzt
+                      den vorgeschalteten In-Memory-Cache des APIManagers; Einträge bleiben mindestens so lange
+                      erhalten wie die längste max_staleness aus "stale_while_revalidate"
+        base_dir: Optional, Verzeichnis, gegen das ein relativer "path" aufgelöst wird
+
+    Returns:
+        Cache-Instanz oder None, wenn nur der In-Memory-Cache verwendet werden soll
+    """
+    backend = cache_config.get('backend', 'sqlite' if base_dir is not None or 'path' in cache_config else 'memory')
+    if backend == 'memory':
+        return None
+    if backend != 'sqlite':
+        logger.warning(f"Unknown cache backend '{backend}'. Falling back to in-memory cache.")
+        return None
+
+    path = cache_config.get('path', 'api_cache.sqlite')
+    if base_dir is not None and not os.path.isabs(path):
+        path = os.path.join(base_dir, path)
+
+    try:
+        return PersistentResponseCache(
+            path=path,
+            default_ttl=cache_config.get('ttl', 3600),
+            source_ttls=cache_config.get('source_ttls', {}),
+            max_entries=cache_config.get('max_entries', 1000),
+            max_bytes=cache_config.get('max_bytes', 50 * 1024 * 1024),
+            keep_stale=max_staleness_limit(cache_config)
+        )
+    except sqlite3.Error as e:
+        logger.error(f"Could not open persistent cache: {str(e)}")
+        return None
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# scheduler.py - Frequenzbewusster Aktualisierungs-Scheduler (Daemon statt Komplettlauf per Cron)
+
+import os
+import json
+import time
+import heapq
+import logging
+import threading
+from datetime import date
+from typing import Dict, Any, List, Optional, Tuple
+from output_writer import atomic_write_json
+from sources.timeseries import TimeSeries
+from sources.metrics import metrics
+
+logger = logging.getLogger('data_updater')
+
+DAY = 86400.0
+
+# Typischer Abstand zweier Beobachtungen in Tagen (Kürzel wie FRED frequency_short)
+FREQUENCY_DAYS = {
+    'D': 1.0,
+    'W': 7.0,
+    'BW': 14.0,
+    'M': 30.44,
+    'Q': 91.31,
+    'SA': 182.62,
+    'A': 365.25,
+}
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def infer_frequency(series: TimeSeries) -> Optional[str]:
+    """Schätzt die Frequenz aus dem Median-Abstand der letzten Beobachtungen
+
+    Args:
+        series: Zeitreihe (älteste zuerst)
+
+    Returns:
+        Frequenz-Kürzel oder None bei zu wenigen Beobachtungen
+    """
+    ordinals = series.ordinals[-25:]
+    if len(ordinals) < 3:
+        return None
+    gaps = sorted(later - earlier for earlier, later in zip(ordinals, ordinals[1:]))
+    median = gaps[len(gaps) // 2]
+    return min(FREQUENCY_DAYS, key=lambda code: abs(FREQUENCY_DAYS[code] - median))
+
+
+def _date_to_timestamp(value: str) -> float:
+    """Unix-Zeit (UTC, Mitternacht) eines Datums YYYY-MM-DD"""
+    return (date.fromisoformat(value).toordinal() - _EPOCH_ORDINAL) * DAY
+
+
+class RefreshScheduler:
+    """Aktualisiert jede Serie nur, wenn eine neue Beobachtung zu erwarten ist
+
+    Pro Serie werden Frequenz und typischer Veröffentlichungsverzug
+    (release_lag_days, Zeit zwischen Periodenende und Veröffentlichung) geführt.
+    Daraus ergibt sich der nächste Fälligkeitszeitpunkt; eine Prioritätswarteschlange
+    (heapq) liefert jeweils die fälligen Serien.
+
+    Bringt ein Abruf nach dem erwarteten Termin noch keine neue Beobachtung,
+    wird mit exponentiell wachsendem Abstand erneut gefragt, bis sie erscheint.
+    Der gemessene Verzug fließt in die nächste Planung ein.
+
+    Der Zeitplan wird nach jedem Durchlauf als JSON gespeichert und beim Start
+    wieder geladen.
+    """
+
+    def __init__(self, updater, scheduler_config: Dict[str, Any] = None):
+        """Initialisiert den Scheduler
+
+        Args:
+            updater: WEDDataUpdater mit registrierten Quellen
+            scheduler_config: Konfiguration, Standard ist der 'scheduler'-Abschnitt von
+                              api_config.json, z.B. {"state_file": "economic_data.schedule.json",
+                              "min_interval": 900, "backoff_base": 3600, "backoff_max": 604800,
+                              "batch_size": 50, "datasets": {"gdp": {"frequency": "Q",
+                              "release_lag_days": 30}}}
+        """
+        scheduler_config = scheduler_config if scheduler_config is not None else updater.config.get('scheduler', {})
+        self.updater = updater
+        self.state_file = scheduler_config.get(
+            'state_file', os.path.splitext(updater.output_file)[0] + '.schedule.json'
+        )
+        self.min_interval = scheduler_config.get('min_interval', 900)
+        self.backoff_base = scheduler_config.get('backoff_base', 3600)
+        self.backoff_max = scheduler_config.get('backoff_max', 7 * DAY)
+        self.batch_size = max(1, scheduler_config.get('batch_size', 50))
+        self.overrides = scheduler_config.get('datasets', {})
+
+        self.state: Dict[str, Dict[str, Any]] = {}  # "source/dataset" -> Planungszustand
+        self._queue: List[Tuple[float, str]] = []
+        self._stop = threading.Event()
+
+    def load(self) -> None:
+        """Lädt den gespeicherten Zeitplan und gleicht ihn mit den konfigurierten Serien ab
+
+        Neue Serien sind sofort fällig, nicht mehr konfigurierte werden entfernt.
+        """
+        saved = {}
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r') as f:
+                    saved = json.load(f).get('datasets', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read schedule {self.state_file}: {str(e)}. Starting fresh.")
+
+        self.state = {}
+        for source_name, datasets in self.updater.registered_sources.items():
+            frequencies = None
+            for dataset_id in datasets:
+                key = f"{source_name}/{dataset_id}"
+                entry = saved.get(key) or {'next_due': 0.0, 'misses': 0, 'last_observation': None}
+                override = self.overrides.get(dataset_id, {})
+
+                if 'frequency' in override:
+                    entry['frequency'] = override['frequency']
+                    entry['frequency_origin'] = 'config'
+                elif not entry.get('frequency'):
+                    if frequencies is None:
+                        frequencies = self._source_frequencies(source_name)
+                    if frequencies.get(dataset_id) in FREQUENCY_DAYS:
+                        entry['frequency'] = frequencies[dataset_id]
+                        entry['frequency_origin'] = 'metadata'
+                if 'release_lag_days' in override:
+                    entry['release_lag_days'] = override['release_lag_days']
+
+                self.state[key] = entry
+
+        self._queue = [(entry['next_due'], key) for key, entry in self.state.items()]
+        heapq.heapify(self._queue)
+        logger.info(f"Scheduler loaded {len(self.state)} series")
+
+    def _source_frequencies(self, source_name: str) -> Dict[str, str]:
+        """Frequenzen aus den Metadaten der Quelle (get_available_datasets), falls vorhanden"""
+        source_module = self.updater.api_manager.sources.get(source_name)
+        if source_module is None or not hasattr(source_module, 'get_available_datasets'):
+            return {}
+        try:
+            return {info['id']: info.get('frequency') for info in source_module.get_available_datasets()}
+        except Exception as e:
+            logger.warning(f"Could not read frequencies from {source_name}: {str(e)}")
+            return {}
+
+    def save(self) -> None:
+        """Speichert den Zeitplan atomar"""
+        try:
+            atomic_write_json(self.state_file, {"datasets": self.state}, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not write schedule {self.state_file}: {str(e)}")
+
+    def stop(self) -> None:
+        """Beendet run() nach dem laufenden Durchlauf (z.B. aus einem Signal-Handler)"""
+        self._stop.set()
+
+    def next_due(self) -> Optional[float]:
+        """Zeitpunkt der nächsten Fälligkeit oder None ohne Serien"""
+        self._discard_outdated()
+        return self._queue[0][0] if self._queue else None
+
+    def _discard_outdated(self) -> None:
+        """Entfernt Warteschlangen-Einträge, die durch eine Neuplanung überholt sind"""
+        while self._queue and (self._queue[0][1] not in self.state or
+                               self._queue[0][0] != self.state[self._queue[0][1]]['next_due']):
+            heapq.heappop(self._queue)
+
+    def _pop_due(self, now: float) -> List[str]:
+        """Entnimmt bis zu batch_size fällige Serien"""
+        due = []
+        while len(due) < self.batch_size:
+            self._discard_outdated()
+            if not self._queue or self._queue[0][0] > now:
+                break
+            due.append(heapq.heappop(self._queue)[1])
+        return due
+
+    def run(self, max_batches: int = None) -> None:
+        """Aktualisiert fällige Serien, bis stop() aufgerufen wird
+
+        Args:
+            max_batches: Optional, nach so vielen Durchläufen beenden
+        """
+        self.load()
+        batches = 0
+        while not self._stop.is_set():
+            due = self._pop_due(time.time())
+            if due:
+                self.refresh(due)
+                self.save()
+                batches += 1
+                if max_batches is not None and batches >= max_batches:
+                    break
+                continue
+
+            next_due = self.next_due()
+            if next_due is None:
+                logger.warning("Scheduler has no series to refresh. Stopping.")
+                break
+            wait = max(0.0, next_due - time.time())
+            logger.info(f"Next refresh in {wait / 60:.1f} min")
+            self._stop.wait(wait)
+
+    def refresh(self, keys: List[str]) -> None:
+        """Aktualisiert die angegebenen Serien und plant sie neu
+
+        Args:
+            keys: Serien als "source/dataset"
+        """
+        jobs = [tuple(key.split('/', 1)) for key in keys]
+        results = self.updater.update_datasets(jobs, refresh=True)
+        now = time.time()
+
+        for key, (formatted, error) in zip(keys, results):
+            historical = (formatted or {}).get('data', {}).get('historical')
+            if historical is not None and not isinstance(historical, TimeSeries):
+                historical = TimeSeries.from_records(historical)
+            self._reschedule(key, historical, error, now)
+            heapq.heappush(self._queue, (self.state[key]['next_due'], key))
+
+    def _reschedule(self, key: str, series: Optional[TimeSeries], error: Optional[str], now: float) -> None:
+        """Plant eine Serie nach einem Abruf neu
+
+        - Neue Beobachtung: Verzug lernen, nächster Termin = erwartete nächste Veröffentlichung
+        - Keine neue Beobachtung vor dem erwarteten Termin: zum Termin wieder prüfen
+        - Sonst (überfällig oder Fehler): exponentieller Backoff
+        """
+        entry = self.state[key]
+        entry['last_refresh'] = now
+
+        if series and entry.get('frequency_origin') not in ('config', 'metadata'):
+            inferred = infer_frequency(series)
+            if inferred is not None:
+                entry['frequency'] = inferred
+                entry['frequency_origin'] = 'observed'
+
+        latest = series.end_date if series else None
+        previous = entry.get('last_observation')
+
+        if error is None and latest is not None and latest != previous:
+            if previous is not None and latest > previous:
+                self._learn_release_lag(key, entry, latest, now)
+            entry['last_observation'] = latest
+            entry['misses'] = 0
+            expected = self._expected_release(entry)
+            entry['next_due'] = max(now + self.min_interval, expected if expected is not None else 0)
+            metrics.inc('wed_scheduler_refreshes_total', result='new')
+            return
+
+        expected = self._expected_release(entry)
+        if error is None and expected is not None and now < expected:
+            entry['next_due'] = max(now + self.min_interval, expected)
+            metrics.inc('wed_scheduler_refreshes_total', result='unchanged')
+            return
+
+        entry['misses'] = entry.get('misses', 0) + 1
+        backoff = self.backoff_base * 2 ** (entry['misses'] - 1)
+        period = FREQUENCY_DAYS.get(entry.get('frequency'))
+        limit = min(self.backoff_max, period * DAY) if period else self.backoff_max
+        entry['next_due'] = now + max(self.min_interval, min(backoff, limit))
+        metrics.inc('wed_scheduler_refreshes_total', result='error' if error is not None else 'waiting')
+
+    def _expected_release(self, entry: Dict[str, Any]) -> Optional[float]:
+        """Erwartete Veröffentlichung der nächsten Beobachtung (Unix-Zeit) oder None
+
+        Beobachtungsdaten bezeichnen den Periodenbeginn; veröffentlicht wird nach
+        Periodenende plus Verzug.
+        """
+        period = FREQUENCY_DAYS.get(entry.get('frequency'))
+        if period is None or entry.get('last_observation') is None:
+            return None
+        next_period_end = _date_to_timestamp(entry['last_observation']) + 2 * period * DAY
+        return next_period_end + (entry.get('release_lag_days') or 0.0) * DAY
+
+    def _learn_release_lag(self, key: str, entry: Dict[str, Any], latest: str, now: float) -> None:
+        """Aktualisiert den Veröffentlichungsverzug aus dem Zeitpunkt, an dem `latest` erschien
+
+        Nur wenn genau eine Periode hinzukam und der Verzug nicht konfiguriert ist;
+        geglättet, damit einzelne Ausreißer den Plan nicht verschieben.
+        """
+        period = FREQUENCY_DAYS.get(entry.get('frequency'))
+        if period is None or 'release_lag_days' in self.overrides.get(key.split('/', 1)[1], {}):
+            return
+        gap_days = (_date_to_timestamp(latest) - _date_to_timestamp(entry['last_observation'])) / DAY
+        if gap_days > 1.5 * period:
+            return
+
+        observed = max(0.0, (now - _date_to_timestamp(latest)) / DAY - period)
+        previous = entry.get('release_lag_days')
+        entry['release_lag_days'] = round(observed if previous is None else (previous + observed) / 2, 2)
+        logger.info(f"Release lag for {key}: {entry['release_lag_days']} days")
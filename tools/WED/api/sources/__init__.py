@@ -9,19 +9,77 @@ Modulare API-Quellen für das World Economy Dashboard:
 - Konkrete Implementierungen für verschiedene Datenquellen
 - Standardisierte Datenformate
 - Rate-Limiting und Fehlerbehandlung
+- Registry (SOURCE_FACTORIES): Quellen-Module werden erst bei Bedarf importiert
 
 Verfügbare Quellen:
 - FREDSource: Federal Reserve Economic Data
 - (weitere Quellen werden schrittweise hinzugefügt)
 """
 
-from .base_source import BaseAPISource
-from .fred_source import FREDSource, create_fred_source
+import importlib
+
+# Registrierte Quellen: Name in api_config.json -> (Modul, Factory-Funktion).
+# Module werden erst importiert, wenn die Quelle tatsächlich erstellt wird.
+SOURCE_FACTORIES = {
+    'fred': ('.fred_source', 'create_fred_source'),
+}
+
+# Öffentliche Namen, die beim ersten Zugriff aus ihrem Modul geladen werden
+_LAZY_EXPORTS = {
+    'BaseAPISource': '.base_source',
+    'FREDSource': '.fred_source',
+    'create_fred_source': '.fred_source',
+    'TimeSeries': '.timeseries',
+}
+
+def get_source_factory(name: str):
+    """Gibt die Factory-Funktion einer registrierten Quelle zurück (importiert ihr Modul)
+    
+    Args:
+        name: Name der Quelle, z.B. "fred"
+        
+    Returns:
+        Factory mit der Signatur (config, api_key, base_dir=None) -> BaseAPISource
+    """
+    if name not in SOURCE_FACTORIES:
+        raise ValueError(f"Unknown source '{name}'. Available: {', '.join(SOURCE_FACTORIES)}")
+    module_name, factory_name = SOURCE_FACTORIES[name]
+    return getattr(importlib.import_module(module_name, __name__), factory_name)
+
+def create_source(name: str, config: dict, api_key: str = "", base_dir: str = None):
+    """Erstellt eine Quelle über die Registry
+    
+    Args:
+        name: Name der Quelle, z.B. "fred"
+        config: Konfiguration der Quelle aus api_config.json
+        api_key: API-Schlüssel
+        base_dir: Optional, Verzeichnis der Konfigurationsdatei (für relative Cache-Pfade)
+        
+    Returns:
+        Quellen-Instanz
+    """
+    return get_source_factory(name)(config, api_key, base_dir=base_dir)
+
+def __getattr__(name: str):
+    """Lädt Klassen und Funktionen erst beim ersten Zugriff (schneller Import des Pakets)"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
 
 __all__ = [
     'BaseAPISource',
     'FREDSource', 
-    'create_fred_source'
+    'create_fred_source',
+    'TimeSeries',
+    'SOURCE_FACTORIES',
+    'get_source_factory',
+    'create_source'
 ]
 
 __version__ = '1.0.0'
@@ -1,15 +1,41 @@
 #!/usr/bin/env python3
 # sources/base_source.py - Basis-Klasse für alle API-Datenquellen
 
+import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import asyncio
 import logging
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from .rate_limiter import create_rate_limiter, parse_retry_after
+from .timeseries import TimeSeries
+from .conversion import ConversionRule, IDENTITY_RULE, compile_conversion_rules
+from .metrics import metrics
+from .tracing import tracer
+
+# Optional: echter Async-HTTP-Client; ohne aiohttp laufen Async-Requests im Thread-Pool der Quelle
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 
 logger = logging.getLogger(__name__)
 
+class RateLimitExceeded(requests.exceptions.HTTPError):
+    """HTTP 429 der API, optional mit vom Server verlangter Wartezeit"""
+    
+    def __init__(self, retry_after: Optional[float] = None, *args, **kwargs):
+        message = "Rate limit exceeded (HTTP 429)"
+        if retry_after is not None:
+            message += f", retry after {retry_after:.2f}s"
+        super().__init__(message, *args, **kwargs)
+        self.retry_after = retry_after
+
 class BaseAPISource(ABC):
     """Abstrakte Basis-Klasse für alle API-Datenquellen
     
@@ -18,8 +44,14 @@ class BaseAPISource(ABC):
     - Fehlerbehandlung  
     - Retry-Logik
     - Datenformatierung
+    - Gepoolte Keep-Alive-HTTP-Session pro Quelle
     """
     
+    # Standard-Umrechnungsregeln pro Dataset-ID; 'conversions' in der Konfiguration überschreibt
+    DEFAULT_CONVERSIONS = {
+        'gdp': {'scale': 0.001}  # GDP von Milliarden in Billionen USD
+    }
+    
     def __init__(self, config: Dict[str, Any], api_key: str = ""):
         """Initialisiert die API-Quelle mit Konfiguration
         
@@ -35,18 +67,248 @@ class BaseAPISource(ABC):
         self.timeout = config.get('timeout', 30)
         self.retries = config.get('retries', 3)
         self.datasets = config.get('datasets', {})
+        self.pool_size = config.get('pool_size', 10)  # Max. gleichzeitige Verbindungen pro Host
+        
+        # Einheiten-Regeln einmalig kompilieren
+        self.conversion_rules = compile_conversion_rules(self.DEFAULT_CONVERSIONS, config.get('conversions'))
         
-        self.last_request_time = 0
+        # Token-Bucket pro Quelle (thread-sicher, optional prozessübergreifend geteilt)
+        self.rate_limiter = create_rate_limiter(config, self.name)
+        
+        # Label für Metriken (APIManager.register_source setzt den registrierten Namen)
+        self.metrics_label = config.get('metrics_label', self.name)
+        
+        # HTTP-Session wird erst beim ersten Request erstellt
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # Async-Pfad: aiohttp-Session (gebunden an ihre Event-Loop) bzw. Thread-Pool ohne aiohttp
+        self._async_session = None
+        self._async_session_loop = None
+        self._async_executor = None
         
         logger.info(f"Initialized {self.name} source")
     
     def _wait_for_rate_limit(self) -> None:
-        """Wartet bis zum nächsten erlaubten Request (Rate-Limiting)"""
-        time_since_last = time.time() - self.last_request_time
-        if time_since_last < self.rate_limit:
-            wait_time = self.rate_limit - time_since_last
-            logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
-            time.sleep(wait_time)
+        """Wartet bis zum nächsten erlaubten Request (Rate-Limiting über Token-Bucket)"""
+        started = time.perf_counter()
+        self.rate_limiter.acquire()
+        self._record_rate_limit_wait(time.perf_counter() - started)
+    
+    async def _wait_for_rate_limit_async(self) -> None:
+        """Wie _wait_for_rate_limit, blockiert aber nicht die Event-Loop"""
+        started = time.perf_counter()
+        await self.rate_limiter.acquire_async()
+        self._record_rate_limit_wait(time.perf_counter() - started)
+    
+    def _record_rate_limit_wait(self, waited: float) -> None:
+        """Verbucht Wartezeit im Token-Bucket (nur spürbare Wartezeiten)"""
+        if waited > 0.001:
+            metrics.inc('wed_rate_limit_wait_seconds_total', waited, source=self.metrics_label, layer='source')
+    
+    def _get_session(self) -> requests.Session:
+        """Gibt die gepoolte HTTP-Session der Quelle zurück (wird bei Bedarf erstellt)
+        
+        Die Session hält Keep-Alive-Verbindungen offen, sodass TCP- und TLS-Handshakes
+        nur einmal pro Verbindung statt pro Request anfallen. Der Connection-Pool von
+        urllib3 ist thread-sicher; die Session wird daher von allen Worker-Threads
+        gemeinsam genutzt (Cookies werden von den Quellen nicht verwendet).
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    session.headers.update({
+                        'Accept-Encoding': 'gzip, deflate',
+                        'Connection': 'keep-alive'
+                    })
+                    self._session = session
+        return self._session
+    
+    def _get_async_session(self) -> 'aiohttp.ClientSession':
+        """aiohttp-Session der laufenden Event-Loop (wird bei Bedarf erstellt)
+        
+        Eine aiohttp-Session gehört zu genau einer Event-Loop; läuft der Async-Pfad
+        später in einer anderen Loop (z.B. erneutes asyncio.run), wird die alte
+        Session verworfen und eine neue erstellt.
+        """
+        loop = asyncio.get_running_loop()
+        with self._session_lock:
+            session = self._async_session
+            if session is None or session.closed or self._async_session_loop is not loop:
+                if session is not None:
+                    self._discard_async_session(session, self._async_session_loop)
+                session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit_per_host=self.pool_size),
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    headers={'Accept-Encoding': 'gzip, deflate'}
+                )
+                self._async_session, self._async_session_loop = session, loop
+        return session
+    
+    def _get_async_executor(self) -> ThreadPoolExecutor:
+        """Thread-Pool für Async-Requests ohne aiohttp (pool_size Threads, wie der Connection-Pool)"""
+        with self._session_lock:
+            if self._async_executor is None:
+                self._async_executor = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                          thread_name_prefix=f'{self.metrics_label}-http')
+            return self._async_executor
+    
+    @staticmethod
+    def _discard_async_session(session: 'aiohttp.ClientSession', loop: asyncio.AbstractEventLoop) -> None:
+        """Schließt eine aiohttp-Session außerhalb ihrer Event-Loop, so gut es geht"""
+        if session.closed:
+            return
+        if loop.is_closed():
+            # Loop beendet (z.B. nach asyncio.run) - Verbindungen sind ohnehin nicht mehr nutzbar
+            session.detach()
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            loop.run_until_complete(session.close())
+    
+    def close(self) -> None:
+        """Schließt die HTTP-Sessions, den Thread-Pool des Async-Pfads, den Zustand des
+        Rate-Limiters und alle offenen Verbindungen"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+                logger.debug(f"Closed HTTP session for {self.name}")
+            async_session, loop = self._async_session, self._async_session_loop
+            self._async_session = self._async_session_loop = None
+            executor, self._async_executor = self._async_executor, None
+        
+        if async_session is not None:
+            self._discard_async_session(async_session, loop)
+        if executor is not None:
+            executor.shutdown(wait=False)
+        # Geteilter Token-Bucket hält eine SQLite-Verbindung (wird bei Bedarf neu geöffnet)
+        self.rate_limiter.close()
+    
+    async def close_async(self) -> None:
+        """Wie close, schließt eine aiohttp-Session der laufenden Event-Loop aber sauber per await"""
+        with self._session_lock:
+            async_session = self._async_session if self._async_session_loop is asyncio.get_running_loop() else None
+            if async_session is not None:
+                self._async_session = self._async_session_loop = None
+        if async_session is not None:
+            await async_session.close()
+        self.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _send_request(self, url: str, params: Dict) -> Dict:
+        """Führt genau einen HTTP-Request aus (ohne Rate-Limiting und Retries)
+        
+        Bei HTTP 429 wird der Token-Bucket gedrosselt und RateLimitExceeded
+        ausgelöst, damit die Retry-Logik die verlangte Wartezeit einhält.
+        
+        Args:
+            url: Vollständige URL für den Request
+            params: Query-Parameter
+            
+        Returns:
+            JSON-Response als Dictionary
+        """
+        started = time.perf_counter()
+        response = self._get_session().get(url, params=params, timeout=self.timeout)
+        self._record_response(response.status_code, response.headers, len(response.content),
+                              time.perf_counter() - started)
+        
+        self._check_status(response.status_code, response.headers, response)
+        response.raise_for_status()
+        self.rate_limiter.reward()
+        return response.json()
+    
+    async def _send_request_async(self, url: str, params: Dict) -> Dict:
+        """Asynchrone Variante von _send_request (gleiche Fehler und Metriken)
+        
+        Mit aiohttp läuft der Request direkt auf der Event-Loop; gleichzeitige
+        Requests begrenzen nur Rate-Limit und pool_size. Ohne aiohttp läuft der
+        blockierende requests-Aufruf im Thread-Pool der Quelle - dann sind höchstens
+        pool_size Requests gleichzeitig unterwegs.
+        
+        Args:
+            url: Vollständige URL für den Request
+            params: Query-Parameter
+            
+        Returns:
+            JSON-Response als Dictionary
+        """
+        if aiohttp is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_async_executor(), self._send_request, url, params)
+        
+        # aiohttp akzeptiert nur Strings und Zahlen; None wird wie bei requests weggelassen
+        query = {key: str(value) for key, value in params.items() if value is not None}
+        started = time.perf_counter()
+        try:
+            async with self._get_async_session().get(url, params=query) as response:
+                body = await response.read()
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.Timeout(f"Request to {url} timed out after {self.timeout}s") from e
+        except aiohttp.ClientError as e:
+            # Auf requests-Ausnahmen abbilden, damit beide Pfade dieselbe Retry-Logik nutzen
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        self._record_response(response.status, response.headers, len(body), time.perf_counter() - started)
+        
+        self._check_status(response.status, response.headers)
+        if response.status >= 400:
+            raise requests.exceptions.HTTPError(f"{response.status} Error: {response.reason} for url: {response.url}")
+        self.rate_limiter.reward()
+        return json.loads(body)
+    
+    def _check_status(self, status: int, headers, response: requests.Response = None) -> None:
+        """Drosselt den Token-Bucket bei HTTP 429 und löst RateLimitExceeded aus"""
+        if status == 429:
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            self.rate_limiter.penalize(retry_after)
+            raise RateLimitExceeded(retry_after, response=response)
+    
+    def _record_response(self, status: int, headers, body_size: int, elapsed: float) -> None:
+        """Verbucht Dauer, Statuscode und Größe einer HTTP-Antwort"""
+        source = self.metrics_label
+        metrics.observe('wed_http_request_duration_seconds', elapsed, source=source)
+        metrics.inc('wed_http_responses_total', source=source, status=status)
+        
+        # Übertragene Bytes (komprimiert), ohne Content-Length die dekodierte Größe
+        size = headers.get('Content-Length')
+        metrics.inc('wed_http_bytes_total', int(size) if size and size.isdigit() else body_size, source=source)
+    
+    @staticmethod
+    def _retry_wait_time(error: Exception, attempt: int) -> float:
+        """Wartezeit vor dem nächsten Versuch: Retry-After oder exponentielles Backoff (1s, 2s, 4s)"""
+        backoff = 2 ** attempt
+        if isinstance(error, RateLimitExceeded) and error.retry_after is not None:
+            return max(backoff, error.retry_after)
+        return backoff
+    
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Retry-Entscheidung für einen fehlgeschlagenen Versuch (gemeinsam für Sync- und Async-Pfad)
+        
+        Args:
+            error: Ausnahme des Versuchs
+            attempt: Nummer des Versuchs (ab 0)
+            
+        Returns:
+            Wartezeit in Sekunden vor dem nächsten Versuch
+            
+        Raises:
+            Exception: Wenn alle Versuche aufgebraucht sind
+        """
+        logger.warning(f"Request failed (attempt {attempt + 1}/{self.retries}): {str(error)}")
+        if attempt >= self.retries - 1:
+            raise Exception(f"Failed after {self.retries} attempts: {str(error)}")
+        metrics.inc('wed_http_retries_total', source=self.metrics_label)
+        return self._retry_wait_time(error, attempt)
     
     def _make_request(self, url: str, params: Dict = None) -> Dict:
         """Führt HTTP-Request mit Retry-Logik und Fehlerbehandlung durch
@@ -61,28 +323,45 @@ class BaseAPISource(ABC):
         if params is None:
             params = {}
             
-        # Rate-Limiting einhalten
-        self._wait_for_rate_limit()
-        
         for attempt in range(self.retries):
             try:
-                self.last_request_time = time.time()
-                
-                logger.debug(f"Request attempt {attempt + 1}: {url}")
-                response = requests.get(url, params=params, timeout=self.timeout)
-                response.raise_for_status()
-                
-                return response.json()
+                with tracer.span('request_attempt', source=self.metrics_label, attempt=attempt + 1, url=url):
+                    # Rate-Limiting einhalten (jeder Versuch verbraucht ein Token)
+                    self._wait_for_rate_limit()
+                    
+                    logger.debug(f"Request attempt {attempt + 1}: {url}")
+                    return self._send_request(url, params)
                 
             except requests.exceptions.RequestException as e:
-                logger.warning(f"Request failed (attempt {attempt + 1}/{self.retries}): {str(e)}")
+                time.sleep(self._retry_delay(e, attempt))
+    
+    async def _make_request_async(self, url: str, params: Dict = None) -> Dict:
+        """Asynchrone Variante von _make_request (gleiche Retry-Logik über _retry_delay)
+        
+        Rate-Limiting und Backoff warten mit asyncio.sleep, der Request selbst
+        läuft über _send_request_async.
+        
+        Args:
+            url: Vollständige URL für den Request
+            params: Query-Parameter
+            
+        Returns:
+            JSON-Response als Dictionary
+        """
+        if params is None:
+            params = {}
+        
+        for attempt in range(self.retries):
+            try:
+                with tracer.span('request_attempt', source=self.metrics_label, attempt=attempt + 1, url=url):
+                    # Rate-Limiting einhalten, ohne die Event-Loop zu blockieren
+                    await self._wait_for_rate_limit_async()
+                    
+                    logger.debug(f"Async request attempt {attempt + 1}: {url}")
+                    return await self._send_request_async(url, params)
                 
-                if attempt < self.retries - 1:
-                    # Exponential backoff: 1s, 2s, 4s
-                    wait_time = 2 ** attempt
-                    time.sleep(wait_time)
-                else:
-                    raise Exception(f"Failed after {self.retries} attempts: {str(e)}")
+            except requests.exceptions.RequestException as e:
+                await asyncio.sleep(self._retry_delay(e, attempt))
     
     @abstractmethod
     def fetch_dataset(self, dataset_id: str, params: Dict = None) -> Dict:
@@ -97,6 +376,83 @@ class BaseAPISource(ABC):
         """
         pass
     
+    async def fetch_dataset_async(self, dataset_id: str, params: Dict = None) -> Dict:
+        """Asynchrone Variante von fetch_dataset
+        
+        Standard-Implementierung für Quellen ohne eigenen Async-Pfad: führt
+        fetch_dataset in einem Worker-Thread aus. Subklassen sollten das mit
+        _make_request_async überschreiben.
+        
+        Args:
+            dataset_id: ID des Datensatzes (z.B. "gdp", "inflation")
+            params: Zusätzliche Parameter
+            
+        Returns:
+            Standardisierte Datenstruktur
+        """
+        return await asyncio.to_thread(self.fetch_dataset, dataset_id, params)
+    
+    def get_incremental_params(self, start_date: str) -> Optional[Dict]:
+        """Parameter, um nur Beobachtungen ab einem Datum abzurufen
+        
+        Args:
+            start_date: Datum der ältesten benötigten Beobachtung (YYYY-MM-DD)
+            
+        Returns:
+            Parameter für fetch_dataset oder None, wenn die Quelle keine
+            Delta-Abfragen unterstützt (dann wird vollständig abgerufen)
+        """
+        return None
+    
+    def get_range_params(self, start_date: str, end_date: str) -> Optional[Dict]:
+        """Parameter für fetch_dataset, die genau den Zeitraum eines Zeitraum-Abrufs beschreiben
+        
+        Unter diesen Parametern cacht der API-Manager Ergebnisse von
+        fetch_historical_range, damit sie mit gewöhnlichen Abfragen austauschbar sind.
+        
+        Args:
+            start_date: Start-Datum (YYYY-MM-DD)
+            end_date: End-Datum (YYYY-MM-DD)
+            
+        Returns:
+            Parameter oder None, wenn die Quelle keine Zeitraum-Abrufe unterstützt
+        """
+        return None
+    
+    def describe_query(self, dataset_id: str, params: Dict = None) -> Optional[Dict]:
+        """Beschreibt, welchen Ausschnitt einer Zeitreihe fetch_dataset mit params liefert
+        
+        Damit kann der API-Manager engere Abfragen aus gecachten, umfassenderen
+        Ergebnissen beantworten (Ergebnisse brauchen dafür meta.coverage).
+        
+        Args:
+            dataset_id: ID des Datensatzes
+            params: Parameter wie an fetch_dataset
+            
+        Returns:
+            {'variant': str, 'start': str|None, 'end': str|None, 'limit': int|None,
+            'newest_first': bool} - 'variant' fasst alle übrigen Parameter zusammen
+            (nur gleiche Varianten sind austauschbar) - oder None, wenn die Quelle
+            das nicht unterstützt
+        """
+        return None
+    
+    def get_revision_stamps(self, dataset_ids: List[str]) -> Dict[str, str]:
+        """Günstige Änderungserkennung vor dem Abruf der Beobachtungen
+        
+        Nur überschreiben, wenn die Stempel deutlich billiger sind als der Abruf
+        selbst (z.B. eine Massenabfrage für viele Datensätze).
+        
+        Args:
+            dataset_ids: Logische Dataset-IDs
+            
+        Returns:
+            {dataset_id: Revisionsstempel}; ein unveränderter Stempel bedeutet
+            unveränderte Daten. Datensätze ohne Stempel werden normal abgerufen
+            (Standard: Quelle unterstützt keine Änderungserkennung).
+        """
+        return {}
+    
     @abstractmethod
     def get_available_datasets(self) -> List[Dict]:
         """Gibt verfügbare Datensätze zurück (muss von Subklassen implementiert werden)
@@ -114,83 +470,73 @@ class BaseAPISource(ABC):
             dataset_info: Metadaten zum Datensatz
             
         Returns:
-            Standardisierte Datenstruktur für das Dashboard
+            Standardisierte Datenstruktur für das Dashboard; 'historical' ist eine
+            TimeSeries (älteste zuerst), die erst beim Speichern in Dictionaries
+            umgewandelt wird
         """
-        if not raw_data:
-            return {
-                "meta": {
-                    "source": self.name,
-                    "dataset": dataset_info.get('id', 'unknown'),
-                    "last_updated": datetime.now().isoformat(),
-                    "count": 0
-                },
-                "data": {
-                    "latest": {"value": None, "date": None},
-                    "historical": []
-                }
-            }
-        
-        # Historische Daten sortieren (neueste zuerst für latest, dann umkehren für Charts)
-        historical = []
-        for entry in raw_data:
-            try:
-                # Datenkonvertierung je nach Datensatz
-                value = self._convert_value(entry.get('value'), dataset_info)
-                if value is not None:
-                    historical.append({
-                        "date": entry.get('date'),
-                        "value": value
-                    })
-            except (ValueError, TypeError):
-                continue
+        with tracer.span('standardize', dataset=dataset_info.get('id', ''), observations=len(raw_data)):
+            return self._wrap_series(self._build_series(raw_data, dataset_info), dataset_info)
+    
+    def _build_series(self, raw_data: List[Dict], dataset_info: Dict) -> TimeSeries:
+        """Konvertiert rohe Beobachtungen in eine TimeSeries
         
-        # Nach Datum sortieren (neueste zuerst)
-        historical.sort(key=lambda x: x['date'], reverse=True)
+        Die Sortierung der API wird übernommen (kein erneutes Sortieren).
         
-        # Latest value bestimmen
-        latest = historical[0] if historical else {"value": None, "date": None}
+        Args:
+            raw_data: Rohdaten von der API
+            dataset_info: Metadaten zum Datensatz (für Konvertierungsregeln)
+            
+        Returns:
+            Zeitreihe ohne fehlende Werte, älteste Beobachtung zuerst
+        """
+        if not raw_data:
+            return TimeSeries()
         
-        # Für Charts: älteste zuerst
-        historical_for_charts = list(reversed(historical))
+        # Datenkonvertierung je nach Datensatz (vektorisiert, wenn NumPy verfügbar ist)
+        rule = self.get_conversion_rule(dataset_info.get('id', ''))
+        with metrics.timer('wed_parse_duration_seconds', source=self.metrics_label):
+            return rule.convert_observations(raw_data, dataset_info.get('id', ''))
+    
+    def _wrap_series(self, series: TimeSeries, dataset_info: Dict) -> Dict:
+        """Verpackt eine Zeitreihe in die standardisierte Datenstruktur
         
+        Args:
+            series: Zeitreihe (älteste zuerst)
+            dataset_info: Metadaten zum Datensatz
+            
+        Returns:
+            Standardisierte Datenstruktur für das Dashboard
+        """
         return {
             "meta": {
                 "source": self.name,
                 "dataset": dataset_info.get('id', 'unknown'),
                 "last_updated": datetime.now().isoformat(),
-                "count": len(historical)
+                "count": len(series)
             },
             "data": {
-                "latest": latest,
-                "historical": historical_for_charts
+                "latest": series.latest(),
+                "historical": series
             }
         }
     
+    def get_conversion_rule(self, dataset_id: str) -> ConversionRule:
+        """Gibt die kompilierte Umrechnungsregel eines Datensatzes zurück"""
+        return self.conversion_rules.get(dataset_id, IDENTITY_RULE)
+    
     def _convert_value(self, raw_value: str, dataset_info: Dict) -> float:
-        """Konvertiert String-Werte in numerische Werte
+        """Konvertiert einen einzelnen String-Wert in einen numerischen Wert
+        
+        Skalarer Pfad; für ganze Antworten wird _build_series verwendet.
         
         Args:
             raw_value: Roher Wert als String
             dataset_info: Metadaten für Konvertierungsregeln
             
         Returns:
-            Konvertierter numerischer Wert
+            Konvertierter numerischer Wert oder None
         """
-        if raw_value is None or raw_value == ".":
-            return None
-            
-        try:
-            value = float(raw_value)
-            
-            # Spezielle Konvertierungen je nach Datensatz
-            if dataset_info.get('id') == 'gdp':
-                # GDP von Millionen in Billionen konvertieren
-                value = value / 1000
-            
-            return value
-            
-        except (ValueError, TypeError):
-            return None
+        return self.get_conversion_rule(dataset_info.get('id', '')).convert_value(raw_value)
     
     def get_dataset_config(self, dataset_id: str) -> Optional[str]:
         """Gibt die API-spezifische Dataset-ID zurück
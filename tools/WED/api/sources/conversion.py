@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# sources/conversion.py - Deklarative Einheiten-Regeln und Batch-Konvertierung von Beobachtungen
+
+import logging
+from array import array
+from typing import Dict, Any, List, Optional
+
+from .timeseries import TimeSeries
+
+# NumPy ist optional (skalarer Fallback) und wird erst bei der ersten Konvertierung importiert
+np = None
+_numpy_checked = False
+
+logger = logging.getLogger(__name__)
+
+# Tagesnummer (date.toordinal()) von 1970-01-01, Nullpunkt von datetime64
+_EPOCH_ORDINAL = 719163
+
+# Tagesnummer von 9999-12-31 (date.max); spätere Daten sind nicht als date darstellbar
+_MAX_ORDINAL = 3652059
+
+def _load_numpy():
+    """Importiert NumPy beim ersten Aufruf (der Import kostet spürbar Startzeit)"""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+        _numpy_checked = True
+    return np
+
+class ConversionRule:
+    """Kompilierte Umrechnungsregel für einen Datensatz: wert * scale + offset
+
+    Regeln werden pro Datensatz in der Quellen-Konfiguration deklariert, z.B.
+    "conversions": {"gdp": {"scale": 0.001}}, und einmal beim Erstellen der
+    Quelle kompiliert.
+    """
+
+    __slots__ = ('scale', 'offset', 'missing')
+
+    def __init__(self, scale: float = 1.0, offset: float = 0.0, missing: List[str] = None):
+        """Initialisiert die Regel
+
+        Args:
+            scale: Multiplikator (z.B. 0.001 für Milliarden -> Billionen)
+            offset: Wird nach der Skalierung addiert
+            missing: Rohwerte, die als fehlend gelten (Standard: "." und "")
+        """
+        self.scale = float(scale)
+        self.offset = float(offset)
+        self.missing = frozenset(missing if missing is not None else ('.', ''))
+
+    @classmethod
+    def compile(cls, spec: Dict[str, Any]) -> 'ConversionRule':
+        """Erstellt eine Regel aus ihrer Konfiguration"""
+        return cls(
+            scale=spec.get('scale', 1.0),
+            offset=spec.get('offset', 0.0),
+            missing=spec.get('missing')
+        )
+
+    @property
+    def is_identity(self) -> bool:
+        """True, wenn die Regel Werte unverändert lässt"""
+        return self.scale == 1.0 and self.offset == 0.0
+
+    def convert_value(self, raw_value: Any) -> Optional[float]:
+        """Konvertiert einen einzelnen Rohwert
+
+        Returns:
+            Konvertierter Wert oder None bei fehlendem/ungültigem Wert
+        """
+        if raw_value is None or raw_value in self.missing:
+            return None
+        try:
+            value = float(raw_value)
+        except (ValueError, TypeError):
+            return None
+        if self.is_identity:
+            return value
+        return value * self.scale + self.offset
+
+    def convert_observations(self, observations: List[Dict], dataset_id: str = '') -> TimeSeries:
+        """Konvertiert alle Beobachtungen einer Antwort in eine Zeitreihe
+
+        Mit NumPy werden Werte und Datumsangaben in einem vektorisierten Durchlauf
+        geparst, fehlende Werte maskiert und die Regel angewendet. Ohne NumPy (oder
+        bei unerwarteten Rohdaten) wird auf die skalare Konvertierung zurückgefallen.
+
+        Args:
+            observations: Beobachtungen mit 'date' und 'value'
+            dataset_id: Nur für Log-Meldungen
+
+        Returns:
+            Zeitreihe, älteste Beobachtung zuerst
+        """
+        if not observations:
+            return TimeSeries()
+
+        if _load_numpy() is not None:
+            try:
+                return self._convert_vectorized(observations)
+            except (ValueError, TypeError):
+                # Ungültige Werte in der Antwort - skalar mit Einzelprüfung weiter
+                pass
+
+        return self._convert_scalar(observations, dataset_id)
+
+    def _convert_vectorized(self, observations: List[Dict]) -> TimeSeries:
+        """NumPy-Pfad: ein Durchlauf für die ganze Antwort"""
+        raw_values = np.array([entry.get('value') for entry in observations], dtype=object)
+        missing = np.equal(raw_values, None)
+        for token in self.missing:
+            missing |= raw_values == token
+        valid = ~missing
+
+        values = raw_values[valid].astype(np.float64)
+        if not self.is_identity:
+            values = values * self.scale + self.offset
+
+        raw_dates = np.array([entry.get('date') for entry in observations], dtype='datetime64[D]')[valid]
+        ordinals = raw_dates.astype(np.int64) + _EPOCH_ORDINAL
+
+        # Fehlende Daten (None, "" -> NaT) und Daten außerhalb von date.min..date.max verwerfen
+        # wie im skalaren Pfad, statt sie beim int32-Cast überlaufen zu lassen
+        usable = ~np.isnat(raw_dates) & (ordinals >= 1) & (ordinals <= _MAX_ORDINAL)
+        if not usable.all():
+            ordinals = ordinals[usable]
+            values = values[usable]
+
+        # API-Sortierung übernehmen: absteigend umdrehen, nur unsortiert wirklich sortieren
+        if len(ordinals) > 1:
+            steps = np.diff(ordinals)
+            if (steps <= 0).all():
+                ordinals = ordinals[::-1]
+                values = values[::-1]
+            elif not (steps >= 0).all():
+                order = np.argsort(ordinals, kind='stable')
+                ordinals = ordinals[order]
+                values = values[order]
+
+        ordinal_array = array('i')
+        ordinal_array.frombytes(np.ascontiguousarray(ordinals, dtype=np.int32).tobytes())
+        value_array = array('d')
+        value_array.frombytes(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        return TimeSeries(ordinal_array, value_array)
+
+    def _convert_scalar(self, observations: List[Dict], dataset_id: str) -> TimeSeries:
+        """Skalarer Fallback; ungültige Werte werden gesammelt statt einzeln geloggt"""
+        invalid = []
+
+        def convert(raw_value):
+            value = self.convert_value(raw_value)
+            if value is None and raw_value is not None and raw_value not in self.missing:
+                invalid.append(raw_value)
+            return value
+
+        series = TimeSeries.from_observations(observations, convert)
+
+        if invalid:
+            logger.warning(f"Could not convert {len(invalid)} values for dataset {dataset_id} "
+                           f"(e.g. '{invalid[0]}')")
+        return series
+
+
+IDENTITY_RULE = ConversionRule()
+
+
+def compile_conversion_rules(*specs: Dict[str, Dict[str, Any]]) -> Dict[str, ConversionRule]:
+    """Kompiliert Regel-Deklarationen; spätere Deklarationen überschreiben frühere
+
+    Args:
+        specs: Dictionaries {dataset_id: {"scale": ..., "offset": ..., "missing": [...]}}
+
+    Returns:
+        Kompilierte Regeln pro Dataset-ID
+    """
+    merged = {}
+    for spec in specs:
+        for dataset_id, rule_spec in (spec or {}).items():
+            merged[dataset_id] = ConversionRule.compile(rule_spec)
+    return merged
@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
 # sources/fred_source.py - FRED API-Integration für das WED-Dashboard
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import time
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .base_source import BaseAPISource
+from .timeseries import TimeSeries
+from .metadata_cache import create_metadata_cache
 
 logger = logging.getLogger(__name__)
 
@@ -12,13 +19,41 @@ class FREDSource(BaseAPISource):
     
     Spezialisierte Klasse für FRED-API:
     - Unterstützt alle Standard-FRED-Parameter
-    - Automatische Datenkonvertierung für Wirtschaftsindikatoren
+    - Automatische Datenkonvertierung für Wirtschaftsindikatoren (Regeln siehe
+      DEFAULT_CONVERSIONS; Prozentsätze und CPI-Indexwerte bleiben unverändert)
     - Robuste Fehlerbehandlung für FRED-spezifische Probleme
     """
     
-    # Mindestintervall zwischen API-Calls (für api_manager)
+    # Mindestintervall zwischen API-Calls (nur für Manager ohne Token-Bucket der Quelle relevant)
     MIN_INTERVAL = 1.0
     
+    # Maximale Anzahl Beobachtungen pro Request laut FRED-API
+    MAX_LIMIT = 100000
+    
+    # Maximale Anzahl Serien pro Seite bei release/series und category/series
+    MAX_BULK_LIMIT = 1000
+    
+    # Standard-Abfrage, wenn fetch_dataset ohne Parameter aufgerufen wird
+    DEFAULT_QUERY = {
+        'sort_order': 'desc',  # Neueste Daten zuerst
+        'limit': 60  # Letzten 5 Jahre (ca. 12 Quartale * 5)
+    }
+    
+    def __init__(self, config: Dict[str, Any], api_key: str = "", base_dir: str = None):
+        super().__init__(config, api_key)
+        
+        # Paginierung für lange Zeiträume (fetch_historical_range)
+        self.page_size = min(config.get('page_size', 10000), self.MAX_LIMIT)
+        self.page_workers = max(1, config.get('page_workers', 4))
+        
+        # Serien-Metadaten auf Platte cachen; Massenabruf über Releases/Kategorien,
+        # z.B. "metadata_bulk": {"releases": [10, 53], "categories": [32991]}
+        # (Standard: series_metadata.sqlite neben api_config.json, falls base_dir bekannt)
+        self.metadata_cache = create_metadata_cache(config.get('metadata_cache', {}), base_dir)
+        self.metadata_bulk = config.get('metadata_bulk', {})
+        self._metadata_refresh = None
+        self._metadata_refresh_lock = threading.Lock()
+    
     def fetch_dataset(self, dataset_id: str, params: Dict = None) -> Dict:
         """Ruft FRED-Datensatz ab und konvertiert in Standard-Format
         
@@ -29,6 +64,40 @@ class FREDSource(BaseAPISource):
         Returns:
             Standardisierte Datenstruktur für Dashboard
         """
+        url, request_params, dataset_info = self._build_observations_request(dataset_id, params)
+        
+        try:
+            # FRED API-Call
+            response_data = self._make_request(url, request_params)
+            return self._parse_observations_response(response_data, dataset_info, request_params)
+            
+        except Exception as e:
+            logger.error(f"FRED fetch failed for {dataset_id}: {str(e)}")
+            raise
+    
+    async def fetch_dataset_async(self, dataset_id: str, params: Dict = None) -> Dict:
+        """Asynchrone Variante von fetch_dataset (gleiche Parameter und Rückgabe)"""
+        url, request_params, dataset_info = self._build_observations_request(dataset_id, params)
+        
+        try:
+            # FRED API-Call ohne Blockieren der Event-Loop
+            response_data = await self._make_request_async(url, request_params)
+            return self._parse_observations_response(response_data, dataset_info, request_params)
+            
+        except Exception as e:
+            logger.error(f"FRED fetch failed for {dataset_id}: {str(e)}")
+            raise
+    
+    def _build_observations_request(self, dataset_id: str, params: Dict = None) -> Tuple[str, Dict, Dict]:
+        """Bereitet einen Observations-Request vor (gemeinsam für Sync- und Async-Pfad)
+        
+        Args:
+            dataset_id: Logische Dataset-ID
+            params: Zusätzliche FRED-Parameter
+            
+        Returns:
+            Tupel (URL, Request-Parameter, Dataset-Info für die Konvertierung)
+        """
         # FRED-spezifische Dataset-ID aus Config holen
         fred_series_id = self.get_dataset_config(dataset_id)
         if not fred_series_id:
@@ -39,70 +108,309 @@ class FREDSource(BaseAPISource):
             'series_id': fred_series_id,
             'api_key': self.api_key,
             'file_type': 'json',
-            'sort_order': 'desc',  # Neueste Daten zuerst
-            'limit': 60  # Letzten 5 Jahre (ca. 12 Quartale * 5)
+            **self.DEFAULT_QUERY
         }
         
         # Benutzer-Parameter hinzufügen/überschreiben
         if params:
             request_params.update(params)
         
-        try:
-            # FRED API-Call
-            url = f"{self.base_url}/series/observations"
-            response_data = self._make_request(url, request_params)
-            
-            # FRED-Response validieren
-            if 'observations' not in response_data:
-                raise Exception("Invalid FRED response: missing 'observations'")
-            
-            observations = response_data['observations']
-            
-            # Dataset-Info für Konvertierung
-            dataset_info = {
-                'id': dataset_id,
-                'fred_series': fred_series_id,
-                'source': 'FRED'
-            }
-            
-            # Daten in Standard-Format konvertieren
-            standardized_data = self._standardize_data_format(observations, dataset_info)
-            
-            logger.info(f"Successfully fetched {len(observations)} observations for {dataset_id}")
-            return standardized_data
+        # Dataset-Info für Konvertierung
+        dataset_info = {
+            'id': dataset_id,
+            'fred_series': fred_series_id,
+            'source': 'FRED'
+        }
+        
+        return f"{self.base_url}/series/observations", request_params, dataset_info
+    
+    def _parse_observations_response(self, response_data: Dict, dataset_info: Dict,
+                                     request_params: Dict = None) -> Dict:
+        """Validiert eine Observations-Antwort und konvertiert sie in das Standard-Format
+        
+        Args:
+            response_data: JSON-Antwort der FRED-API
+            dataset_info: Dataset-Info aus _build_observations_request
+            request_params: Parameter des Requests (für meta.coverage)
             
-        except Exception as e:
-            logger.error(f"FRED fetch failed for {dataset_id}: {str(e)}")
-            raise
+        Returns:
+            Standardisierte Datenstruktur
+        """
+        # FRED-Response validieren
+        if 'observations' not in response_data:
+            raise Exception("Invalid FRED response: missing 'observations'")
+        
+        observations = response_data['observations']
+        
+        # Daten in Standard-Format konvertieren
+        standardized_data = self._standardize_data_format(observations, dataset_info)
+        
+        coverage = self._response_coverage(response_data, request_params or {})
+        if coverage is not None:
+            standardized_data['meta']['coverage'] = coverage
+        
+        logger.info(f"Successfully fetched {len(observations)} observations for {dataset_info['id']}")
+        return standardized_data
+    
+    @staticmethod
+    def _response_coverage(response_data: Dict, request_params: Dict) -> Optional[Dict]:
+        """Zeitraum, für den die Antwort alle Beobachtungen enthält (None bei Offset-Seiten)
+        
+        Ist die Antwort durch limit abgeschnitten (count > Anzahl), reicht der
+        Zeitraum nur bis zur letzten gelieferten Beobachtung - bei absteigender
+        Sortierung also von der ältesten gelieferten bis observation_end.
+        """
+        if int(request_params.get('offset', 0) or 0) != 0:
+            return None
+        
+        observations = response_data['observations']
+        start = request_params.get('observation_start')
+        end = request_params.get('observation_end')
+        if len(observations) >= int(response_data.get('count', len(observations))):
+            return {'start': start, 'end': end}
+        if request_params.get('sort_order') == 'desc':
+            return {'start': observations[-1]['date'], 'end': end}
+        return {'start': start, 'end': observations[-1]['date']}
+    
+    def describe_query(self, dataset_id: str, params: Dict = None) -> Optional[Dict]:
+        """Zeitfenster und Limit einer Observations-Abfrage (siehe BaseAPISource.describe_query)
+        
+        units, frequency, realtime_start usw. verändern die Werte selbst und landen
+        in 'variant'; nur Abfragen mit gleicher Variante werden auseinander bedient.
+        """
+        query = dict(self.DEFAULT_QUERY, **(params or {}))
+        if int(query.pop('offset', 0) or 0) != 0:
+            return None
+        
+        try:
+            limit = int(query.pop('limit'))
+        except (TypeError, ValueError):
+            return None
+        
+        start = query.pop('observation_start', None)
+        end = query.pop('observation_end', None)
+        newest_first = query.pop('sort_order') == 'desc'
+        return {
+            'variant': json.dumps(query, sort_keys=True, default=str),
+            'start': start,
+            'end': end,
+            'limit': limit,
+            'newest_first': newest_first
+        }
+    
+    def get_range_params(self, start_date: str, end_date: str) -> Optional[Dict]:
+        """Zeitraum-Abfrage, deren Ergebnis dem von fetch_historical_range entspricht
+        
+        Bis MAX_LIMIT Beobachtungen liefert fetch_dataset mit diesen Parametern
+        dasselbe Ergebnis in einem Request; fetch_historical_range lädt den
+        Zeitraum dagegen seitenweise parallel und immer vollständig.
+        """
+        return {
+            'observation_start': start_date,
+            'observation_end': end_date,
+            'sort_order': 'asc',
+            'limit': self.MAX_LIMIT
+        }
+    
+    def get_incremental_params(self, start_date: str) -> Optional[Dict]:
+        """Delta-Abfrage über observation_start
+        
+        Das Standard-Limit von 60 Beobachtungen wird aufgehoben, damit auch nach
+        längeren Pausen keine Beobachtungen zwischen Bestand und Gegenwart fehlen.
+        """
+        return {
+            'observation_start': start_date,
+            'limit': self.MAX_LIMIT
+        }
     
     def get_available_datasets(self) -> List[Dict]:
         """Gibt alle konfigurierten FRED-Datensätze zurück
         
+        Metadaten kommen aus dem Metadaten-Cache. Nur fehlende oder abgelaufene
+        Serien werden sofort geladen; ältere Einträge werden ausgeliefert und im
+        Hintergrund aufgefrischt.
+        
         Returns:
             Liste mit Dataset-Informationen
         """
+        series_infos = self.get_series_metadata(list(self.datasets.values()))
+        
         datasets = []
         for logical_id, fred_series_id in self.datasets.items():
-            
-            # Zusätzliche Metadaten aus FRED Series-Info holen (optional)
-            try:
-                series_info = self._get_series_info(fred_series_id)
-                title = series_info.get('title', logical_id.title())
-                units = series_info.get('units', 'Unknown')
-            except:
-                title = logical_id.title()
-                units = 'Unknown'
-            
+            series_info = series_infos.get(fred_series_id, {})
             datasets.append({
                 'id': logical_id,
-                'title': title,
+                'title': series_info.get('title', logical_id.title()),
                 'source': 'FRED',
                 'series_id': fred_series_id,
-                'units': units
+                'units': series_info.get('units', 'Unknown'),
+                'frequency': series_info.get('frequency_short')
             })
         
         return datasets
     
+    def get_revision_stamps(self, dataset_ids: List[str]) -> Dict[str, str]:
+        """Revisionsstempel aus last_updated und observation_end der Serien-Metadaten
+        
+        Die Stempel stammen ausschließlich aus den Massenabfragen von metadata_bulk
+        (bis zu 1000 Serien pro Request) und werden dabei im Metadaten-Cache
+        aktualisiert. Einzelne /series-Requests pro Serie würden so viel kosten wie
+        der Abruf selbst - Serien außerhalb der konfigurierten Releases/Kategorien
+        erhalten daher keinen Stempel und werden normal abgerufen.
+        
+        Args:
+            dataset_ids: Logische Dataset-IDs
+            
+        Returns:
+            {dataset_id: "last_updated|observation_end"} für Serien mit Metadaten
+        """
+        if not (self.metadata_bulk.get('releases') or self.metadata_bulk.get('categories')):
+            logger.warning("Revision probe needs metadata_bulk releases or categories - fetching all series")
+            return {}
+        
+        series_by_dataset = {dataset_id: self.get_dataset_config(dataset_id) for dataset_id in dataset_ids}
+        series_infos = self._load_series_metadata(
+            sorted({series_id for series_id in series_by_dataset.values() if series_id}), per_series=False
+        )
+        
+        stamps = {}
+        for dataset_id, series_id in series_by_dataset.items():
+            series_info = series_infos.get(series_id, {})
+            if series_info.get('last_updated'):
+                stamps[dataset_id] = f"{series_info['last_updated']}|{series_info.get('observation_end', '')}"
+        return stamps
+    
+    def get_series_metadata(self, series_ids: List[str]) -> Dict[str, Dict]:
+        """Metadaten mehrerer FRED-Serien, bevorzugt aus dem Cache
+        
+        Args:
+            series_ids: FRED Series-IDs
+            
+        Returns:
+            {series_id: metadaten} (Serien ohne abrufbare Metadaten fehlen)
+        """
+        if self.metadata_cache is None:
+            return self._load_series_metadata(series_ids)
+        
+        now = time.time()
+        cached = self.metadata_cache.get_many(series_ids)
+        result = {
+            series_id: info for series_id, (info, fetched) in cached.items()
+            if not self.metadata_cache.is_expired(fetched, now)
+        }
+        
+        missing = [series_id for series_id in series_ids if series_id not in result]
+        if missing:
+            result.update(self._load_series_metadata(missing))
+        
+        stale = [
+            series_id for series_id, (_, fetched) in cached.items()
+            if series_id in result and series_id not in missing
+            and self.metadata_cache.needs_refresh(fetched, now)
+        ]
+        if stale:
+            self._refresh_metadata_in_background(stale)
+        
+        return result
+    
+    def _load_series_metadata(self, series_ids: List[str], per_series: bool = True) -> Dict[str, Dict]:
+        """Lädt Metadaten von der API und speichert sie im Cache
+        
+        Zuerst werden die konfigurierten Releases und Kategorien seitenweise
+        abgerufen (bis zu 1000 Serien pro Request), nur die danach noch fehlenden
+        Serien einzeln über /series.
+        
+        Args:
+            series_ids: FRED Series-IDs
+            per_series: Fehlende Serien einzeln über /series nachladen
+            
+        Returns:
+            {series_id: metadaten} für die angefragten Serien
+        """
+        wanted = set(series_ids)
+        found = {}
+        
+        for kind, plural in (('release', 'releases'), ('category', 'categories')):
+            for bulk_id in self.metadata_bulk.get(plural, []):
+                if wanted.issubset(found):
+                    break
+                try:
+                    found.update(self._fetch_bulk_metadata(kind, bulk_id))
+                except Exception as e:
+                    logger.warning(f"Bulk metadata fetch failed for {kind} {bulk_id}: {str(e)}")
+        
+        for series_id in (wanted.difference(found) if per_series else ()):
+            try:
+                series_info = self._get_series_info(series_id)
+            except Exception as e:
+                logger.warning(f"Could not fetch metadata for {series_id}: {str(e)}")
+                continue
+            if series_info:
+                found[series_id] = series_info
+        
+        # Alle Treffer der Massenabfragen cachen - auch Serien, die (noch) nicht konfiguriert sind
+        if self.metadata_cache is not None:
+            self.metadata_cache.set_many(found)
+        
+        return {series_id: info for series_id, info in found.items() if series_id in wanted}
+    
+    def _fetch_bulk_metadata(self, kind: str, bulk_id: Any) -> Dict[str, Dict]:
+        """Ruft Metadaten aller Serien eines Releases oder einer Kategorie ab
+        
+        Args:
+            kind: 'release' oder 'category'
+            bulk_id: release_id bzw. category_id
+            
+        Returns:
+            {series_id: metadaten}
+        """
+        url = f"{self.base_url}/{kind}/series"
+        result = {}
+        offset = 0
+        
+        while True:
+            response = self._make_request(url, {
+                f'{kind}_id': bulk_id,
+                'api_key': self.api_key,
+                'file_type': 'json',
+                'limit': self.MAX_BULK_LIMIT,
+                'offset': offset
+            })
+            page = response.get('seriess', [])
+            for series_info in page:
+                result[series_info['id']] = series_info
+            
+            offset += len(page)
+            if not page or offset >= response.get('count', 0):
+                break
+        
+        logger.info(f"Fetched metadata for {len(result)} series of {kind} {bulk_id}")
+        return result
+    
+    def _refresh_metadata_in_background(self, series_ids: List[str]) -> None:
+        """Frischt Metadaten in einem Hintergrund-Thread auf (höchstens ein Lauf gleichzeitig)"""
+        with self._metadata_refresh_lock:
+            if self._metadata_refresh is not None and self._metadata_refresh.is_alive():
+                return
+            self._metadata_refresh = threading.Thread(
+                target=self._load_series_metadata, args=(series_ids,),
+                name='fred-metadata-refresh', daemon=True
+            )
+            self._metadata_refresh.start()
+    
+    def close(self) -> None:
+        """Wartet auf eine laufende Metadaten-Auffrischung und gibt Ressourcen frei"""
+        with self._metadata_refresh_lock:
+            refresh = self._metadata_refresh
+            self._metadata_refresh = None
+        if refresh is not None:
+            refresh.join(timeout=self.timeout)
+        super().close()
+        
+        if self.metadata_cache is not None and (refresh is None or not refresh.is_alive()):
+            self.metadata_cache.close()
+            self.metadata_cache = None
+    
     def _get_series_info(self, fred_series_id: str) -> Dict:
         """Holt Metadaten für eine FRED-Serie
         
@@ -137,7 +445,16 @@ class FREDSource(BaseAPISource):
         """
         params = {'limit': 1}  # Nur neuester Wert
         data = self.fetch_dataset(dataset_id, params)
-        
+        return self._latest_value_result(dataset_id, data)
+    
+    async def fetch_latest_value_async(self, dataset_id: str) -> Dict:
+        """Asynchrone Variante von fetch_latest_value"""
+        data = await self.fetch_dataset_async(dataset_id, {'limit': 1})
+        return self._latest_value_result(dataset_id, data)
+    
+    @staticmethod
+    def _latest_value_result(dataset_id: str, data: Dict) -> Dict:
+        """Reduziert standardisierte Daten auf den neuesten Wert"""
         return {
             'dataset': dataset_id,
             'latest': data['data']['latest'],
@@ -145,7 +462,12 @@ class FREDSource(BaseAPISource):
         }
     
     def fetch_historical_range(self, dataset_id: str, start_date: str, end_date: str) -> Dict:
-        """Ruft Daten für einen spezifischen Zeitraum ab
+        """Ruft Daten für einen spezifischen Zeitraum vollständig ab
+        
+        Lange Zeiträume werden über FREDs offset/count seitenweise abgerufen: Die
+        erste Seite liefert die Gesamtanzahl, die restlichen Seiten werden parallel
+        (innerhalb des Rate-Limits) geladen. Jede Seite wird sofort nach Eingang
+        konvertiert und die Rohdaten verworfen.
         
         Args:
             dataset_id: Logische Dataset-ID
@@ -155,56 +477,109 @@ class FREDSource(BaseAPISource):
         Returns:
             Daten für den angegebenen Zeitraum
         """
-        params = {
-            'observation_start': start_date,
-            'observation_end': end_date,
-            'limit': 1000  # Mehr Datenpunkte für längere Zeiträume
-        }
+        url, request_params, dataset_info = self._build_observations_request(
+            dataset_id, self._historical_range_params(start_date, end_date)
+        )
         
-        return self.fetch_dataset(dataset_id, params)
+        try:
+            first_page = self._make_request(url, request_params)
+            parts, offsets = self._start_pagination(first_page, dataset_info)
+            
+            if offsets:
+                def fetch_page(offset: int) -> Tuple[int, TimeSeries]:
+                    page = self._make_request(url, dict(request_params, offset=offset))
+                    return offset, self._page_to_series(page, dataset_info)
+                
+                with ThreadPoolExecutor(max_workers=min(self.page_workers, len(offsets)),
+                                        thread_name_prefix='fred-page') as executor:
+                    for future in as_completed([executor.submit(fetch_page, offset) for offset in offsets]):
+                        offset, series = future.result()
+                        parts[offset] = series
+            
+            return self._finish_pagination(parts, dataset_info, start_date, end_date)
+            
+        except Exception as e:
+            logger.error(f"FRED range fetch failed for {dataset_id}: {str(e)}")
+            raise
     
-    def _convert_value(self, raw_value: str, dataset_info: Dict) -> float:
-        """FRED-spezifische Wert-Konvertierung
-        
-        Überschreibt die Basis-Methode für FRED-spezifische Besonderheiten:
-        - GDP in Billionen umrechnen
-        - Prozentsätze normalisieren
-        - Fehlende Werte (".") behandeln
-        """
-        if raw_value is None or raw_value == "." or raw_value == "":
-            return None
+    async def fetch_historical_range_async(self, dataset_id: str, start_date: str, end_date: str) -> Dict:
+        """Asynchrone Variante von fetch_historical_range (Seiten laufen parallel auf der Event-Loop)"""
+        url, request_params, dataset_info = self._build_observations_request(
+            dataset_id, self._historical_range_params(start_date, end_date)
+        )
         
         try:
-            value = float(raw_value)
+            first_page = await self._make_request_async(url, request_params)
+            parts, offsets = self._start_pagination(first_page, dataset_info)
             
-            # FRED-spezifische Konvertierungen
-            dataset_id = dataset_info.get('id', '')
+            semaphore = asyncio.Semaphore(self.page_workers)
             
-            if dataset_id == 'gdp':
-                # GDP von Milliarden in Billionen USD
-                value = value / 1000
-            elif dataset_id in ['unemployment', 'interest_rate_fed', 'interest_rate_ecb']:
-                # Prozentsätze bleiben unverändert
-                pass
-            elif dataset_id == 'inflation':
-                # CPI bleibt als Index-Wert
-                pass
+            async def fetch_page(offset: int) -> None:
+                async with semaphore:
+                    page = await self._make_request_async(url, dict(request_params, offset=offset))
+                parts[offset] = self._page_to_series(page, dataset_info)
             
-            return value
+            await asyncio.gather(*(fetch_page(offset) for offset in offsets))
+            return self._finish_pagination(parts, dataset_info, start_date, end_date)
             
-        except (ValueError, TypeError):
-            logger.warning(f"Could not convert value '{raw_value}' for dataset {dataset_info.get('id')}")
-            return None
+        except Exception as e:
+            logger.error(f"FRED range fetch failed for {dataset_id}: {str(e)}")
+            raise
+    
+    def _historical_range_params(self, start_date: str, end_date: str) -> Dict:
+        """Parameter für die erste Seite eines Zeitraum-Abrufs (älteste zuerst)"""
+        return {
+            'observation_start': start_date,
+            'observation_end': end_date,
+            'sort_order': 'asc',
+            'limit': self.page_size,
+            'offset': 0
+        }
+    
+    def _page_to_series(self, page: Dict, dataset_info: Dict) -> TimeSeries:
+        """Validiert eine Seite und konvertiert sie sofort in eine Zeitreihe"""
+        if 'observations' not in page:
+            raise Exception("Invalid FRED response: missing 'observations'")
+        return self._build_series(page['observations'], dataset_info)
+    
+    def _start_pagination(self, first_page: Dict, dataset_info: Dict) -> Tuple[Dict[int, TimeSeries], List[int]]:
+        """Verarbeitet die erste Seite und ermittelt die Offsets der restlichen Seiten
+        
+        Returns:
+            Tupel (bereits konvertierte Seiten nach Offset, noch abzurufende Offsets)
+        """
+        parts = {0: self._page_to_series(first_page, dataset_info)}
+        total = int(first_page.get('count', 0))
+        offsets = list(range(self.page_size, total, self.page_size))
+        
+        if offsets:
+            logger.info(f"Fetching {total} observations for {dataset_info['id']} "
+                        f"in {len(offsets) + 1} pages")
+        return parts, offsets
+    
+    def _finish_pagination(self, parts: Dict[int, TimeSeries], dataset_info: Dict,
+                           start_date: str, end_date: str) -> Dict:
+        """Fügt die Seiten in Offset-Reihenfolge zusammen und erzeugt das Standard-Format
+        
+        Alle Seiten zusammen enthalten den Zeitraum vollständig (meta.coverage),
+        das Ergebnis kann im API-Manager also engere Abfragen bedienen.
+        """
+        series = TimeSeries.concat(parts[offset] for offset in sorted(parts))
+        logger.info(f"Successfully fetched {len(series)} observations for {dataset_info['id']}")
+        result = self._wrap_series(series, dataset_info)
+        result['meta']['coverage'] = {'start': start_date, 'end': end_date}
+        return result
 
 # Factory-Funktion für api_manager
-def create_fred_source(config: Dict, api_key: str) -> FREDSource:
+def create_fred_source(config: Dict, api_key: str, base_dir: str = None) -> FREDSource:
     """Erstellt FRED-Source-Instanz
     
     Args:
         config: FRED-Konfiguration aus api_config.json
         api_key: FRED API-Schlüssel
+        base_dir: Optional, Verzeichnis von api_config.json (für den Metadaten-Cache)
         
     Returns:
         Konfigurierte FRED-Source-Instanz
     """
-    return FREDSource(config, api_key)
+    return FREDSource(config, api_key, base_dir)
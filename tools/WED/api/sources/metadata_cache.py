@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# sources/metadata_cache.py - Persistenter Cache für Serien-Metadaten (Titel, Einheit, Frequenz, ...)
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SeriesMetadataCache:
+    """SQLite-Cache für Serien-Metadaten mit langer Lebensdauer
+
+    Metadaten ändern sich selten; Einträge gelten daher lange (ttl) und werden
+    nach refresh_after nur noch im Hintergrund aufgefrischt, während der
+    vorhandene Stand sofort ausgeliefert wird.
+    """
+
+    def __init__(self, path: str = "series_metadata.sqlite", ttl: float = 30 * 86400,
+                 refresh_after: float = 86400):
+        """Öffnet (oder erstellt) die Cache-Datenbank
+
+        Args:
+            path: Pfad zur SQLite-Datei (":memory:" für einen reinen Prozess-Cache)
+            ttl: Maximales Alter eines Eintrags in Sekunden, danach wird neu geladen
+            refresh_after: Alter in Sekunden, ab dem im Hintergrund aufgefrischt wird
+        """
+        self.path = path
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Stellt die Datenbankverbindung her und legt das Schema an"""
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        if self.path != ':memory:':
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS series (
+                   series_id TEXT PRIMARY KEY,
+                   fetched REAL NOT NULL,
+                   payload TEXT NOT NULL
+               )"""
+        )
+        conn.commit()
+        return conn
+
+    def get_many(self, series_ids: Iterable[str]) -> Dict[str, Tuple[Dict[str, Any], float]]:
+        """Liest Metadaten mehrerer Serien
+
+        Args:
+            series_ids: Serien-IDs
+
+        Returns:
+            {series_id: (metadaten, abrufzeitpunkt)} für alle gefundenen Serien,
+            unabhängig vom Alter (siehe is_expired / needs_refresh)
+        """
+        series_ids = list(series_ids)
+        result = {}
+        try:
+            with self._lock:
+                # In Blöcken abfragen (SQLite begrenzt die Anzahl der Parameter)
+                for start in range(0, len(series_ids), 500):
+                    chunk = series_ids[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT series_id, fetched, payload FROM series "
+                        f"WHERE series_id IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    for series_id, fetched, payload in rows:
+                        result[series_id] = (json.loads(payload), fetched)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Metadata cache read failed: {str(e)}")
+        return result
+
+    def set_many(self, infos: Dict[str, Dict[str, Any]], fetched: float = None) -> None:
+        """Speichert Metadaten mehrerer Serien
+
+        Args:
+            infos: {series_id: metadaten}
+            fetched: Abrufzeitpunkt, Standard ist jetzt
+        """
+        if not infos:
+            return
+        fetched = fetched if fetched is not None else time.time()
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO series (series_id, fetched, payload) VALUES (?, ?, ?)",
+                    [(series_id, fetched, json.dumps(info, ensure_ascii=False, separators=(',', ':')))
+                     for series_id, info in infos.items()]
+                )
+                self._conn.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Metadata cache write failed: {str(e)}")
+
+    def is_expired(self, fetched: float, now: float = None) -> bool:
+        """True, wenn ein Eintrag zu alt ist, um noch ausgeliefert zu werden"""
+        return (now if now is not None else time.time()) - fetched >= self.ttl
+
+    def needs_refresh(self, fetched: float, now: float = None) -> bool:
+        """True, wenn ein Eintrag im Hintergrund aufgefrischt werden sollte"""
+        return (now if now is not None else time.time()) - fetched >= self.refresh_after
+
+    def clear(self) -> None:
+        """Löscht alle Einträge"""
+        with self._lock:
+            self._conn.execute("DELETE FROM series")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Schließt die Datenbankverbindung"""
+        with self._lock:
+            self._conn.close()
+
+
+def create_metadata_cache(cache_config: Dict[str, Any], base_dir: str = None) -> Optional[SeriesMetadataCache]:
+    """Erstellt den Metadaten-Cache aus dem 'metadata_cache'-Abschnitt einer Quelle
+
+    Wie beim Antwort-Cache (response_cache.create_response_cache): Ohne "backend"
+    wird nur mit bekanntem Basisverzeichnis (Verzeichnis der Konfigurationsdatei)
+    oder konfiguriertem "path" auf Platte gecacht, sonst nur im Prozess - so
+    entsteht keine Datei im aktuellen Arbeitsverzeichnis.
+
+    Args:
+        cache_config: Konfiguration, z.B. {"backend": "sqlite", "path": "series_metadata.sqlite",
+                      "ttl": 2592000, "refresh_after": 86400}; "backend": "memory"
+                      hält die Metadaten auch mit "path" nur im Prozess
+        base_dir: Optional, Verzeichnis, gegen das ein relativer "path" aufgelöst wird
+
+    Returns:
+        Cache-Instanz oder None, falls die Datenbank nicht geöffnet werden kann
+    """
+    backend = cache_config.get('backend', 'sqlite' if base_dir is not None or 'path' in cache_config else 'memory')
+    if backend not in ('memory', 'sqlite'):
+        logger.warning(f"Unknown metadata cache backend '{backend}'. Falling back to in-memory cache.")
+        backend = 'memory'
+
+    path = ':memory:'
+    if backend == 'sqlite':
+        path = cache_config.get('path', 'series_metadata.sqlite')
+        if base_dir is not None and path != ':memory:' and not os.path.isabs(path):
+            path = os.path.join(base_dir, path)
+    try:
+        return SeriesMetadataCache(
+            path=path,
+            ttl=cache_config.get('ttl', 30 * 86400),
+            refresh_after=cache_config.get('refresh_after', 86400)
+        )
+    except sqlite3.Error as e:
+        logger.error(f"Could not open metadata cache: {str(e)}")
+        return None
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# sources/metrics.py - Prozessweite Metriken (Zähler, Gauges, Latenz-Histogramme) mit Prometheus-Export
+
+import os
+import math
+import time
+import threading
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Tuple
+
+# Bekannte Metriken: Name -> (Typ, Beschreibung) für # HELP / # TYPE im Prometheus-Export
+METRIC_HELP = {
+    'wed_fetch_duration_seconds': ('histogram', 'Duration of APIManager.fetch_data calls that reached the source'),
+    'wed_fetch_errors_total': ('counter', 'fetch_data calls that returned an error'),
+    'wed_cache_requests_total': ('counter', 'fetch_data cache lookups by result (hit, stale, miss, expired)'),
+    'wed_cache_subsumed_total': ('counter', 'Cache misses answered by slicing a cached wider result'),
+    'wed_cache_refreshes_total': ('counter', 'Background refreshes of stale cache entries by result (ok, error)'),
+    'wed_fetch_coalesced_total': ('counter', 'fetch_data calls that joined an identical in-flight request'),
+    'wed_rate_limit_wait_seconds_total': ('counter', 'Time spent waiting for rate limits'),
+    'wed_http_request_duration_seconds': ('histogram', 'Duration of single HTTP requests'),
+    'wed_http_responses_total': ('counter', 'HTTP responses by status code'),
+    'wed_http_retries_total': ('counter', 'Retried HTTP requests'),
+    'wed_http_bytes_total': ('counter', 'Bytes downloaded (Content-Length, else decoded body size)'),
+    'wed_parse_duration_seconds': ('histogram', 'Time spent converting observations to the standard format'),
+    'wed_aligned_views_total': ('counter', 'Aligned multi-series view builds by result (computed, cached, error)'),
+    'wed_derived_series_total': ('counter', 'Derived series evaluations by result (computed, cached, error)'),
+    'wed_scheduler_refreshes_total': ('counter', 'Scheduler refreshes by result (new, unchanged, waiting, error)'),
+    'wed_update_datasets': ('gauge', 'Datasets of the last update run by status'),
+    'wed_update_duration_seconds': ('gauge', 'Duration of the last update run'),
+    'wed_update_last_success_timestamp_seconds': ('gauge', 'Unix time of the last completed update run'),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class MetricsRegistry:
+    """Thread-sichere Sammlung von Zählern, Gauges und Histogrammen
+
+    Metriken werden über Namen und Labels adressiert, z.B.
+    metrics.inc('wed_cache_requests_total', source='fred', result='hit').
+    Werte sind kumulativ seit Prozessstart (Prometheus-Konvention).
+    """
+
+    # Histogramm-Grenzen in Sekunden (obere Grenzen, +Inf wird implizit ergänzt)
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, list]] = {}
+
+    @staticmethod
+    def _key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        """Erhöht einen Zähler"""
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """Setzt einen Gauge-Wert"""
+        key = self._key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = float(value)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Trägt einen Messwert (z.B. Latenz in Sekunden) in ein Histogramm ein"""
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                # [Zähler pro Bucket inkl. +Inf, Summe, Anzahl]
+                state = series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            index = len(self.buckets)
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    index = position
+                    break
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Misst die Laufzeit eines Blocks als Histogramm-Eintrag"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self) -> None:
+        """Verwirft alle Metriken"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def _quantile(self, state: list, fraction: float) -> float:
+        """Schätzt ein Quantil aus den Bucket-Zählern (lineare Interpolation wie histogram_quantile)"""
+        counts, _, total = state
+        if total == 0:
+            return 0.0
+        rank = fraction * total
+        cumulative = 0
+        lower = 0.0
+        for position, count in enumerate(counts):
+            if cumulative + count >= rank and count > 0:
+                if position == len(self.buckets):
+                    # Im +Inf-Bucket ist keine Obergrenze bekannt
+                    return self.buckets[-1]
+                upper = self.buckets[position]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+            if position < len(self.buckets):
+                lower = self.buckets[position]
+        return self.buckets[-1]
+
+    def snapshot(self, **label_filter) -> Dict[str, Dict[str, Any]]:
+        """Kompakte, JSON-fähige Sicht auf alle Metriken (z.B. für update_summary)
+
+        Args:
+            label_filter: Nur Serien mit diesen Label-Werten, z.B. source='fred'. Die
+                          gefilterten Labels werden im Schlüssel weggelassen.
+
+        Returns:
+            {"counters": {...}, "gauges": {...}, "histograms": {...}} mit Schlüsseln
+            der Form 'name{label=wert,...}'; Histogramme als count, sum, p50 und p95
+        """
+        wanted = {name: str(value) for name, value in label_filter.items()}
+
+        def select(series: Dict[LabelKey, Any]):
+            for key, value in series.items():
+                labels = dict(key)
+                if all(labels.get(name) == expected for name, expected in wanted.items()):
+                    rest = ','.join(f"{name}={value}" for name, value in key if name not in wanted)
+                    yield rest, value
+
+        def label(name: str, rest: str) -> str:
+            return f"{name}{{{rest}}}" if rest else name
+
+        result = {"counters": {}, "gauges": {}, "histograms": {}}
+        with self._lock:
+            for name, series in self._counters.items():
+                for rest, value in select(series):
+                    result["counters"][label(name, rest)] = round(value, 6)
+            for name, series in self._gauges.items():
+                for rest, value in select(series):
+                    result["gauges"][label(name, rest)] = round(value, 6)
+            for name, series in self._histograms.items():
+                for rest, state in select(series):
+                    result["histograms"][label(name, rest)] = {
+                        "count": state[2],
+                        "sum": round(state[1], 6),
+                        "p50": round(self._quantile(state, 0.50), 6),
+                        "p95": round(self._quantile(state, 0.95), 6)
+                    }
+        return result
+
+    def to_prometheus(self) -> str:
+        """Exportiert alle Metriken im Prometheus-Textformat (Version 0.0.4)"""
+        lines = []
+
+        def header(name: str, default_type: str) -> None:
+            metric_type, description = METRIC_HELP.get(name, (default_type, name))
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        with self._lock:
+            for name in sorted(self._counters):
+                header(name, 'counter')
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for name in sorted(self._gauges):
+                header(name, 'gauge')
+                for key, value in sorted(self._gauges[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for name in sorted(self._histograms):
+                header(name, 'histogram')
+                for key, (counts, total_sum, total_count) in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + (float('inf'),), counts):
+                        cumulative += count
+                        le = _format_value(bound)
+                        lines.append(f"{name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total_sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {total_count}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str) -> None:
+        """Schreibt den Prometheus-Export atomar (für den Textfile-Collector des node_exporter)
+
+        Args:
+            path: Zieldatei, üblicherweise mit Endung .prom
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+
+def _format_labels(key: LabelKey) -> str:
+    """Labels im Prometheus-Format, z.B. {source="fred",result="hit"}"""
+    if not key:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in key) + '}'
+
+
+def _escape(value: str) -> str:
+    """Maskiert Backslash, Anführungszeichen und Zeilenumbruch in Label-Werten"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    """Zahl ohne unnötige Nachkommastellen; Unendlich und NaN wie im Prometheus-Textformat"""
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+# Prozessweite Standard-Registry
+metrics = MetricsRegistry()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# sources/rate_limiter.py - Token-Bucket-Rate-Limiter für API-Quellen
+
+import os
+import math
+import time
+import sqlite3
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Thread-sicherer Token-Bucket mit Burst-Kapazität und adaptiver Rate
+
+    - Tokens füllen sich mit `rate` pro Sekunde bis `capacity` auf
+    - Jeder Request reserviert ein Token; ist keines frei, wird die Wartezeit
+      bis zum reservierten Token zurückgegeben (Reservierungen dürfen den
+      Bestand ins Negative ziehen, Aufrufer werden so gestaffelt)
+    - Bei HTTP 429 / Retry-After halbiert penalize() die Rate und sperrt den
+      Bucket; reward() erhöht sie nach erfolgreichen Requests schrittweise
+      wieder bis zur konfigurierten Rate (AIMD)
+    - Ohne konfiguriertes Limit (Rate unendlich) setzt penalize() eine endliche
+      Rate aus Retry-After bzw. min_rate; erst nach der Erholung auf das
+      16-fache von min_rate ist der Bucket wieder unbegrenzt
+    """
+
+    # Untergrenze nach 429 für Buckets ohne Limit, wenn weder min_rate noch Retry-After vorliegt
+    UNLIMITED_MIN_RATE = 1.0
+
+    def __init__(self, rate: float, capacity: float = 1.0, name: str = "default",
+                 min_rate: float = None, recovery: float = 0.05):
+        """Initialisiert den Bucket
+
+        Args:
+            rate: Erlaubte Requests pro Sekunde (float('inf') = unbegrenzt)
+            capacity: Maximale Anzahl Requests im Burst
+            name: Name des Buckets (für Logging und geteilten Zustand)
+            min_rate: Untergrenze, auf die penalize() die Rate höchstens senkt
+                      (Standard rate / 16, ohne Limit UNLIMITED_MIN_RATE)
+            recovery: Anteil der konfigurierten Rate, um den reward() erhöht
+        """
+        self.name = name
+        self.configured_rate = rate
+        self.capacity = max(1.0, capacity)
+        if min_rate is None:
+            min_rate = rate / 16 if math.isfinite(rate) else self.UNLIMITED_MIN_RATE
+        self.min_rate = min_rate
+        self.recovery = recovery
+
+        self._lock = threading.Lock()
+        self._state = {
+            'tokens': self.capacity,
+            'updated': time.time(),
+            'rate': rate,
+            'blocked_until': 0.0
+        }
+
+    @property
+    def rate(self) -> float:
+        """Aktuelle (ggf. reduzierte) Rate in Requests pro Sekunde"""
+        return self._update(lambda state, now: state['rate'])
+
+    def _update(self, func: Callable[[Dict[str, float], float], Any]) -> Any:
+        """Führt eine Zustandsänderung atomar aus
+
+        Subklassen mit geteiltem Zustand überschreiben diese Methode.
+        """
+        with self._lock:
+            return func(self._state, time.time())
+
+    def _refill(self, state: Dict[str, float], now: float) -> None:
+        """Füllt Tokens entsprechend der vergangenen Zeit auf"""
+        elapsed = max(0.0, now - state['updated'])
+        if math.isinf(state['rate']):
+            state['tokens'] = self.capacity
+        else:
+            state['tokens'] = min(self.capacity, state['tokens'] + elapsed * state['rate'])
+        state['updated'] = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserviert Tokens für einen Request
+
+        Args:
+            tokens: Anzahl benötigter Tokens
+
+        Returns:
+            Wartezeit in Sekunden, bis die Reservierung eingelöst werden darf
+        """
+        def _reserve(state, now):
+            self._refill(state, now)
+            state['tokens'] -= tokens
+            wait_time = -state['tokens'] / state['rate'] if state['tokens'] < 0 else 0.0
+            return max(wait_time, state['blocked_until'] - now)
+
+        return self._update(_reserve)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Reserviert Tokens und wartet blockierend bis zur Freigabe
+
+        Returns:
+            Gewartete Zeit in Sekunden
+        """
+        wait_time = self.reserve(tokens)
+        if wait_time > 0:
+            logger.debug(f"Rate limiting {self.name}: waiting {wait_time:.2f}s")
+            time.sleep(wait_time)
+        return wait_time
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Wie acquire, blockiert aber nicht die Event-Loop"""
+        wait_time = self.reserve(tokens)
+        if wait_time > 0:
+            logger.debug(f"Rate limiting {self.name}: waiting {wait_time:.2f}s")
+            import asyncio
+            await asyncio.sleep(wait_time)
+        return wait_time
+
+    def penalize(self, retry_after: float = None) -> None:
+        """Reagiert auf HTTP 429: Rate halbieren und ggf. bis Retry-After sperren
+
+        Args:
+            retry_after: Vom Server verlangte Wartezeit in Sekunden
+        """
+        def _penalize(state, now):
+            self._refill(state, now)
+            if math.isinf(state['rate']):
+                # Halbieren bliebe unendlich - ab der vom Server verlangten Rate neu beginnen
+                state['rate'] = max(self.min_rate, 1.0 / retry_after) if retry_after else self.min_rate
+            else:
+                state['rate'] = max(self.min_rate, state['rate'] / 2)
+            state['tokens'] = min(state['tokens'], 0.0)
+            if retry_after:
+                state['blocked_until'] = max(state['blocked_until'], now + retry_after)
+            return state['rate']
+
+        new_rate = self._update(_penalize)
+        logger.warning(f"Rate limit hit for {self.name}: reducing rate to {new_rate:.3f} req/s")
+
+    def reward(self) -> None:
+        """Erhöht die Rate nach einem erfolgreichen Request schrittweise wieder"""
+        # Ohne Limit gilt der Bucket beim 16-fachen der Untergrenze als erholt
+        target = self.configured_rate if math.isfinite(self.configured_rate) else self.min_rate * 16
+
+        def _reward(state, now):
+            if state['rate'] < self.configured_rate:
+                state['rate'] = state['rate'] + target * self.recovery
+                if state['rate'] >= target:
+                    state['rate'] = self.configured_rate
+
+        self._update(_reward)
+
+    def close(self) -> None:
+        """Gibt Ressourcen frei (nur bei geteiltem Zustand nötig)"""
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token-Bucket, dessen Zustand in einer SQLite-Datei liegt
+
+    Mehrere Prozesse (z.B. überlappende Cron-Läufe) mit derselben Datei und
+    demselben Namen teilen sich so ein gemeinsames Kontingent.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, name: str = "default",
+                 min_rate: float = None, recovery: float = 0.05,
+                 state_path: str = "rate_limits.sqlite"):
+        super().__init__(rate, capacity, name, min_rate, recovery)
+        self.state_path = state_path
+
+        directory = os.path.dirname(os.path.abspath(state_path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Verbindung sofort öffnen, damit Fehler beim Erstellen auffallen
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Öffnet die Zustandsdatei und legt den Eintrag des Buckets an"""
+        conn = sqlite3.connect(self.state_path, timeout=30, check_same_thread=False,
+                               isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS buckets (
+                   name TEXT PRIMARY KEY,
+                   tokens REAL NOT NULL,
+                   updated REAL NOT NULL,
+                   rate REAL NOT NULL,
+                   blocked_until REAL NOT NULL
+               )"""
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO buckets (name, tokens, updated, rate, blocked_until) "
+            "VALUES (?, ?, ?, ?, 0)",
+            (self.name, self.capacity, time.time(), self.configured_rate)
+        )
+        return conn
+
+    def _update(self, func: Callable[[Dict[str, float], float], Any]) -> Any:
+        """Liest, verändert und schreibt den Zustand in einer exklusiven Transaktion"""
+        with self._lock:
+            if self._conn is None:
+                # Nach close() wieder geöffnet (Quellen bleiben nach close() nutzbar)
+                self._conn = self._connect()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated, rate, blocked_until FROM buckets WHERE name = ?",
+                    (self.name,)
+                ).fetchone()
+                state = {
+                    'tokens': row[0],
+                    'updated': row[1],
+                    'rate': row[2],
+                    'blocked_until': row[3]
+                }
+                result = func(state, time.time())
+                self._conn.execute(
+                    "UPDATE buckets SET tokens = ?, updated = ?, rate = ?, blocked_until = ? "
+                    "WHERE name = ?",
+                    (state['tokens'], state['updated'], state['rate'], state['blocked_until'], self.name)
+                )
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        """Schließt die Verbindung zur Zustandsdatei"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_rate_limiter(config: Dict[str, Any], name: str) -> TokenBucket:
+    """Erstellt den Rate-Limiter einer Quelle aus deren Konfiguration
+
+    Args:
+        config: Quellen-Konfiguration mit
+                - rate_limit: Sekunden zwischen Requests (Standard 1.0, 0 = unbegrenzt)
+                - rate_burst: Burst-Kapazität in Requests (Standard 1)
+                - rate_limit_max_interval: Größter Abstand zwischen Requests nach
+                  429-Drosselung in Sekunden (Untergrenze der Rate)
+                - rate_limit_state: Optionaler SQLite-Pfad für prozessübergreifendes Teilen
+        name: Name des Buckets (z.B. Name der Quelle)
+
+    Returns:
+        Konfigurierter Token-Bucket
+    """
+    interval = config.get('rate_limit', 1.0)
+    rate = 1.0 / interval if interval and interval > 0 else float('inf')
+    capacity = config.get('rate_burst', 1)
+
+    max_interval = config.get('rate_limit_max_interval')
+    min_rate = 1.0 / max_interval if max_interval else None
+
+    state_path = config.get('rate_limit_state')
+    if state_path:
+        try:
+            return SharedTokenBucket(rate, capacity, name, min_rate, state_path=state_path)
+        except sqlite3.Error as e:
+            logger.error(f"Could not open shared rate limit state {state_path}: {str(e)}")
+
+    return TokenBucket(rate, capacity, name, min_rate)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Wertet einen Retry-After-Header aus (Sekunden oder HTTP-Datum)
+
+    Returns:
+        Wartezeit in Sekunden oder None
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
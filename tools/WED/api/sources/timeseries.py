@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# sources/timeseries.py - Kompakte, array-basierte Zeitreihe für standardisierte Daten
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+class TimeSeries:
+    """Speichersparende Zeitreihe (älteste Beobachtung zuerst)
+
+    Statt einer Liste von {"date": ..., "value": ...}-Dictionaries werden zwei
+    parallele Arrays gehalten:
+    - ordinals: Tagesnummern (date.toordinal()) als array('i')
+    - values: Werte als array('d')
+
+    Die Dictionary-/JSON-Form wird erst an der Serialisierungsgrenze erzeugt
+    (to_records() bzw. json_default()).
+    """
+
+    __slots__ = ('ordinals', 'values')
+
+    def __init__(self, ordinals: array = None, values: array = None):
+        """Initialisiert die Zeitreihe aus bereits sortierten Arrays
+
+        Args:
+            ordinals: Aufsteigend sortierte Tagesnummern
+            values: Zugehörige Werte
+        """
+        self.ordinals = ordinals if ordinals is not None else array('i')
+        self.values = values if values is not None else array('d')
+
+    @classmethod
+    def from_observations(cls, observations: Iterable[Dict], convert: Callable[[Any], Optional[float]]) -> 'TimeSeries':
+        """Erstellt eine Zeitreihe aus API-Beobachtungen in O(n)
+
+        Die Sortierung der API (auf- oder absteigend) wird übernommen statt neu zu
+        sortieren; nur bei unsortierter Eingabe wird als Fallback sortiert.
+        Beobachtungen ohne gültigen Wert (convert gibt None zurück) werden übersprungen.
+
+        Args:
+            observations: Beobachtungen mit 'date' (YYYY-MM-DD) und 'value'
+            convert: Konvertierung des Rohwerts in float oder None
+
+        Returns:
+            Zeitreihe, älteste Beobachtung zuerst
+        """
+        ordinals = array('i')
+        values = array('d')
+        to_ordinal = _date_to_ordinal
+
+        for entry in observations:
+            try:
+                value = convert(entry.get('value'))
+                if value is None:
+                    continue
+                ordinal = to_ordinal(entry.get('date'))
+            except (ValueError, TypeError):
+                continue
+            ordinals.append(ordinal)
+            values.append(value)
+
+        return cls._from_unordered(ordinals, values)
+
+    @classmethod
+    def from_arrays(cls, ordinals: Iterable[int], values: Iterable[float]) -> 'TimeSeries':
+        """Erstellt eine Zeitreihe aus Tagesnummern und Werten beliebiger Reihenfolge"""
+        return cls._from_unordered(array('i', ordinals), array('d', values))
+
+    @classmethod
+    def _from_unordered(cls, ordinals: array, values: array) -> 'TimeSeries':
+        """Bringt Arrays in aufsteigende Reihenfolge (Umdrehen statt Sortieren, wenn möglich)"""
+        direction = _sort_direction(ordinals)
+        if direction < 0:
+            ordinals.reverse()
+            values.reverse()
+        elif direction == 0:
+            order = sorted(range(len(ordinals)), key=ordinals.__getitem__)
+            ordinals = array('i', (ordinals[i] for i in order))
+            values = array('d', (values[i] for i in order))
+        return cls(ordinals, values)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> 'TimeSeries':
+        """Erstellt eine Zeitreihe aus der Dictionary-Form (z.B. aus economic_data.json)"""
+        ordinals = array('i')
+        values = array('d')
+        for record in records:
+            value = record.get('value')
+            if value is None:
+                continue
+            ordinals.append(_date_to_ordinal(record['date']))
+            values.append(value)
+        return cls._from_unordered(ordinals, values)
+
+    @classmethod
+    def concat(cls, parts: Iterable['TimeSeries']) -> 'TimeSeries':
+        """Hängt aufsteigend aufeinanderfolgende Teilreihen aneinander (z.B. Seiten einer Abfrage)"""
+        ordinals = array('i')
+        values = array('d')
+        for part in parts:
+            ordinals.extend(part.ordinals)
+            values.extend(part.values)
+        return cls._from_unordered(ordinals, values)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __iter__(self) -> Iterator[Tuple[str, float]]:
+        """Iteriert über (Datum, Wert)-Paare"""
+        for ordinal, value in zip(self.ordinals, self.values):
+            yield date.fromordinal(ordinal).isoformat(), value
+
+    def __getitem__(self, index):
+        """Index-Zugriff liefert (Datum, Wert), Slices liefern eine neue Zeitreihe"""
+        if isinstance(index, slice):
+            return TimeSeries(self.ordinals[index], self.values[index])
+        return date.fromordinal(self.ordinals[index]).isoformat(), self.values[index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TimeSeries):
+            return NotImplemented
+        return self.ordinals == other.ordinals and self.values == other.values
+
+    def __repr__(self) -> str:
+        if not self.ordinals:
+            return "TimeSeries([])"
+        return f"TimeSeries({len(self)} points, {self.start_date} .. {self.end_date})"
+
+    @property
+    def start_date(self) -> Optional[str]:
+        """Datum der ältesten Beobachtung"""
+        return date.fromordinal(self.ordinals[0]).isoformat() if self.ordinals else None
+
+    @property
+    def end_date(self) -> Optional[str]:
+        """Datum der neuesten Beobachtung"""
+        return date.fromordinal(self.ordinals[-1]).isoformat() if self.ordinals else None
+
+    def latest(self) -> Dict[str, Any]:
+        """Neueste Beobachtung im Dashboard-Format"""
+        if not self.ordinals:
+            return {"value": None, "date": None}
+        return {"date": self.end_date, "value": self.values[-1]}
+
+    def between(self, start_date: str = None, end_date: str = None) -> 'TimeSeries':
+        """Schneidet die Zeitreihe per Binärsuche auf einen Datumsbereich zu
+
+        Args:
+            start_date: Erstes enthaltenes Datum (YYYY-MM-DD), None = offen
+            end_date: Letztes enthaltenes Datum (YYYY-MM-DD), None = offen
+
+        Returns:
+            Neue Zeitreihe mit den Beobachtungen im Bereich
+        """
+        lo = bisect_left(self.ordinals, _date_to_ordinal(start_date)) if start_date else 0
+        hi = bisect_right(self.ordinals, _date_to_ordinal(end_date)) if end_date else len(self.ordinals)
+        return self[lo:hi]
+
+    def merge(self, newer: 'TimeSeries') -> 'TimeSeries':
+        """Ersetzt alle Beobachtungen ab dem Beginn von `newer` durch `newer`
+
+        Dient für inkrementelle Updates: revidierte Werte werden dadurch korrigiert.
+        """
+        if not newer.ordinals:
+            return self[:]
+        cut = bisect_left(self.ordinals, newer.ordinals[0])
+        ordinals = self.ordinals[:cut]
+        values = self.values[:cut]
+        ordinals.extend(newer.ordinals)
+        values.extend(newer.values)
+        return TimeSeries(ordinals, values)
+
+    def update_hash(self, hasher) -> None:
+        """Fügt Länge und Inhalt einem hashlib-Objekt hinzu (inhaltsbasierte Cache-Schlüssel)"""
+        hasher.update(len(self.ordinals).to_bytes(8, 'little'))
+        hasher.update(self.ordinals.tobytes())
+        hasher.update(self.values.tobytes())
+
+    def dates(self) -> List[str]:
+        """Alle Datumswerte als ISO-Strings"""
+        fromordinal = date.fromordinal
+        return [fromordinal(ordinal).isoformat() for ordinal in self.ordinals]
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Dictionary-Form für JSON-Output (älteste zuerst)"""
+        fromordinal = date.fromordinal
+        return [
+            {"date": fromordinal(ordinal).isoformat(), "value": value}
+            for ordinal, value in zip(self.ordinals, self.values)
+        ]
+
+    def to_compact(self) -> Dict[str, List]:
+        """Kompakte JSON-Form (für Caches): Tagesnummern und Werte als zwei Listen"""
+        return {"o": self.ordinals.tolist(), "v": self.values.tolist()}
+
+    @classmethod
+    def from_compact(cls, compact: Dict[str, List]) -> 'TimeSeries':
+        """Gegenstück zu to_compact"""
+        return cls(array('i', compact["o"]), array('d', compact["v"]))
+
+
+def _date_to_ordinal(value: str) -> int:
+    """Wandelt ein ISO-Datum (YYYY-MM-DD) in eine Tagesnummer um"""
+    return date.fromisoformat(value).toordinal()
+
+
+def _sort_direction(ordinals: array) -> int:
+    """Ermittelt in einem Durchlauf die Sortierung
+
+    Returns:
+        1 = aufsteigend, -1 = absteigend, 0 = unsortiert
+    """
+    ascending = descending = True
+    previous = None
+    for ordinal in ordinals:
+        if previous is not None:
+            if ordinal < previous:
+                ascending = False
+            elif ordinal > previous:
+                descending = False
+            if not ascending and not descending:
+                return 0
+        previous = ordinal
+    return 1 if ascending else -1
+
+
+def json_default(obj: Any) -> Any:
+    """default-Hook für json.dump: serialisiert Zeitreihen in die Dashboard-Form"""
+    if isinstance(obj, TimeSeries):
+        return obj.to_records()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
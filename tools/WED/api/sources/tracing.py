@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# sources/tracing.py - Verschachtelte Spans im Chrome-Trace-Format und optionale Profiler-Hooks
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Umgebungsvariablen: WED_TRACE=1 aktiviert Tracing, WED_PROFILE=cprofile|tracemalloc den Profiler
+TRACE_ENV = 'WED_TRACE'
+PROFILE_ENV = 'WED_PROFILE'
+
+class _NullSpan:
+    """Span-Ersatz bei deaktiviertem Tracing - tut nichts"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **args) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Aktiver Span; wird beim Verlassen als Complete-Event ('X') verbucht"""
+
+    __slots__ = ('tracer', 'name', 'args', 'started')
+
+    def __init__(self, tracer: 'Tracer', name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        ended = time.perf_counter()
+        if exc_type is not None:
+            self.args['error'] = f"{exc_type.__name__}: {exc_value}"
+        self.tracer._record(self.name, self.started, ended, self.args)
+        return False
+
+    def set(self, **args) -> None:
+        """Ergänzt Argumente, die erst während des Spans bekannt werden"""
+        self.args.update(args)
+
+
+class Tracer:
+    """Sammelt Spans und schreibt sie als Chrome-Trace-Event-JSON
+
+    Die Datei lässt sich in chrome://tracing oder https://ui.perfetto.dev öffnen;
+    Spans desselben Threads werden dort verschachtelt dargestellt.
+
+    Bei deaktiviertem Tracing liefert span() ein gemeinsames No-op-Objekt, es
+    werden weder Zeitstempel genommen noch Events gespeichert.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def span(self, name: str, **args):
+        """Kontextmanager für einen Abschnitt, z.B. with tracer.span('fetch_data', dataset='gdp')"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def enable(self) -> None:
+        """Aktiviert Tracing und verwirft bisher gesammelte Events"""
+        self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._events = []
+            self._thread_names = {}
+            self._origin = time.perf_counter()
+
+    def _record(self, name: str, started: float, ended: float, args: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": round((started - self._origin) * 1e6, 1),
+            "dur": round((ended - started) * 1e6, 1),
+            "pid": self._pid,
+            "tid": thread.ident,
+            "args": {key: value if isinstance(value, (int, float, bool)) else str(value)
+                     for key, value in args.items()}
+        }
+        with self._lock:
+            self._events.append(event)
+            self._thread_names[thread.ident] = thread.name
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Kopie der gesammelten Events"""
+        with self._lock:
+            return list(self._events)
+
+    def write(self, path: str) -> None:
+        """Schreibt alle Events als Chrome-Trace-JSON
+
+        Args:
+            path: Zieldatei, z.B. economic_data.trace.json
+        """
+        with self._lock:
+            events = list(self._events)
+            names = dict(self._thread_names)
+
+        # Thread-Namen als Metadaten-Events, damit Worker im Viewer lesbar sind
+        for tid, name in names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}})
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        logger.info(f"Trace with {len(events)} events written to {path}")
+
+
+def env_flag(name: str) -> bool:
+    """True, wenn die Umgebungsvariable gesetzt und nicht 0/false/no/off ist"""
+    return os.environ.get(name, '').strip().lower() not in ('', '0', 'false', 'no', 'off')
+
+
+@contextmanager
+def profiling(mode: Optional[str], base_path: str) -> Iterator[None]:
+    """Führt einen Block optional unter cProfile oder tracemalloc aus
+
+    Ergebnisse landen neben dem Output:
+    - cprofile: <base_path>.prof (auswertbar mit pstats oder snakeviz)
+    - tracemalloc: <base_path>.tracemalloc.txt (Top-Allokationen nach Zeile, Peak)
+
+    Args:
+        mode: 'cprofile', 'tracemalloc' oder None (kein Profiling)
+        base_path: Pfad ohne Endung, z.B. 'economic_data'
+    """
+    if not mode:
+        yield
+        return
+
+    if mode == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(f"{base_path}.prof")
+            logger.info(f"cProfile stats written to {base_path}.prof")
+
+    elif mode == 'tracemalloc':
+        import tracemalloc
+        tracemalloc.start(25)
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(f"{base_path}.tracemalloc.txt", 'w', encoding='utf-8') as f:
+                f.write(f"current: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB\n\n")
+                for stat in snapshot.statistics('lineno')[:50]:
+                    f.write(f"{stat}\n")
+            logger.info(f"tracemalloc stats written to {base_path}.tracemalloc.txt")
+
+    else:
+        logger.warning(f"Unknown profiler '{mode}'. Running without profiling.")
+        yield
+
+
+# Prozessweiter Tracer (aktiviert durch WED_TRACE oder die Updater-Konfiguration)
+tracer = Tracer(enabled=env_flag(TRACE_ENV))
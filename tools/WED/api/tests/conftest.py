@@ -0,0 +1,65 @@
+# tests/conftest.py - Gemeinsame Fixtures; Module liegen flach in tools/WED/api
+
+import os
+import json
+import sys
+
+import pytest
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, API_DIR)
+sys.path.insert(0, os.path.join(API_DIR, 'benchmarks'))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Leeres Arbeitsverzeichnis, damit Tests keine Dateien im Repository anlegen"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def fred_stub():
+    """Lokaler FRED-Ersatz (monatliche Serien BENCH00000... ab 1950)"""
+    from fred_stub_server import FREDStubServer
+    with FREDStubServer(series_length=120, release_size=10) as server:
+        yield server
+
+
+@pytest.fixture
+def make_updater(workdir, fred_stub, monkeypatch):
+    """Erstellt WEDDataUpdater gegen den FRED-Ersatz mit eigener api_config.json
+
+    Aufruf: make_updater(fred={...}, updater={...}, **updater_kwargs); "fred"
+    ergänzt die Quellenkonfiguration, weitere Abschnitte ersetzen die Standardwerte.
+    """
+    import api_manager
+    from data_updater import WEDDataUpdater
+    monkeypatch.setattr(api_manager, '_api_manager', None)
+    created = []
+
+    def factory(datasets: int = 3, fred: dict = None, sections: dict = None, **kwargs):
+        fred_config = {
+            "name": "FRED Stub",
+            "base_url": fred_stub.base_url,
+            "rate_limit": 0,
+            "timeout": 10,
+            "retries": 1,
+            "datasets": {f"series_{index}": f"BENCH{index:05d}" for index in range(datasets)}
+        }
+        fred_config.update(fred or {})
+        config = {"api_keys": {"fred": "test"}, "cache": {"backend": "memory"}, "sources": {"fred": fred_config}}
+        config.update(sections or {})
+        with open(workdir / 'api_config.json', 'w') as f:
+            json.dump(config, f)
+
+        updater = WEDDataUpdater('api_config.json', str(workdir / 'economic_data.json'), **kwargs)
+        created.append(updater)
+        return updater
+
+    yield factory
+
+    for updater in created:
+        updater.close()
+    if api_manager._api_manager is not None:
+        api_manager._api_manager.close()
@@ -0,0 +1,69 @@
+# tests/test_artifacts.py - Vorkomprimierte Artefakte und Manifest mit Content-Hashes
+
+import gzip
+import hashlib
+import json
+import os
+
+import output_writer
+from output_writer import ArtifactPublisher
+
+
+def test_publish_writes_gzip_and_manifest_entry(tmp_path):
+    path = tmp_path / 'economic_data.json'
+    payload = json.dumps({"datasets": {"gdp": list(range(200))}}).encode('utf-8')
+    path.write_bytes(payload)
+    publisher = ArtifactPublisher(str(tmp_path / 'artifacts.json'))
+
+    assert publisher.publish([str(path)]) == ['economic_data.json']
+
+    digest = hashlib.sha256(payload).hexdigest()
+    entry = publisher.load_manifest()['economic_data.json']
+    assert entry['sha256'] == digest
+    assert entry['etag'] == f'"{digest[:32]}"'
+    assert entry['hashed_name'] == f"economic_data.{digest[:8]}.json"
+    assert entry['bytes'] == len(payload)
+    assert gzip.decompress((tmp_path / 'economic_data.json.gz').read_bytes()) == payload
+    assert entry['gzip_bytes'] == os.path.getsize(tmp_path / 'economic_data.json.gz')
+    assert ('br_bytes' in entry) == (output_writer.brotli is not None)
+
+
+def test_unchanged_files_are_not_recompressed(tmp_path):
+    path = tmp_path / 'economic_data.json'
+    path.write_bytes(b'{"a": 1}')
+    publisher = ArtifactPublisher(str(tmp_path / 'artifacts.json'))
+    publisher.publish([str(path)])
+    compressed = (tmp_path / 'economic_data.json.gz').read_bytes()
+
+    assert publisher.publish([str(path)]) == []
+
+    # Fehlende Variante oder neuer Inhalt erzwingen erneutes Komprimieren; gzip ist byte-identisch
+    os.unlink(tmp_path / 'economic_data.json.gz')
+    assert publisher.publish([str(path)]) == ['economic_data.json']
+    assert (tmp_path / 'economic_data.json.gz').read_bytes() == compressed
+
+    path.write_bytes(b'{"a": 2}')
+    assert publisher.publish([str(path)]) == ['economic_data.json']
+
+
+def test_manifest_names_are_relative_to_manifest_dir(tmp_path):
+    shard = tmp_path / 'shards' / 'gdp.json'
+    shard.parent.mkdir()
+    shard.write_bytes(b'{}')
+    publisher = ArtifactPublisher(str(tmp_path / 'artifacts.json'))
+
+    assert publisher.publish([str(shard)]) == ['shards/gdp.json']
+    assert publisher.load_manifest()['shards/gdp.json']['hashed_name'].startswith('gdp.')
+
+
+def test_updater_publishes_written_outputs(make_updater, workdir):
+    updater = make_updater(datasets=2, sections={"output": {"precompress": True, "sharded": True,
+                                                            "shard_dir": str(workdir / 'shards')}})
+    updater.update_all_data()
+
+    with open(workdir / 'artifacts.json') as f:
+        manifest = json.load(f)
+    assert {'economic_data.json', 'shards/series_0.json', 'shards/manifest.json'} <= set(manifest)
+    with open(workdir / 'economic_data.json', 'rb') as f:
+        assert manifest['economic_data.json']['sha256'] == hashlib.sha256(f.read()).hexdigest()
+    assert (workdir / 'shards' / 'series_1.json.gz').exists()
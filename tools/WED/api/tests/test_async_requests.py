@@ -0,0 +1,276 @@
+# tests/test_async_requests.py - Async-Pfad (aiohttp bzw. Thread-Pool), gemeinsame Retry-Logik
+
+import asyncio
+import json
+import threading
+
+import pytest
+import requests
+
+import sources.base_source as base_source
+from api_manager import APIManager
+from sources.base_source import RateLimitExceeded
+from sources.fred_source import create_fred_source
+
+
+@pytest.fixture(params=['aiohttp', 'threads'])
+def http_client(request, monkeypatch):
+    """Async-Pfad mit aiohttp (falls installiert) und mit dem Thread-Pool-Fallback"""
+    if request.param == 'aiohttp':
+        if base_source.aiohttp is None:
+            pytest.skip("aiohttp not installed")
+    else:
+        monkeypatch.setattr(base_source, 'aiohttp', None)
+    return request.param
+
+
+def make_config(fred_stub, datasets=3):
+    return {
+        "base_url": fred_stub.base_url, "rate_limit": 0, "timeout": 10, "retries": 1,
+        "datasets": {f"series_{index}": f"BENCH{index:05d}" for index in range(datasets)}
+    }
+
+
+def make_manager(workdir, fred_stub, datasets=3):
+    with open(workdir / 'api_config.json', 'w') as f:
+        json.dump({"cache": {"backend": "memory"}}, f)
+    manager = APIManager(str(workdir / 'api_config.json'))
+    manager.register_source('fred', create_fred_source(make_config(fred_stub, datasets), 'test'))
+    return manager
+
+
+def test_async_fetch_matches_sync_fetch(fred_stub, http_client):
+    source = create_fred_source(make_config(fred_stub), 'test')
+
+    async def run():
+        try:
+            return await asyncio.gather(*(source.fetch_dataset_async(f"series_{index}") for index in range(3)))
+        finally:
+            await source.close_async()
+
+    async_results = asyncio.run(run())
+    with source:
+        sync_results = [source.fetch_dataset(f"series_{index}") for index in range(3)]
+
+    for async_result, sync_result in zip(async_results, sync_results):
+        assert async_result['data']['historical'] == sync_result['data']['historical']
+        assert async_result['meta']['coverage'] == sync_result['meta']['coverage']
+
+
+def test_source_survives_several_event_loops(fred_stub, http_client):
+    source = create_fred_source(make_config(fred_stub), 'test')
+
+    async def fetch():
+        try:
+            return await source.fetch_dataset_async('series_0')
+        finally:
+            await source.close_async()
+
+    first = asyncio.run(fetch())
+    second = asyncio.run(fetch())
+
+    assert first['data']['historical'] == second['data']['historical']
+
+
+def test_fetch_many_async_uses_cache_off_the_event_loop(workdir, fred_stub, http_client, monkeypatch):
+    manager = make_manager(workdir, fred_stub)
+    lookup_threads = []
+    lookup = manager._lookup_cache
+
+    def recording_lookup(*args, **kwargs):
+        lookup_threads.append(threading.get_ident())
+        return lookup(*args, **kwargs)
+
+    monkeypatch.setattr(manager, '_lookup_cache', recording_lookup)
+    jobs = [('fred', f"series_{index}", None) for index in range(3)]
+
+    async def run():
+        loop_thread = threading.get_ident()
+        first = await manager.fetch_many_async(jobs)
+        requests_after_first = fred_stub.stats['requests']
+        second = await manager.fetch_many_async(jobs)
+        await manager.close_async()
+        return loop_thread, first, second, requests_after_first
+
+    loop_thread, first, second, requests_after_first = asyncio.run(run())
+
+    assert all('error' not in result for result in first)
+    assert second == first
+    assert fred_stub.stats['requests'] == requests_after_first == 3
+    assert lookup_threads and loop_thread not in lookup_threads
+
+
+def test_async_http_errors_use_shared_retry_logic(fred_stub, http_client, monkeypatch):
+    monkeypatch.setattr(base_source.BaseAPISource, '_retry_wait_time', staticmethod(lambda error, attempt: 0))
+    fred_stub.error_rate = 1.0
+    source = create_fred_source(dict(make_config(fred_stub), retries=2), 'test')
+
+    async def fetch():
+        try:
+            return await source.fetch_dataset_async('series_0')
+        finally:
+            await source.close_async()
+
+    with pytest.raises(Exception, match='Failed after 2 attempts: 500'):
+        asyncio.run(fetch())
+    assert fred_stub.stats['requests'] == 2
+
+
+def test_async_throttling_raises_rate_limit_exceeded(fred_stub, http_client):
+    fred_stub.throttle_rate = 1.0
+    fred_stub.retry_after = 0.25
+    source = create_fred_source(make_config(fred_stub), 'test')
+
+    async def send():
+        try:
+            return await source._send_request_async(f"{fred_stub.base_url}/series", {'series_id': 'BENCH00000'})
+        finally:
+            await source.close_async()
+
+    with pytest.raises(RateLimitExceeded) as error:
+        asyncio.run(send())
+    assert error.value.retry_after == 0.25
+
+
+def test_retry_delay_backs_off_and_gives_up(fred_stub):
+    source = create_fred_source(dict(make_config(fred_stub), retries=3), 'test')
+    timeout = requests.exceptions.Timeout('slow')
+
+    assert source._retry_delay(timeout, 0) == 1
+    assert source._retry_delay(RateLimitExceeded(5.0), 1) == 5.0
+    with pytest.raises(Exception, match='Failed after 3 attempts: slow'):
+        source._retry_delay(timeout, 2)
+
+
+class FakeClientError(Exception):
+    pass
+
+
+class FakeResponse:
+    def __init__(self, status, body=b'{}', headers=None, reason='OK'):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.reason = reason
+        self.url = 'http://fred.invalid/series'
+
+    async def read(self):
+        return self.body
+
+
+class FakeRequest:
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    async def __aenter__(self):
+        if isinstance(self.outcome, BaseException):
+            raise self.outcome
+        return self.outcome
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeClientSession:
+    """Ersatz für aiohttp.ClientSession: liefert vorgegebene Antworten bzw. Ausnahmen der Reihe nach"""
+
+    instances = []
+
+    def __init__(self, connector=None, timeout=None, headers=None):
+        self.connector, self.timeout, self.headers = connector, timeout, headers
+        self.closed = False
+        self.requests = []
+        self.outcomes = []
+        FakeClientSession.instances.append(self)
+
+    def get(self, url, params=None):
+        self.requests.append((url, params))
+        return FakeRequest(self.outcomes.pop(0))
+
+    async def close(self):
+        self.closed = True
+
+    def detach(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_aiohttp(monkeypatch):
+    """Nativer aiohttp-Pfad ohne installiertes aiohttp"""
+    FakeClientSession.instances = []
+    module = type('aiohttp', (), {
+        'ClientSession': FakeClientSession,
+        'ClientError': FakeClientError,
+        'TCPConnector': staticmethod(lambda limit_per_host: {'limit_per_host': limit_per_host}),
+        'ClientTimeout': staticmethod(lambda total: {'total': total})
+    })
+    monkeypatch.setattr(base_source, 'aiohttp', module)
+    return FakeClientSession
+
+
+def send_with_outcomes(outcomes, params=None, retries=1):
+    """Führt einen Async-Request mit vorgegebenen Antworten aus; liefert (Ergebnis oder Ausnahme, Session)"""
+    source = create_fred_source({"base_url": "http://fred.invalid", "rate_limit": 0, "timeout": 7,
+                                 "retries": retries, "pool_size": 3, "datasets": {}}, 'test')
+
+    async def send():
+        session = source._get_async_session()
+        session.outcomes.extend(outcomes)
+        try:
+            return await source._make_request_async("http://fred.invalid/series", params or {}), session
+        except Exception as e:
+            return e, session
+        finally:
+            await source.close_async()
+
+    return asyncio.run(send())
+
+
+def test_native_path_sends_string_params_and_parses_json(fake_aiohttp):
+    result, session = send_with_outcomes([FakeResponse(200, b'{"seriess": [1]}')],
+                                         {'series_id': 'GDP', 'limit': 5, 'units': None})
+
+    assert result == {"seriess": [1]}
+    assert session.requests == [("http://fred.invalid/series", {'series_id': 'GDP', 'limit': '5'})]
+    assert session.connector == {'limit_per_host': 3}
+    assert session.timeout == {'total': 7}
+    assert session.closed
+
+
+def test_native_path_maps_429_to_rate_limit_exceeded(fake_aiohttp):
+    error, _ = send_with_outcomes([FakeResponse(429, headers={'Retry-After': '2'}, reason='Too Many Requests')])
+
+    assert isinstance(error, Exception) and 'Failed after 1 attempts' in str(error)
+    assert isinstance(error.__context__, RateLimitExceeded)
+    assert error.__context__.retry_after == 2.0
+
+
+def test_native_path_maps_http_and_client_errors_to_requests_exceptions(fake_aiohttp, monkeypatch):
+    monkeypatch.setattr(base_source.BaseAPISource, '_retry_wait_time', staticmethod(lambda error, attempt: 0))
+    outcomes = [FakeResponse(500, reason='Internal Server Error'), FakeClientError('connection reset'),
+                asyncio.TimeoutError(), FakeResponse(200, b'{"ok": true}')]
+    result, session = send_with_outcomes(outcomes, retries=4)
+
+    assert result == {"ok": True}
+    assert len(session.requests) == 4
+
+    for outcome, expected in [(FakeResponse(503, reason='Service Unavailable'), requests.exceptions.HTTPError),
+                              (FakeClientError('refused'), requests.exceptions.ConnectionError),
+                              (asyncio.TimeoutError(), requests.exceptions.Timeout)]:
+        error, _ = send_with_outcomes([outcome])
+        assert isinstance(error.__context__, expected)
+
+
+def test_native_session_is_recreated_per_event_loop(fake_aiohttp):
+    source = create_fred_source({"base_url": "http://fred.invalid", "rate_limit": 0, "datasets": {}}, 'test')
+
+    async def session():
+        return source._get_async_session()
+
+    first = asyncio.run(session())
+    second = asyncio.run(session())
+
+    assert first is not second
+    assert first.closed  # Loop beendet -> alte Session verworfen
+    source.close()
+    assert second.closed
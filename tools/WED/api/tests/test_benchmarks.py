@@ -0,0 +1,81 @@
+# tests/test_benchmarks.py - FRED-Ersatz und Benchmark-Fälle (ohne Kindprozess)
+
+import json
+import logging
+import urllib.error
+import urllib.request
+
+import pytest
+
+import api_manager
+from benchmarks import run_benchmarks
+
+
+def get(fred_stub, path):
+    with urllib.request.urlopen(fred_stub.base_url + path) as response:
+        return json.load(response)
+
+
+def test_observations_support_range_sort_and_paging(fred_stub):
+    full = get(fred_stub, '/series/observations?series_id=BENCH00001')
+    assert full['count'] == 120
+    assert full['observations'][0]['date'] == '1950-01-01'
+    assert full['observations'][-1]['date'] == '1959-12-01'
+    # Deterministisch: gleiche Serie, gleiche Werte
+    assert get(fred_stub, '/series/observations?series_id=BENCH00001') == full
+
+    window = get(fred_stub, '/series/observations?series_id=BENCH00001'
+                            '&observation_start=1955-01-01&observation_end=1955-12-01')
+    assert [entry['date'] for entry in window['observations']] == [f'1955-{month:02d}-01' for month in range(1, 13)]
+
+    page = get(fred_stub, '/series/observations?series_id=BENCH00001&sort_order=desc&limit=5&offset=5')
+    assert page['count'] == 120
+    assert [entry['date'] for entry in page['observations']] == \
+        [entry['date'] for entry in full['observations'][::-1][5:10]]
+
+
+def test_bulk_listings_cover_release_members(fred_stub):
+    listing = get(fred_stub, '/release/series?release_id=1&limit=4&offset=8')
+    assert listing['count'] == 10
+    assert [info['id'] for info in listing['seriess']] == ['BENCH00018', 'BENCH00019']
+    assert listing['seriess'][0]['last_updated'] == '2024-01-01 08:00:00-05'
+
+
+def test_error_and_throttle_rates_are_counted(fred_stub):
+    fred_stub.throttle_rate = 1.0
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        get(fred_stub, '/series?series_id=BENCH00001')
+    assert excinfo.value.code == 429
+    assert excinfo.value.headers['Retry-After'] == '1'
+
+    fred_stub.throttle_rate = 0.0
+    fred_stub.error_rate = 1.0
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        get(fred_stub, '/series?series_id=BENCH00001')
+    assert excinfo.value.code == 500
+    assert fred_stub.stats['throttled'] == 1
+    assert fred_stub.stats['errors'] == 1
+    assert fred_stub.stats['requests'] == 2
+
+
+@pytest.mark.parametrize('scenario', ['source', 'manager', 'updater'])
+def test_run_case_reports_measurements(fred_stub, workdir, monkeypatch, scenario):
+    monkeypatch.setattr(api_manager, '_api_manager', None)
+    args = run_benchmarks.parse_args(['--sizes', '3', '--workers', '2', '--series-length', '120', '--retries', '1'])
+    config = run_benchmarks.build_config(fred_stub.base_url, 3, args)
+    try:
+        result = run_benchmarks.run_case(scenario, config, str(workdir), vars(args))
+    finally:
+        logging.disable(logging.NOTSET)
+        if api_manager._api_manager is not None:
+            api_manager._api_manager.close()
+
+    assert result['scenario'] == scenario
+    assert result['series'] == 3
+    assert result['failed'] == 0
+    assert result['elapsed_s'] > 0
+    assert fred_stub.stats['requests'] >= 3
+    if scenario == 'updater':
+        assert result['output_bytes'] > 0
+    else:
+        assert result['p95_ms'] >= result['p50_ms']
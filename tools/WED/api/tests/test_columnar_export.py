@@ -0,0 +1,120 @@
+# tests/test_columnar_export.py - Spaltenbasierter Export und mmap-Leser
+
+import json
+import struct
+
+import pytest
+
+import columnar_export
+from columnar_export import RAW_MAGIC, ColumnarReader, write_columnar
+from sources.timeseries import TimeSeries
+
+np = pytest.importorskip('numpy')
+
+FORMATS = ['raw', pytest.param('arrow', marks=pytest.mark.skipif(columnar_export.pa is None,
+                                                                 reason="pyarrow not installed"))]
+
+
+def output_data():
+    return {
+        "meta": {"last_updated": "2024-01-01T00:00:00"},
+        "datasets": {
+            "gdp": {"title": "GDP", "unit": "Bn", "data": {"historical": TimeSeries.from_records([
+                {"date": "2023-01-01", "value": 1.5},
+                {"date": "2023-04-01", "value": 2.25},
+                {"date": "2023-07-01", "value": -3.0}
+            ])}},
+            "cpi": {"title": "CPI", "unit": "%", "data": {"historical": [
+                {"date": "1969-12-31", "value": 4.0},
+                {"date": "2024-02-29", "value": 5.5}
+            ]}},
+            "empty": {"title": "Empty", "unit": None, "data": {"historical": []}},
+            "failed": None
+        }
+    }
+
+
+@pytest.mark.parametrize('columnar_format', FORMATS)
+def test_roundtrip(tmp_path, columnar_format):
+    path = str(tmp_path / 'economic_data.col')
+    write_columnar(path, output_data(), columnar_format)
+
+    with ColumnarReader(path) as reader:
+        assert sorted(reader.datasets()) == ['cpi', 'empty', 'gdp']
+        assert reader.meta == {"last_updated": "2024-01-01T00:00:00"}
+        assert reader.info('gdp') == {"title": "GDP", "unit": "Bn", "length": 3}
+        assert reader.info('failed') is None
+        assert reader.get('missing') is None
+
+        days, values = reader.get('gdp')
+        assert [str(day) for day in days.astype('datetime64[D]')] == ['2023-01-01', '2023-04-01', '2023-07-01']
+        assert values.tolist() == [1.5, 2.25, -3.0]
+
+        cpi = reader.to_timeseries('cpi')
+        assert cpi.to_records() == [{"date": "1969-12-31", "value": 4.0}, {"date": "2024-02-29", "value": 5.5}]
+        assert len(reader.get('empty')[0]) == 0
+
+
+def test_auto_format_matches_installed_pyarrow(tmp_path):
+    path = str(tmp_path / 'economic_data.col')
+    payload = write_columnar(path, output_data(), 'auto')
+    expected = columnar_export.ARROW_MAGIC if columnar_export.pa is not None else RAW_MAGIC
+    assert payload.startswith(expected)
+
+
+def record_close(monkeypatch):
+    """Merkt sich die beim Schließen freigegebenen Datei-Handles"""
+    closed = []
+    original_close = ColumnarReader.close
+
+    def close(self):
+        closed.append(self._file)
+        original_close(self)
+
+    monkeypatch.setattr(ColumnarReader, 'close', close)
+    return closed
+
+
+def test_unknown_format_raises_and_closes_file(tmp_path, monkeypatch):
+    path = tmp_path / 'garbage.col'
+    path.write_bytes(b"not a columnar export")
+    closed = record_close(monkeypatch)
+
+    with pytest.raises(ValueError, match="Unknown columnar format"):
+        ColumnarReader(str(path))
+
+    handle, = closed
+    assert handle.closed
+
+
+def test_failed_open_releases_file_and_mapping(tmp_path, monkeypatch):
+    header = json.dumps({"version": 99, "meta": {}, "datasets": {}}).encode('utf-8')
+    path = tmp_path / 'future.col'
+    path.write_bytes(RAW_MAGIC + struct.pack('<I', len(header)) + header)
+
+    opened = []
+    original_open_raw = ColumnarReader._open_raw
+
+    def open_raw(self):
+        opened.append(self)
+        original_open_raw(self)
+
+    monkeypatch.setattr(ColumnarReader, '_open_raw', open_raw)
+    with pytest.raises(ValueError, match="version"):
+        ColumnarReader(str(path))
+
+    reader, = opened
+    assert reader._file is None
+    assert reader._mmap is None
+
+
+def test_empty_file_raises_without_leaking(tmp_path, monkeypatch):
+    path = tmp_path / 'empty.col'
+    path.write_bytes(b"")
+    closed = record_close(monkeypatch)
+
+    with pytest.raises(ValueError):
+        ColumnarReader(str(path))
+
+    handle, = closed
+    assert handle.closed
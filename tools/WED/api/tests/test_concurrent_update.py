@@ -0,0 +1,59 @@
+# tests/test_concurrent_update.py - Paralleler Abruf in WEDDataUpdater.update_all_data
+
+import threading
+
+import api_manager
+import data_updater
+
+
+def strip_volatile(output):
+    """Datensätze ohne Abrufzeitpunkt (unterscheidet sich zwischen Läufen)"""
+    return {
+        dataset_id: {key: value for key, value in dataset.items() if key != 'last_updated'}
+        for dataset_id, dataset in output['datasets'].items()
+    }
+
+
+def test_parallel_run_matches_sequential_run_in_config_order(make_updater):
+    sequential = make_updater(datasets=6, max_workers=1).update_all_data()
+    parallel = make_updater(datasets=6, max_workers=4).update_all_data(max_workers=4)
+
+    assert list(parallel['datasets']) == [f"series_{index}" for index in range(6)]
+    assert strip_volatile(parallel) == strip_volatile(sequential)
+    assert parallel['meta']['update_summary']['fred']['successful'] == 6
+
+
+def test_workers_fetch_concurrently(make_updater, monkeypatch):
+    updater = make_updater(datasets=4, max_workers=4)
+    barrier = threading.Barrier(4, timeout=10)
+    threads = set()
+    original = data_updater.WEDDataUpdater._fetch_dataset
+
+    def fetch(self, source_name, dataset_id, refresh=False):
+        # Alle vier Abrufe müssen gleichzeitig laufen, sonst läuft die Barriere in den Timeout
+        threads.add(threading.current_thread().name)
+        barrier.wait()
+        return original(self, source_name, dataset_id, refresh)
+
+    monkeypatch.setattr(data_updater.WEDDataUpdater, '_fetch_dataset', fetch)
+    output = updater.update_all_data()
+
+    assert output['meta']['update_summary']['fred']['successful'] == 4
+    assert len(threads) == 4
+    assert all(name.startswith('wed-fetch') for name in threads)
+
+
+def test_failed_fetches_keep_previous_data_and_are_reported(make_updater, fred_stub, monkeypatch):
+    first = make_updater(datasets=3, max_workers=3).update_all_data()
+
+    # Neuer API-Manager ohne Cache-Einträge, damit der zweite Lauf wirklich abruft
+    api_manager._api_manager.close()
+    monkeypatch.setattr(api_manager, '_api_manager', None)
+    fred_stub.error_rate = 1.0
+    second = make_updater(datasets=3, max_workers=3).update_all_data()
+
+    summary = second['meta']['update_summary']['fred']
+    assert summary['successful'] == 0
+    assert summary['failed'] == 3
+    assert sorted(error.split(':')[0] for error in summary['errors']) == ['series_0', 'series_1', 'series_2']
+    assert second['datasets']['series_1']['data']['latest'] == first['datasets']['series_1']['data']['latest']
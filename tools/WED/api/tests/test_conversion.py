@@ -0,0 +1,88 @@
+# tests/test_conversion.py - Umrechnungsregeln und Batch-Konvertierung
+
+import logging
+
+import pytest
+
+from sources import conversion
+from sources.conversion import IDENTITY_RULE, ConversionRule, compile_conversion_rules
+
+OBSERVATIONS = [
+    {"date": "2024-03-01", "value": "3.5"},
+    {"date": "2024-02-01", "value": "."},
+    {"date": "2024-01-01", "value": "1000"}
+]
+
+
+@pytest.fixture(params=['vectorized', 'scalar'])
+def path(request, monkeypatch):
+    """Führt jeden Test mit und ohne NumPy aus"""
+    if request.param == 'vectorized':
+        pytest.importorskip('numpy')
+        conversion._load_numpy()
+    else:
+        monkeypatch.setattr(conversion, 'np', None)
+        monkeypatch.setattr(conversion, '_numpy_checked', True)
+    return request.param
+
+
+def test_identity_keeps_values_and_orders_oldest_first(path):
+    series = IDENTITY_RULE.convert_observations(OBSERVATIONS)
+    assert list(series) == [("2024-01-01", 1000.0), ("2024-03-01", 3.5)]
+
+
+def test_scale_offset_and_custom_missing_tokens(path):
+    rule = ConversionRule.compile({"scale": 0.001, "offset": 1.0, "missing": ["n/a"]})
+    series = rule.convert_observations([
+        {"date": "2024-01-01", "value": "1000"},
+        {"date": "2024-02-01", "value": "n/a"},
+        {"date": "2024-03-01", "value": None}
+    ])
+    assert list(series) == [("2024-01-01", pytest.approx(2.0))]
+    assert rule.convert_value("n/a") is None
+    assert rule.convert_value("5") == pytest.approx(1.005)
+
+
+def test_missing_or_out_of_range_dates_are_dropped(path):
+    series = IDENTITY_RULE.convert_observations([
+        {"date": "2024-01-01", "value": "1"},
+        {"date": None, "value": "2"},
+        {"date": "", "value": "3"},
+        {"value": "4"},
+        {"date": "20240-01-01", "value": "5"},
+        {"date": "2024-02-01", "value": "6"}
+    ])
+    assert list(series) == [("2024-01-01", 1.0), ("2024-02-01", 6.0)]
+
+
+def test_invalid_values_fall_back_to_scalar_and_are_logged(path, caplog):
+    with caplog.at_level(logging.WARNING, logger='sources.conversion'):
+        series = IDENTITY_RULE.convert_observations([
+            {"date": "2024-01-01", "value": "1"},
+            {"date": "2024-02-01", "value": "garbage"},
+            {"date": "2024-03-01", "value": "3"}
+        ], 'cpi')
+    assert list(series) == [("2024-01-01", 1.0), ("2024-03-01", 3.0)]
+    assert "Could not convert 1 values for dataset cpi" in caplog.text
+
+
+def test_unordered_input_is_sorted(path):
+    series = IDENTITY_RULE.convert_observations([
+        {"date": "2024-02-01", "value": "2"},
+        {"date": "2024-03-01", "value": "3"},
+        {"date": "2024-01-01", "value": "1"}
+    ])
+    assert series.dates() == ["2024-01-01", "2024-02-01", "2024-03-01"]
+
+
+def test_empty_input(path):
+    assert len(IDENTITY_RULE.convert_observations([])) == 0
+
+
+def test_later_specs_override_earlier_ones():
+    rules = compile_conversion_rules({"gdp": {"scale": 0.001}, "cpi": {"offset": 1}},
+                                     {"gdp": {"scale": 2}}, None)
+    assert rules["gdp"].scale == 2.0
+    assert rules["cpi"].offset == 1.0
+    assert not rules["gdp"].is_identity
+    assert IDENTITY_RULE.is_identity
@@ -0,0 +1,182 @@
+# tests/test_derived.py - Abgeleitete Reihen (Ausdrücke, Kalenderveränderungen, Engine)
+
+from datetime import date, timedelta
+
+import pytest
+
+from derived import DerivedEngine, DerivedExpressionError, evaluate, parse_expression
+from sources.timeseries import TimeSeries
+
+
+def daily(start, end, value=lambda day: float(day.toordinal())):
+    """Tagesreihe mit Wert = Funktion des Datums"""
+    records, day = [], start
+    while day <= end:
+        records.append({"date": day.isoformat(), "value": value(day)})
+        day += timedelta(days=1)
+    return TimeSeries.from_records(records)
+
+
+def as_dict(series):
+    return dict(series)
+
+
+def expected_change(current, previous):
+    return (current.toordinal() / previous.toordinal() - 1.0) * 100.0
+
+
+def test_mom_at_month_end_targets_end_of_previous_month():
+    series = daily(date(2024, 1, 1), date(2024, 3, 31))
+    result = as_dict(evaluate('mom(x)', {'x': series}))
+
+    assert result['2024-03-31'] == pytest.approx(expected_change(date(2024, 3, 31), date(2024, 2, 29)))
+    assert result['2024-03-30'] == pytest.approx(expected_change(date(2024, 3, 30), date(2024, 2, 29)))
+    assert result['2024-03-29'] == pytest.approx(expected_change(date(2024, 3, 29), date(2024, 2, 29)))
+    assert result['2024-03-28'] == pytest.approx(expected_change(date(2024, 3, 28), date(2024, 2, 28)))
+
+
+def test_mom_at_month_end_in_non_leap_year():
+    series = daily(date(2023, 2, 1), date(2023, 3, 31))
+    result = as_dict(evaluate('mom(x)', {'x': series}))
+
+    assert result['2023-03-31'] == pytest.approx(expected_change(date(2023, 3, 31), date(2023, 2, 28)))
+
+
+def test_yoy_on_leap_day_and_around_it():
+    series = daily(date(2023, 1, 1), date(2025, 3, 1))
+    result = as_dict(evaluate('yoy(x)', {'x': series}))
+
+    assert result['2024-02-29'] == pytest.approx(expected_change(date(2024, 2, 29), date(2023, 2, 28)))
+    assert result['2025-02-28'] == pytest.approx(expected_change(date(2025, 2, 28), date(2024, 2, 28)))
+    assert result['2024-03-01'] == pytest.approx(expected_change(date(2024, 3, 1), date(2023, 3, 1)))
+
+
+def test_yoy_monthly_drops_points_without_prior_year():
+    records = [{"date": f"{year}-{month:02d}-01", "value": 100.0 + (year - 2020) * 10}
+               for year in (2020, 2021) for month in range(1, 13)]
+    result = evaluate('yoy(cpi)', {'cpi': TimeSeries.from_records(records)})
+
+    assert result.start_date == '2021-01-01'
+    assert len(result) == 12
+    assert all(value == pytest.approx(10.0) for _, value in result)
+
+
+def test_yoy_uses_last_observation_within_tolerance():
+    # Werktagsreihe: Vorjahresdatum fällt auf ein Wochenende
+    series = TimeSeries.from_records([{"date": "2023-06-16", "value": 100.0},
+                                      {"date": "2024-06-17", "value": 110.0}])
+    assert as_dict(evaluate('yoy(x)', {'x': series})) == {'2024-06-17': pytest.approx(10.0)}
+
+    gap = TimeSeries.from_records([{"date": "2023-05-01", "value": 100.0},
+                                   {"date": "2024-06-17", "value": 110.0}])
+    assert len(evaluate('yoy(x)', {'x': gap})) == 0
+
+
+def test_binary_operations_join_on_common_dates():
+    fed = TimeSeries.from_records([{"date": "2024-01-01", "value": 5.0}, {"date": "2024-02-01", "value": 5.25},
+                                   {"date": "2024-03-01", "value": 5.5}])
+    ecb = TimeSeries.from_records([{"date": "2024-02-01", "value": 4.0}, {"date": "2024-03-01", "value": 4.5}])
+
+    assert as_dict(evaluate('fed - ecb', {'fed': fed, 'ecb': ecb})) == {'2024-02-01': 1.25, '2024-03-01': 1.0}
+    assert as_dict(evaluate('-ecb * 2', {'ecb': ecb})) == {'2024-02-01': -8.0, '2024-03-01': -9.0}
+
+
+def test_rolling_and_differences():
+    series = TimeSeries.from_records([{"date": f"2024-{month:02d}-01", "value": float(month)}
+                                      for month in range(1, 7)])
+
+    assert list(evaluate('rolling_mean(x, 3)', {'x': series})) == [
+        ('2024-03-01', 2.0), ('2024-04-01', 3.0), ('2024-05-01', 4.0), ('2024-06-01', 5.0)]
+    assert list(evaluate('rolling_sum(x, 6)', {'x': series})) == [('2024-06-01', 21.0)]
+    assert list(evaluate('diff(x, 2)', {'x': series}))[0] == ('2024-03-01', 2.0)
+    assert list(evaluate('pct_change(x)', {'x': series}))[0] == ('2024-02-01', 100.0)
+
+
+def test_division_by_zero_is_dropped():
+    series = TimeSeries.from_records([{"date": "2024-01-01", "value": 0.0}, {"date": "2024-02-01", "value": 2.0}])
+    assert as_dict(evaluate('1 / x', {'x': series})) == {'2024-02-01': 0.5}
+
+
+@pytest.mark.parametrize('expr', [
+    '__import__("os")',
+    'x.real',
+    'x ** 2',
+    'yoy(x, 2)',
+    'rolling_mean(x, 0)',
+    'rolling_mean(x, window=3)',
+    'x[0]',
+    '"text"',
+    'x +',
+])
+def test_parse_rejects_unsupported_expressions(expr):
+    with pytest.raises(DerivedExpressionError):
+        parse_expression(expr)
+
+
+def test_parse_returns_referenced_names():
+    _, names = parse_expression('rolling_mean(a - b, 3) / 2')
+    assert names == {'a', 'b'}
+
+
+def test_expression_without_series_is_rejected():
+    with pytest.raises(DerivedExpressionError):
+        evaluate('1 + 2', {})
+
+
+def make_engine():
+    return DerivedEngine({"series": {
+        "spread": "fed - ecb",
+        "spread_avg": {"expr": "rolling_mean(spread, 2)", "unit": "pp"},
+        "broken": "fed +",
+        "loop_a": "loop_b + 1",
+        "loop_b": "loop_a + 1",
+    }})
+
+
+def rates():
+    fed = TimeSeries.from_records([{"date": f"2024-{month:02d}-01", "value": 5.0 + month} for month in range(1, 5)])
+    ecb = TimeSeries.from_records([{"date": f"2024-{month:02d}-01", "value": 4.0} for month in range(1, 5)])
+    return {'fed': fed, 'ecb': ecb}
+
+
+def test_engine_skips_invalid_and_cyclic_definitions():
+    engine = make_engine()
+
+    assert 'broken' not in engine.definitions
+    assert engine.order == ['spread', 'spread_avg']
+    assert engine.source_inputs() == {'fed', 'ecb'}
+    assert engine.dependents(['ecb']) == ['spread', 'spread_avg']
+    assert engine.dependents(['unrelated']) == []
+
+
+def test_engine_computes_in_dependency_order_and_reuses_results():
+    engine = make_engine()
+
+    first = engine.compute(rates())
+    assert first['spread']['status'] == 'computed'
+    assert list(first['spread_avg']['series']) == [('2024-02-01', 2.5), ('2024-03-01', 3.5), ('2024-04-01', 4.5)]
+
+    second = engine.compute(rates())
+    assert {result['status'] for result in second.values()} == {'cached'}
+    assert second['spread_avg']['hash'] == first['spread_avg']['hash']
+
+    changed = rates()
+    changed['ecb'] = TimeSeries.from_records([{"date": f"2024-{month:02d}-01", "value": 3.0} for month in range(1, 5)])
+    third = engine.compute(changed)
+    assert third['spread']['status'] == 'computed'
+    assert third['spread']['hash'] != first['spread']['hash']
+
+
+def test_engine_reuses_stored_results_across_processes():
+    first = make_engine().compute(rates())
+    stored = {derived_id: (result['hash'], result['series']) for derived_id, result in first.items()}
+
+    results = make_engine().compute(rates(), stored=stored.get)
+    assert results['spread']['status'] == 'cached'
+    assert results['spread']['series'] == first['spread']['series']
+
+
+def test_engine_reports_missing_inputs():
+    results = make_engine().compute({'fed': rates()['fed']}, derived_ids=['spread'])
+    assert results['spread']['status'] == 'error'
+    assert 'ecb' in results['spread']['error']
@@ -0,0 +1,109 @@
+# tests/test_downsampling.py - Reduzierte Chart-Ansichten (LTTB, Min/Max)
+
+import json
+import logging
+import math
+from datetime import date, timedelta
+
+from downsampling import build_views, lttb, minmax, validate_view_targets
+from sources.timeseries import TimeSeries
+
+
+def series_of(values, start=date(2000, 1, 1)):
+    return TimeSeries.from_records(
+        [{"date": (start + timedelta(days=index)).isoformat(), "value": value} for index, value in enumerate(values)]
+    )
+
+
+def wave(n):
+    return series_of([math.sin(index / 7.0) * 10 + index * 0.01 for index in range(n)])
+
+
+def test_lttb_picks_the_largest_triangles():
+    series = series_of([0, 1, 0, 5, 0, 1, 0, -4, 0, 1])
+    result = lttb(series, 4)
+    # Zwei innere Buckets (Indizes 1-4 und 5-8): Spitze 5 und Tal -4 bleiben erhalten
+    assert [value for _, value in result] == [0, 5, -4, 1]
+    assert result.dates() == [series[0][0], series[3][0], series[7][0], series[9][0]]
+
+
+def test_lttb_size_and_endpoints():
+    series = wave(1000)
+    result = lttb(series, 100)
+    assert len(result) == 100
+    assert result[0] == series[0]
+    assert result[-1] == series[-1]
+    assert result.dates() == sorted(result.dates())
+    assert set(result.dates()) <= set(series.dates())
+
+
+def test_short_series_or_small_threshold_is_unchanged():
+    series = wave(50)
+    assert lttb(series, 50) is series
+    assert lttb(series, 2) is series
+    assert minmax(series, 60) is series
+    assert minmax(series, 3) is series
+
+
+def test_minmax_keeps_extremes_in_time_order():
+    values = [float(index % 17) for index in range(500)]
+    values[123] = 99.0
+    values[321] = -99.0
+    series = series_of(values)
+
+    result = minmax(series, 40)
+
+    assert len(result) <= 40
+    assert result[0] == series[0] and result[-1] == series[-1]
+    assert result.dates() == sorted(result.dates())
+    kept = dict(result)
+    assert kept[series[123][0]] == 99.0
+    assert kept[series[321][0]] == -99.0
+
+
+def test_build_views_skips_full_and_oversized_targets(caplog):
+    series = wave(300)
+    views = build_views(series, [50, "100", 300, 1000, "full"])
+    assert sorted(views) == ["100", "50"]
+    assert len(views["50"]) == 50
+
+    with caplog.at_level(logging.WARNING, logger='data_updater'):
+        fallback = build_views(series, [50], method='nearest')
+    assert fallback["50"] == views["50"]
+    assert "Unknown downsampling method" in caplog.text
+
+
+def test_build_views_skips_views_that_were_not_reduced():
+    series = wave(300)
+    assert build_views(series, [2]) == {}
+    assert build_views(series, [3], method='minmax') == {}
+    assert len(build_views(series, [3])["3"]) == 3
+
+
+def test_invalid_view_targets_are_dropped_at_startup(caplog):
+    with caplog.at_level(logging.ERROR, logger='data_updater'):
+        targets = validate_view_targets([200, "1000", "full", "max", 2, 12.5, None, 200])
+    assert targets == [200, 1000]
+    assert "'max'" in caplog.text and "below 3 points" in caplog.text
+
+
+def test_updater_ignores_invalid_view_config(make_updater):
+    updater = make_updater(datasets=1, sections={"output": {"views": ["max", 1, 40]}})
+    output = updater.update_all_data()
+
+    assert updater.view_targets == [40]
+    assert list(output['datasets']['series_0']['views']['points']) == ['40']
+
+
+def test_updater_writes_views_next_to_full_history(make_updater, workdir):
+    updater = make_updater(datasets=1, sections={"output": {"views": [40, "full"], "view_method": "minmax"}})
+    output = updater.update_all_data()
+
+    dataset = output['datasets']['series_0']
+    assert dataset['views']['method'] == 'minmax'
+    assert len(dataset['views']['points']['40']) <= 40
+    assert len(dataset['data']['historical']) > 40
+
+    with open(workdir / 'economic_data.json') as f:
+        stored = json.load(f)['datasets']['series_0']['views']['points']['40']
+    assert stored[-1] == dataset['data']['historical'].to_records()[-1]
@@ -0,0 +1,76 @@
+# tests/test_http_session.py - Gepoolte Keep-Alive-Session pro Quelle
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from urllib3.connectionpool import HTTPConnectionPool
+
+from sources.fred_source import create_fred_source
+
+
+@pytest.fixture
+def new_connections(monkeypatch):
+    """Zählt die von urllib3 neu aufgebauten Verbindungen"""
+    opened = []
+    original = HTTPConnectionPool._new_conn
+
+    def new_conn(self):
+        opened.append(threading.current_thread().name)
+        return original(self)
+
+    monkeypatch.setattr(HTTPConnectionPool, '_new_conn', new_conn)
+    return opened
+
+
+def make_source(fred_stub, **extra):
+    config = {"base_url": fred_stub.base_url, "rate_limit": 0, "timeout": 10, "retries": 1,
+              "datasets": {f"series_{index}": f"BENCH{index:05d}" for index in range(8)}}
+    config.update(extra)
+    return create_fred_source(config, 'test')
+
+
+def test_session_is_created_lazily_and_shared(fred_stub):
+    with make_source(fred_stub, pool_size=4) as source:
+        assert source._session is None
+        session = source._get_session()
+        assert source._get_session() is session
+        assert session.get_adapter('http://localhost')._pool_maxsize == 4
+        assert session.headers['Connection'] == 'keep-alive'
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            sessions = set(executor.map(lambda _: id(source._get_session()), range(8)))
+        assert sessions == {id(session)}
+
+
+def test_sequential_requests_reuse_one_connection(fred_stub, new_connections):
+    with make_source(fred_stub) as source:
+        for index in range(5):
+            assert 'error' not in source.fetch_dataset(f"series_{index}")
+
+    assert fred_stub.stats['requests'] == 5
+    assert len(new_connections) == 1
+
+
+def test_parallel_rounds_reuse_pooled_connections(fred_stub, new_connections):
+    fred_stub.latency = 0.02
+    with make_source(fred_stub, pool_size=4) as source:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for start in (0, 4):
+                ids = [f"series_{index}" for index in range(start, start + 4)]
+                assert all('error' not in result for result in executor.map(source.fetch_dataset, ids))
+
+    # Die zweite Runde nutzt die offenen Verbindungen der ersten
+    assert fred_stub.stats['requests'] == 8
+    assert len(new_connections) <= 4
+
+
+def test_close_discards_session(fred_stub, new_connections):
+    source = make_source(fred_stub)
+    source.fetch_dataset('series_0')
+    source.close()
+    assert source._session is None
+
+    source.fetch_dataset('series_1')
+    source.close()
+    assert len(new_connections) == 2
@@ -0,0 +1,73 @@
+# tests/test_incremental.py - Inkrementeller Abruf und Zusammenführung mit dem Bestand
+
+from datetime import date
+
+from sources.timeseries import TimeSeries
+
+
+def monthly(start_year, count, value=lambda index: float(index)):
+    """Monatsreihe ab Januar start_year"""
+    records = []
+    for index in range(count):
+        year, month = divmod(index, 12)
+        records.append({"date": date(start_year + year, month + 1, 1).isoformat(), "value": value(index)})
+    return TimeSeries.from_records(records)
+
+
+def delta(series):
+    return {"meta": {"count": len(series), "coverage": ["x", "y"]}, "data": {"historical": series}}
+
+
+def test_merge_replaces_overlap_and_keeps_retention_window(make_updater):
+    updater = make_updater(incremental=True)
+    existing = monthly(2000, 60)
+    # Ab der letzten gespeicherten Beobachtung (Dez. 2004) erneut abgefragt, mit Revision
+    fresh = monthly(2004, 18, value=lambda index: 1000.0 + index)[11:]
+
+    merged = updater._merge_incremental(existing, delta(fresh), '2004-12-01')
+    historical = merged['data']['historical']
+
+    assert updater.incremental_retention == 60
+    assert len(historical) == 60
+    assert merged['meta']['count'] == 60
+    assert 'coverage' not in merged['meta']
+    assert historical.start_date == '2000-07-01'
+    assert historical.end_date == '2005-06-01'
+    assert dict(historical)['2004-12-01'] == 1011.0
+    assert dict(historical)['2004-11-01'] == 58.0
+    assert merged['data']['latest'] == {"date": '2005-06-01', "value": 1017.0}
+
+
+def test_merge_without_new_observations_keeps_existing(make_updater):
+    updater = make_updater(incremental=True)
+    existing = monthly(2000, 12)
+
+    merged = updater._merge_incremental(existing, delta(TimeSeries()), '2000-12-01')
+
+    assert merged['data']['historical'] == existing
+    assert merged['meta']['count'] == 12
+
+
+def test_retention_is_configurable_and_can_be_disabled(make_updater):
+    existing = monthly(2000, 60)
+    fresh = monthly(2005, 6, value=lambda index: 500.0 + index)
+
+    short = make_updater(incremental=True, sections={"updater": {"incremental_retention": 24}})
+    assert len(short._merge_incremental(existing, delta(fresh), '2005-01-01')['data']['historical']) == 24
+
+    unbounded = make_updater(incremental=True, sections={"updater": {"incremental_retention": 0}})
+    merged = unbounded._merge_incremental(existing, delta(fresh), '2005-01-01')['data']['historical']
+    assert len(merged) == 66
+    assert merged.start_date == '2000-01-01'
+
+
+def test_incremental_run_matches_full_window(make_updater):
+    full = make_updater().update_all_data()
+    full_series = full['datasets']['series_0']['data']['historical']
+    assert len(full_series) <= 60
+
+    incremental = make_updater(incremental=True).update_all_data()
+
+    series = incremental['datasets']['series_0']['data']['historical']
+    assert series == full_series
+    assert incremental['datasets']['series_0']['data']['latest'] == full_series.latest()
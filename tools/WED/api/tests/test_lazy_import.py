@@ -0,0 +1,65 @@
+# tests/test_lazy_import.py - Schneller Import und verzögerte Initialisierung
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks import import_time
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('numpy', 'requests', 'aiohttp', 'pyarrow', 'sources.fred_source', 'sources.base_source')
+
+
+def loaded_after_import(statement, tmp_path):
+    """Führt `statement` in einem frischen Interpreter aus und liefert die geladenen schweren Module"""
+    code = f"import sys\n{statement}\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=str(tmp_path), capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=API_DIR), check=True)
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+@pytest.mark.parametrize('module', ['sources', 'api_manager', 'data_updater'])
+def test_import_loads_no_heavy_dependencies(module, tmp_path):
+    assert loaded_after_import(f"import {module}", tmp_path) == []
+    # Kein Singleton beim Import - also auch keine Dateien im Arbeitsverzeichnis
+    assert os.listdir(tmp_path) == []
+
+
+def test_lazy_exports_load_on_first_access(tmp_path):
+    loaded = loaded_after_import("import sources\nsources.TimeSeries", tmp_path)
+    assert loaded == []
+
+    loaded = loaded_after_import("from sources import FREDSource", tmp_path)
+    assert 'sources.fred_source' in loaded and 'requests' in loaded
+    assert 'numpy' not in loaded
+
+
+def test_registry_resolves_factories_and_rejects_unknown_sources():
+    import sources
+    from sources.fred_source import create_fred_source
+
+    assert sources.get_source_factory('fred') is create_fred_source
+    assert 'FREDSource' in dir(sources)
+    with pytest.raises(ValueError, match="Unknown source 'ecb'"):
+        sources.create_source('ecb', {})
+    with pytest.raises(AttributeError):
+        sources.NoSuchSource
+
+
+def test_parse_importtime_and_subtree():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:        80 |         80 | encodings",
+        "import time:       120 |        120 |   _io",
+        "import time:        50 |         50 |     _abc",
+        "import time:       300 |       1500 | api_manager",
+        "something else"
+    ])
+    entries = import_time.parse_importtime(stderr)
+    assert [(name, own, cumulative) for name, own, cumulative, _ in entries] == [
+        ('encodings', 80, 80), ('_io', 120, 120), ('_abc', 50, 50), ('api_manager', 300, 1500)]
+    assert [name for name, *_ in import_time.module_subtree(entries, 'api_manager')] == ['_io', '_abc', 'api_manager']
+    assert import_time.module_subtree(entries, 'missing') == []
@@ -0,0 +1,55 @@
+# tests/test_metadata_cache.py - Cache für Serien-Metadaten
+
+import os
+
+from sources.metadata_cache import SeriesMetadataCache, create_metadata_cache
+
+
+def test_default_is_memory_only(workdir):
+    cache = create_metadata_cache({})
+    cache.set_many({'GDP': {'title': 'Gross Domestic Product'}})
+
+    assert cache.path == ':memory:'
+    assert cache.get_many(['GDP'])['GDP'][0] == {'title': 'Gross Domestic Product'}
+    assert os.listdir(workdir) == []
+    cache.close()
+
+
+def test_configured_path_persists(tmp_path):
+    path = str(tmp_path / 'meta' / 'series.sqlite')
+    cache = create_metadata_cache({'path': path})
+    cache.set_many({'GDP': {'units': 'Bil. of $'}}, fetched=100.0)
+    cache.close()
+
+    reopened = create_metadata_cache({'path': path})
+    assert reopened.get_many(['GDP', 'UNRATE']) == {'GDP': ({'units': 'Bil. of $'}, 100.0)}
+    reopened.close()
+
+
+def test_default_path_is_resolved_next_to_config(workdir, tmp_path_factory):
+    config_dir = tmp_path_factory.mktemp('config')
+    cache = create_metadata_cache({}, str(config_dir))
+    assert cache.path == os.path.join(str(config_dir), 'series_metadata.sqlite')
+    cache.close()
+
+    relative = create_metadata_cache({'path': 'meta/series.sqlite'}, str(config_dir))
+    assert relative.path == os.path.join(str(config_dir), 'meta', 'series.sqlite')
+    relative.close()
+
+    assert create_metadata_cache({'backend': 'memory'}, str(config_dir)).path == ':memory:'
+    assert os.listdir(workdir) == []
+
+
+def test_updater_keeps_metadata_next_to_api_config(make_updater, workdir):
+    updater = make_updater()
+    assert updater.api_manager.sources['fred'].metadata_cache.path == str(workdir / 'series_metadata.sqlite')
+
+
+def test_expiry_and_refresh_windows():
+    cache = SeriesMetadataCache(path=':memory:', ttl=100, refresh_after=10)
+
+    assert not cache.needs_refresh(fetched=0, now=5)
+    assert cache.needs_refresh(fetched=0, now=10)
+    assert not cache.is_expired(fetched=0, now=99)
+    assert cache.is_expired(fetched=0, now=100)
+    cache.close()
@@ -0,0 +1,103 @@
+# tests/test_metrics.py - Metriken (Zähler, Gauges, Histogramme) und Prometheus-Export
+
+import pytest
+
+from sources.metrics import MetricsRegistry, metrics
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(buckets=(0.1, 1.0))
+
+
+@pytest.fixture
+def clean_metrics():
+    """Prozessweite Registry vor und nach dem Test leeren"""
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+def test_counters_gauges_and_label_filter(registry):
+    registry.inc('wed_cache_requests_total', source='fred', result='hit')
+    registry.inc('wed_cache_requests_total', 2, source='fred', result='hit')
+    registry.inc('wed_cache_requests_total', source='ecb', result='miss')
+    registry.set('wed_update_duration_seconds', 1.5)
+
+    snapshot = registry.snapshot(source='fred')
+    assert snapshot['counters'] == {'wed_cache_requests_total{result=hit}': 3.0}
+    assert registry.snapshot()['gauges'] == {'wed_update_duration_seconds': 1.5}
+    assert 'wed_update_duration_seconds' not in snapshot['gauges']
+
+
+def test_histogram_quantiles_interpolate_within_buckets(registry):
+    for value in (0.05, 0.05, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 5.0):
+        registry.observe('wed_http_request_duration_seconds', value, source='fred')
+
+    histogram = registry.snapshot()['histograms']['wed_http_request_duration_seconds{source=fred}']
+    assert histogram['count'] == 10
+    assert histogram['sum'] == pytest.approx(8.6)
+    # Rang 5 liegt im Bucket (0.1, 1.0] mit 7 Einträgen: 0.1 + 0.9 * 3/7
+    assert histogram['p50'] == pytest.approx(0.1 + 0.9 * 3 / 7, abs=1e-6)
+    # Rang 9.5 liegt im +Inf-Bucket -> höchste bekannte Grenze
+    assert histogram['p95'] == 1.0
+
+
+def test_timer_records_duration(registry):
+    with registry.timer('wed_parse_duration_seconds', source='fred'):
+        pass
+    assert registry.snapshot()['histograms']['wed_parse_duration_seconds{source=fred}']['count'] == 1
+
+
+def test_prometheus_export(registry):
+    registry.inc('wed_http_responses_total', source='fr"ed', status=200)
+    registry.observe('wed_http_request_duration_seconds', 0.5, source='fred')
+    registry.observe('wed_http_request_duration_seconds', 2.0, source='fred')
+    text = registry.to_prometheus()
+
+    assert '# TYPE wed_http_responses_total counter' in text
+    assert 'wed_http_responses_total{source="fr\\"ed",status="200"} 1' in text
+    assert '# TYPE wed_http_request_duration_seconds histogram' in text
+    assert 'wed_http_request_duration_seconds_bucket{source="fred",le="0.1"} 0' in text
+    assert 'wed_http_request_duration_seconds_bucket{source="fred",le="1"} 1' in text
+    assert 'wed_http_request_duration_seconds_bucket{source="fred",le="+Inf"} 2' in text
+    assert 'wed_http_request_duration_seconds_sum{source="fred"} 2.5' in text
+    assert 'wed_http_request_duration_seconds_count{source="fred"} 2' in text
+
+
+def test_prometheus_export_of_infinite_and_nan_values(registry, tmp_path):
+    registry.set('wed_rate_limit_tokens', float('inf'), source='fred')
+    registry.set('wed_rate_limit_tokens', float('-inf'), source='ecb')
+    registry.set('wed_update_duration_seconds', float('nan'))
+    registry.observe('wed_fetch_duration_seconds', float('inf'), source='fred')
+    text = registry.to_prometheus()
+
+    assert 'wed_rate_limit_tokens{source="fred"} +Inf' in text
+    assert 'wed_rate_limit_tokens{source="ecb"} -Inf' in text
+    assert 'wed_update_duration_seconds NaN' in text
+    assert 'wed_fetch_duration_seconds_sum{source="fred"} +Inf' in text
+    registry.write_textfile(str(tmp_path / 'wed.prom'))
+
+
+def test_write_textfile(registry, tmp_path):
+    registry.set('wed_update_duration_seconds', 3)
+    path = tmp_path / 'metrics' / 'wed.prom'
+    registry.write_textfile(str(path))
+    assert path.read_text() == registry.to_prometheus()
+
+
+def test_update_run_records_source_and_cache_metrics(make_updater, workdir, clean_metrics):
+    updater = make_updater(datasets=2, sections={"metrics": {"textfile": str(workdir / 'wed.prom')}})
+    output = updater.update_all_data()
+    updater.api_manager.fetch_data('fred', 'series_0')
+
+    source_metrics = output['meta']['update_summary']['fred']['metrics']
+    assert source_metrics['counters']['wed_cache_requests_total{result=miss}'] == 2
+    assert source_metrics['counters']['wed_http_responses_total{status=200}'] == 2
+    assert source_metrics['counters']['wed_http_bytes_total'] > 0
+    assert source_metrics['histograms']['wed_fetch_duration_seconds{dataset=series_0}']['count'] == 1
+
+    assert clean_metrics.snapshot(source='fred')['counters']['wed_cache_requests_total{result=hit}'] == 1
+    text = (workdir / 'wed.prom').read_text()
+    assert 'wed_update_datasets{status="successful"} 2' in text
+    assert 'wed_update_last_success_timestamp_seconds' in text
@@ -0,0 +1,115 @@
+# tests/test_output_writer.py - Atomares Schreiben und Shards pro Datensatz
+
+import json
+import os
+import stat
+
+import pytest
+
+import output_writer
+from output_writer import ShardedOutputWriter, atomic_write_bytes, atomic_write_json
+from sources.timeseries import TimeSeries
+
+
+def output_data(**values):
+    return {
+        "meta": {"last_updated": "01.01.2024 00:00"},
+        "datasets": {
+            dataset_id: {"title": dataset_id.upper(), "data": {"historical": TimeSeries.from_records(
+                [{"date": "2024-01-01", "value": value}])}}
+            for dataset_id, value in values.items()
+        }
+    }
+
+
+def test_atomic_write_replaces_file_and_keeps_mode(tmp_path):
+    path = tmp_path / 'economic_data.json'
+    path.write_text('old')
+    os.chmod(path, 0o640)
+
+    atomic_write_json(str(path), {"series": TimeSeries.from_records([{"date": "2024-01-01", "value": 1.5}])})
+
+    assert json.loads(path.read_text()) == {"series": [{"date": "2024-01-01", "value": 1.5}]}
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert os.listdir(tmp_path) == ['economic_data.json']
+
+
+def test_new_file_is_world_readable(tmp_path):
+    path = tmp_path / 'nested' / 'economic_data.json'
+    atomic_write_bytes(str(path), b'{}')
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+
+def test_failed_write_keeps_old_file_and_removes_temp(tmp_path, monkeypatch):
+    path = tmp_path / 'economic_data.json'
+    path.write_text('old')
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(output_writer.os, 'replace', fail)
+    with pytest.raises(OSError, match="disk full"):
+        atomic_write_bytes(str(path), b'new')
+
+    assert path.read_text() == 'old'
+    assert os.listdir(tmp_path) == ['economic_data.json']
+
+
+def test_sharded_writer_writes_only_changed_shards(tmp_path):
+    writer = ShardedOutputWriter(str(tmp_path / 'shards'))
+    assert sorted(writer.write(output_data(gdp=1.0, cpi=2.0))) == ['cpi', 'gdp']
+
+    assert writer.write(output_data(gdp=1.0, cpi=2.0)) == []
+    assert writer.write(output_data(gdp=1.5, cpi=2.0)) == ['gdp']
+
+    manifest = writer.load_manifest()
+    assert manifest['meta'] == {"last_updated": "01.01.2024 00:00"}
+    assert manifest['datasets']['gdp']['file'] == 'gdp.json'
+    assert manifest['datasets']['gdp']['bytes'] == os.path.getsize(tmp_path / 'shards' / 'gdp.json')
+    assert writer.load_dataset('gdp')['data']['historical'] == [{"date": "2024-01-01", "value": 1.5}]
+    assert writer.load_dataset('missing') is None
+
+
+def test_unchanged_datasets_are_not_serialized(tmp_path, monkeypatch):
+    writer = ShardedOutputWriter(str(tmp_path))
+    writer.write(output_data(gdp=1.0, cpi=2.0))
+
+    serialized = []
+    original = output_writer.serialize_json
+
+    def serialize(data, indent=None):
+        serialized.append(data)
+        return original(data, indent)
+
+    monkeypatch.setattr(output_writer, 'serialize_json', serialize)
+
+    assert writer.write(output_data(gdp=9.0, cpi=3.0), unchanged={'gdp'}) == ['cpi']
+    # Nur cpi und das Manifest wurden serialisiert
+    assert len(serialized) == 2
+    assert writer.load_dataset('gdp')['data']['historical'][0]['value'] == 1.0
+
+
+def test_partial_write_keeps_other_shards_and_full_write_removes_orphans(tmp_path):
+    writer = ShardedOutputWriter(str(tmp_path))
+    writer.write(output_data(gdp=1.0, cpi=2.0))
+
+    assert writer.write(output_data(cpi=5.0), dataset_ids=['cpi']) == ['cpi']
+    assert sorted(writer.load_all()['datasets']) == ['cpi', 'gdp']
+
+    writer.write(output_data(cpi=5.0))
+    assert list(writer.load_all()['datasets']) == ['cpi']
+    assert not (tmp_path / 'gdp.json').exists()
+    assert sorted(os.path.basename(path) for path in writer.artifact_paths()) == ['cpi.json', 'manifest.json']
+
+
+def test_updater_writes_shards_next_to_monolithic_file(make_updater, workdir):
+    updater = make_updater(datasets=2, sections={"output": {"sharded": True, "shard_dir": str(workdir / 'shards')}})
+    output = updater.update_all_data()
+
+    shards = ShardedOutputWriter(str(workdir / 'shards')).load_all()
+    with open(workdir / 'economic_data.json') as f:
+        monolithic = json.load(f)
+    assert sorted(shards['datasets']) == ['series_0', 'series_1']
+    assert shards['datasets'] == monolithic['datasets']
+    assert len(shards['datasets']['series_0']['data']['historical']) == len(
+        output['datasets']['series_0']['data']['historical'])
@@ -0,0 +1,73 @@
+# tests/test_pagination.py - Seitenweiser, paralleler Zeitraum-Abruf (fetch_historical_range)
+
+import asyncio
+
+import pytest
+
+from sources.fred_source import create_fred_source
+
+
+def make_source(fred_stub, **extra):
+    config = {"base_url": fred_stub.base_url, "rate_limit": 0, "timeout": 10, "retries": 1,
+              "datasets": {"series": "BENCH00003"}, "page_size": 25, "page_workers": 3}
+    config.update(extra)
+    return create_fred_source(config, 'test')
+
+
+def single_request(source, start_date, end_date):
+    return source.fetch_dataset('series', source.get_range_params(start_date, end_date))
+
+
+def test_long_range_is_fetched_in_pages_and_matches_single_request(fred_stub):
+    with make_source(fred_stub) as source:
+        paged = source.fetch_historical_range('series', '1950-01-01', '1959-12-01')
+        pages = fred_stub.stats['requests']
+        expected = single_request(source, '1950-01-01', '1959-12-01')
+
+    # count = 120 Beobachtungen, 25 pro Seite -> 5 Requests
+    assert pages == 5
+    assert paged['data']['historical'] == expected['data']['historical']
+    assert paged['data']['historical'].start_date == '1950-01-01'
+    assert paged['data']['historical'].end_date == '1959-12-01'
+    assert paged['data']['latest'] == expected['data']['latest']
+    assert paged['meta']['coverage'] == {'start': '1950-01-01', 'end': '1959-12-01'}
+    assert paged['meta']['count'] == len(paged['data']['historical'])
+
+
+def test_short_range_needs_one_request(fred_stub):
+    with make_source(fred_stub) as source:
+        result = source.fetch_historical_range('series', '1955-01-01', '1955-12-01')
+
+    assert fred_stub.stats['requests'] == 1
+    assert result['data']['historical'].start_date >= '1955-01-01'
+    assert result['data']['historical'].end_date <= '1955-12-01'
+
+
+def test_async_range_matches_sync_range(fred_stub):
+    with make_source(fred_stub) as source:
+        sync_result = source.fetch_historical_range('series', '1951-03-01', '1958-06-01')
+
+        async def run():
+            try:
+                return await source.fetch_historical_range_async('series', '1951-03-01', '1958-06-01')
+            finally:
+                await source.close_async()
+
+        async_result = asyncio.run(run())
+
+    assert async_result['data']['historical'] == sync_result['data']['historical']
+    assert async_result['meta']['coverage'] == sync_result['meta']['coverage']
+
+
+def test_failed_page_fails_the_whole_range(fred_stub, monkeypatch):
+    with make_source(fred_stub) as source:
+        original = source._make_request
+
+        def make_request(url, params):
+            if params.get('offset'):
+                raise Exception("page failed")
+            return original(url, params)
+
+        monkeypatch.setattr(source, '_make_request', make_request)
+        with pytest.raises(Exception, match="page failed"):
+            source.fetch_historical_range('series', '1950-01-01', '1959-12-01')
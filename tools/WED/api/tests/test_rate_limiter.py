@@ -0,0 +1,117 @@
+# tests/test_rate_limiter.py - Token-Bucket (Reservierung, AIMD, geteilter Zustand, Retry-After)
+
+import math
+import time
+from email.utils import formatdate
+
+import pytest
+
+from sources.base_source import RateLimitExceeded
+from sources.fred_source import create_fred_source
+from sources.rate_limiter import SharedTokenBucket, TokenBucket, create_rate_limiter, parse_retry_after
+
+
+def test_reservations_are_staggered():
+    bucket = TokenBucket(rate=10.0, capacity=2)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_unlimited_bucket_never_waits():
+    bucket = create_rate_limiter({'rate_limit': 0}, 'unlimited')
+    assert all(bucket.reserve() == 0.0 for _ in range(100))
+
+
+def test_penalize_halves_rate_down_to_floor_and_reward_recovers():
+    bucket = TokenBucket(rate=8.0, min_rate=2.0, recovery=0.25)
+
+    bucket.penalize()
+    assert bucket.rate == 4.0
+    bucket.penalize()
+    bucket.penalize()
+    assert bucket.rate == 2.0
+
+    for _ in range(3):
+        bucket.reward()
+    assert bucket.rate == 8.0
+    bucket.reward()
+    assert bucket.rate == 8.0
+
+
+def test_penalize_blocks_until_retry_after():
+    bucket = TokenBucket(rate=100.0, capacity=5)
+
+    bucket.penalize(retry_after=0.5)
+
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.05)
+
+
+def test_penalize_unlimited_bucket_uses_retry_after_rate():
+    bucket = create_rate_limiter({'rate_limit': 0}, 'unlimited')
+
+    bucket.penalize(retry_after=4.0)
+
+    assert bucket.rate == pytest.approx(TokenBucket.UNLIMITED_MIN_RATE)
+    bucket = create_rate_limiter({'rate_limit': 0}, 'unlimited')
+    bucket.penalize(retry_after=0.25)
+    assert bucket.rate == pytest.approx(4.0)
+
+
+def test_penalize_unlimited_bucket_without_retry_after_uses_configured_floor():
+    bucket = create_rate_limiter({'rate_limit': 0, 'rate_limit_max_interval': 0.5}, 'unlimited')
+
+    bucket.penalize()
+    assert bucket.rate == 2.0
+    assert math.isfinite(bucket.rate)
+
+    # Erholt bei 16 x Untergrenze, danach wieder unbegrenzt
+    for _ in range(20):
+        bucket.reward()
+    assert math.isinf(bucket.rate)
+
+
+def test_max_interval_sets_rate_floor():
+    bucket = create_rate_limiter({'rate_limit': 0.1, 'rate_limit_max_interval': 2}, 'fred')
+    for _ in range(10):
+        bucket.penalize()
+    assert bucket.rate == 0.5
+
+
+def test_shared_bucket_state_is_shared_and_reopens_after_close(tmp_path):
+    path = str(tmp_path / 'limits.sqlite')
+    first = SharedTokenBucket(rate=1.0, name='fred', state_path=path)
+    second = SharedTokenBucket(rate=1.0, name='fred', state_path=path)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() == pytest.approx(1.0, abs=0.05)
+
+    first.close()
+    first.close()
+    assert first.reserve() == pytest.approx(2.0, abs=0.05)
+    first.close()
+    second.close()
+
+
+def test_source_close_closes_shared_bucket(tmp_path):
+    source = create_fred_source({'rate_limit': 1, 'rate_limit_state': str(tmp_path / 'limits.sqlite')}, 'test')
+    assert isinstance(source.rate_limiter, SharedTokenBucket)
+
+    source.close()
+
+    assert source.rate_limiter._conn is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('2.5') == 2.5
+    assert parse_retry_after('-3') == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(formatdate(time.time() + 30, usegmt=True)) == pytest.approx(30, abs=2)
+
+
+def test_rate_limit_message_keeps_sub_second_waits():
+    assert 'retry after 0.25s' in str(RateLimitExceeded(0.25))
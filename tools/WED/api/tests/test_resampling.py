@@ -0,0 +1,182 @@
+# tests/test_resampling.py - Ausrichtung gemischter Frequenzen (Aggregation, Interpolation, Ansichten)
+
+import math
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from resampling import AlignmentEngine, aggregate, align, period_ids, period_starts
+from sources.timeseries import TimeSeries
+
+
+def series(points):
+    return TimeSeries.from_records([{"date": day, "value": value} for day, value in points])
+
+
+def ordinals(*days):
+    return np.array([date.fromisoformat(day).toordinal() for day in days], dtype=np.int64)
+
+
+def iso(positions):
+    return [date.fromordinal(int(ordinal)).isoformat() for ordinal in positions]
+
+
+def nan_to_none(column):
+    return [None if math.isnan(value) else value for value in column.tolist()]
+
+
+@pytest.mark.parametrize('frequency, expected', [
+    ('D', ['2024-02-29', '2024-03-31', '2024-04-01']),
+    ('W', ['2024-02-26', '2024-03-25', '2024-04-01']),
+    ('M', ['2024-02-01', '2024-03-01', '2024-04-01']),
+    ('Q', ['2024-01-01', '2024-01-01', '2024-04-01']),
+    ('A', ['2024-01-01', '2024-01-01', '2024-01-01']),
+])
+def test_period_starts_roundtrip(frequency, expected):
+    days = ordinals('2024-02-29', '2024-03-31', '2024-04-01')
+    assert iso(period_starts(period_ids(days, frequency), frequency)) == expected
+
+
+@pytest.mark.parametrize('how, expected', [
+    ('last', [3.0, 10.0]), ('first', [1.0, 10.0]), ('mean', [2.0, 10.0]),
+    ('sum', [6.0, 10.0]), ('min', [1.0, 10.0]), ('max', [3.0, 10.0]),
+])
+def test_aggregate_daily_to_monthly(how, expected):
+    days = ordinals('2024-01-02', '2024-01-15', '2024-01-31', '2024-02-01')
+    ids, values = aggregate(days, np.array([1.0, 2.0, 3.0, 10.0]), 'M', how)
+
+    assert iso(period_starts(ids, 'M')) == ['2024-01-01', '2024-02-01']
+    assert values.tolist() == expected
+
+
+def test_outer_join_keeps_gaps_as_nan():
+    monthly = series([('2024-01-01', 1.0), ('2024-02-01', 2.0), ('2024-03-01', 3.0)])
+    quarterly = series([('2024-01-01', 100.0), ('2024-04-01', 130.0)])
+
+    positions, columns = align({'m': monthly, 'q': quarterly}, 'M')
+
+    assert iso(positions) == ['2024-01-01', '2024-02-01', '2024-03-01', '2024-04-01']
+    assert nan_to_none(columns['m']) == [1.0, 2.0, 3.0, None]
+    assert nan_to_none(columns['q']) == [100.0, None, None, 130.0]
+
+
+def test_inner_join_limits_to_common_range():
+    monthly = series([('2024-01-01', 1.0), ('2024-02-01', 2.0), ('2024-03-01', 3.0)])
+    shorter = series([('2024-02-01', 20.0), ('2024-04-01', 40.0)])
+
+    positions, columns = align({'m': monthly, 's': shorter}, 'M', join='inner')
+
+    assert iso(positions) == ['2024-02-01', '2024-03-01']
+    assert nan_to_none(columns['s']) == [20.0, None]
+
+
+def test_linear_interpolation_between_known_values_only():
+    quarterly = series([('2024-01-01', 100.0), ('2024-04-01', 130.0)])
+    monthly = series([('2023-12-01', 0.0), ('2024-06-01', 0.0)])
+
+    positions, columns = align({'q': quarterly, 'm': monthly}, 'M', interpolation={'q': 'linear'})
+
+    assert iso(positions)[0] == '2023-12-01'
+    values = nan_to_none(columns['q'])
+    assert values[0] is None and values[-2:] == [None, None]
+    assert values[1] == 100.0 and values[4] == 130.0
+    # Stützstellen auf Tagesbasis: Januar 31, Februar 29, März 31 Tage
+    assert values[2] == pytest.approx(100.0 + 30.0 * 31 / 91)
+    assert values[3] == pytest.approx(100.0 + 30.0 * 60 / 91)
+
+
+def test_ffill_stops_at_end_of_last_observation_period():
+    quarterly = series([('2024-01-01', 1.0), ('2024-04-01', 2.0)])
+    monthly = series([(f'2024-{month:02d}-01', 0.0) for month in range(1, 10)])
+
+    _, columns = align({'q': quarterly, 'm': monthly}, 'M', interpolation={'q': 'ffill'})
+
+    # Letztes Quartal gilt bis Ende Juni, danach keine Extrapolation
+    assert nan_to_none(columns['q']) == [1.0, 1.0, 1.0, 2.0, 2.0, 2.0, None, None, None]
+
+
+def test_window_interpolates_from_values_outside_the_window():
+    quarterly = series([('2023-10-01', 10.0), ('2024-04-01', 40.0)])
+
+    positions, columns = align({'q': quarterly}, 'M', interpolation={'q': 'linear'},
+                               start='2024-01-01', end='2024-02-15')
+
+    assert iso(positions) == ['2024-01-01', '2024-02-01']
+    assert all(not math.isnan(value) for value in columns['q'])
+    assert 10.0 < columns['q'][0] < columns['q'][1] < 40.0
+
+
+def test_daily_mean_to_weekly():
+    start = date(2024, 1, 1)  # Montag
+    daily = series([((start + timedelta(days=offset)).isoformat(), float(offset)) for offset in range(14)])
+
+    positions, columns = align({'d': daily}, 'W', aggregation={'d': 'mean'})
+
+    assert iso(positions) == ['2024-01-01', '2024-01-08']
+    assert columns['d'].tolist() == [3.0, 10.0]
+
+
+def test_empty_or_disjoint_inputs():
+    positions, columns = align({'e': TimeSeries()}, 'M')
+    assert len(positions) == 0 and len(columns['e']) == 0
+
+    a = series([('2020-01-01', 1.0)])
+    b = series([('2024-01-01', 1.0)])
+    positions, _ = align({'a': a, 'b': b}, 'M', join='inner')
+    assert len(positions) == 0
+
+
+def make_engine():
+    return AlignmentEngine({"views": {
+        "macro": {"datasets": ["gdp", "rate"], "frequency": "Q",
+                  "aggregation": {"default": "mean", "gdp": "last"}, "interpolation": "none"},
+        "bad_frequency": {"datasets": ["gdp"], "frequency": "H"},
+        "bad_method": {"datasets": ["gdp"], "aggregation": "median"},
+        "empty": {"datasets": []},
+    }})
+
+
+def inputs():
+    return {
+        'gdp': series([('2024-01-01', 100.0), ('2024-04-01', 101.0)]),
+        'rate': series([('2024-01-01', 5.0), ('2024-02-01', 5.5), ('2024-03-01', 6.0), ('2024-04-01', 6.0)]),
+    }
+
+
+def test_engine_skips_invalid_views_and_resolves_defaults():
+    engine = make_engine()
+
+    assert list(engine.views) == ['macro']
+    assert engine.views['macro']['aggregation'] == {'gdp': 'last', 'rate': 'mean'}
+    assert engine.views['macro']['interpolation'] == {'gdp': 'none', 'rate': 'none'}
+    assert engine.inputs() == {'gdp', 'rate'}
+    assert engine.dependents(['rate']) == ['macro']
+    assert engine.dependents(['other']) == []
+
+
+def test_engine_renders_json_and_reuses_unchanged_views():
+    engine = make_engine()
+
+    first = engine.build(inputs())['macro']
+    assert first['status'] == 'computed'
+    view = first['view']
+    assert view['dates'] == ['2024-01-01', '2024-04-01']
+    assert view['columns'] == {'gdp': [100.0, 101.0], 'rate': [5.5, 6.0]}
+
+    again = engine.build(inputs(), stored={'macro': view})['macro']
+    assert again['status'] == 'cached'
+    assert again['view'] is view
+
+    changed = inputs()
+    changed['rate'] = series([('2024-01-01', 5.0)])
+    rebuilt = engine.build(changed, stored={'macro': view})['macro']
+    assert rebuilt['status'] == 'computed'
+    assert rebuilt['view']['hash'] != view['hash']
+    assert rebuilt['view']['columns']['rate'] == [5.0, None]
+
+
+def test_engine_reports_missing_datasets():
+    result = make_engine().build({'gdp': inputs()['gdp']})['macro']
+    assert result['status'] == 'error'
+    assert 'rate' in result['error']
@@ -0,0 +1,156 @@
+# tests/test_response_cache.py - Persistenter Antwort-Cache (TTL, LRU, Standardpfad)
+
+import json
+import os
+import time
+
+from api_manager import APIManager
+from response_cache import MemoryResponseCache, PersistentResponseCache, create_response_cache
+from sources.timeseries import TimeSeries
+
+
+def make_cache(tmp_path, **kwargs):
+    return PersistentResponseCache(path=str(tmp_path / 'cache.sqlite'), **kwargs)
+
+
+def test_roundtrip_restores_timeseries(tmp_path):
+    cache = make_cache(tmp_path)
+    series = TimeSeries.from_records([{"date": "2024-01-01", "value": 1.5}, {"date": "2024-02-01", "value": 2.0}])
+    cache.set('fred_gdp_{}', 'fred', {"meta": {"count": 2}, "data": {"historical": series}})
+
+    entry = cache.get('fred_gdp_{}')
+    assert entry['data']['data']['historical'] == series
+    assert entry['data']['meta'] == {"count": 2}
+    cache.close()
+
+
+def test_survives_reopen(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set('key', 'fred', {"value": 1})
+    cache.close()
+
+    reopened = make_cache(tmp_path)
+    assert reopened.get('key')['data'] == {"value": 1}
+    reopened.close()
+
+
+def test_expired_entries_are_evicted_on_write(tmp_path):
+    cache = make_cache(tmp_path, default_ttl=10, source_ttls={'fast': 1})
+    now = time.time()
+    cache.set('old', 'fast', {"value": 1}, timestamp=now - 5)
+    cache.set('young', 'fred', {"value": 2}, timestamp=now - 5)
+
+    assert cache.get('old') is None
+    assert cache.get('young')['timestamp'] == now - 5
+    cache.close()
+
+
+def test_keep_stale_extends_retention_beyond_ttl(tmp_path):
+    cache = make_cache(tmp_path, default_ttl=1, keep_stale=60)
+    cache.set('key', 'fred', {"value": 1}, timestamp=time.time() - 30)
+    cache.set('other', 'fred', {"value": 2})
+
+    assert cache.get('key') is not None
+    cache.close()
+
+
+def test_lru_eviction_by_entry_count(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.set('a', 'fred', {"value": 1})
+    cache.set('b', 'fred', {"value": 2})
+    time.sleep(0.01)
+    assert cache.get('a') is not None  # 'a' zuletzt benutzt
+    cache.set('c', 'fred', {"value": 3})
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    cache.close()
+
+
+def test_lru_eviction_by_bytes(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=300)
+    payload = {"value": os.urandom(200).hex()}
+    cache.set('a', 'fred', payload)
+    cache.set('b', 'fred', payload)
+
+    assert cache.get('a') is None
+    assert cache.get('b') is not None
+    cache.close()
+
+
+def test_default_backend_without_config_dir_is_memory(workdir):
+    assert create_response_cache({}) is None
+    assert os.listdir(workdir) == []
+
+
+def test_default_path_is_resolved_next_to_config(workdir, tmp_path_factory):
+    config_dir = tmp_path_factory.mktemp('config')
+    cache = create_response_cache({}, str(config_dir))
+
+    assert cache.path == os.path.join(str(config_dir), 'api_cache.sqlite')
+    assert not os.path.exists(workdir / 'api_cache.sqlite')
+    cache.close()
+
+
+def test_explicit_memory_backend(tmp_path):
+    assert create_response_cache({"backend": "memory"}, str(tmp_path)) is None
+
+
+class CountingSource:
+    rate_limiter = None
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_dataset(self, dataset_id, params=None):
+        self.calls += 1
+        return {"meta": {"call": self.calls}, "data": {}}
+
+
+def make_manager(tmp_path, **cache_config):
+    config_file = tmp_path / 'api_config.json'
+    config_file.write_text(json.dumps({"cache": dict({"backend": "sqlite", "ttl": 60}, **cache_config)}))
+    manager = APIManager(str(config_file))
+    source = CountingSource()
+    manager.register_source('stub', source)
+    return manager, source
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryResponseCache(max_entries=2)
+    cache['a'] = {'timestamp': 1}
+    cache['b'] = {'timestamp': 2}
+    assert cache.get('a') == {'timestamp': 1}
+    cache['c'] = {'timestamp': 3}
+
+    assert 'b' not in cache
+    assert cache.keys_with_prefix('') == ['a', 'c']
+
+
+def test_manager_memory_level_is_bounded(tmp_path):
+    manager, source = make_manager(tmp_path, memory_entries=3)
+    # Inkrementelle Abfragen: jede mit anderem observation_start
+    for day in range(1, 11):
+        manager.fetch_data('stub', 'gdp', {'observation_start': f'2024-01-{day:02d}'})
+
+    assert len(manager.data_cache) == 3
+    # Aus dem Speicher verdrängte Einträge liefert weiter der persistente Cache
+    manager.fetch_data('stub', 'gdp', {'observation_start': '2024-01-01'})
+    assert source.calls == 10
+    manager.close()
+
+
+def test_expired_memory_entry_falls_back_to_fresher_persistent_entry(tmp_path):
+    first, first_source = make_manager(tmp_path)
+    second, second_source = make_manager(tmp_path)
+    first.fetch_data('stub', 'gdp')
+    for entry in first.data_cache.values():
+        entry['timestamp'] -= 120
+
+    # Ein überlappender Lauf hat den Eintrag inzwischen erneuert
+    assert second.fetch_data('stub', 'gdp', refresh=True)['meta']['call'] == 1
+    assert first.fetch_data('stub', 'gdp')['meta']['call'] == 1
+    assert first_source.calls == 1
+    first.close()
+    second.close()
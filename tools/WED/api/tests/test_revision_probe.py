@@ -0,0 +1,86 @@
+# tests/test_revision_probe.py - Änderungserkennung per Revisionsstempel (probe-then-fetch)
+
+import json
+import os
+
+from sources.fred_source import create_fred_source
+
+
+def make_source(fred_stub, **extra):
+    config = {
+        "base_url": fred_stub.base_url, "rate_limit": 0, "timeout": 10, "retries": 1,
+        "datasets": {"inside": "BENCH00001", "outside": "BENCH00050"}
+    }
+    config.update(extra)
+    return create_fred_source(config, 'test')
+
+
+def test_probe_without_bulk_listings_sends_no_requests(fred_stub):
+    with make_source(fred_stub) as source:
+        assert source.get_revision_stamps(['inside', 'outside']) == {}
+    assert fred_stub.stats['requests'] == 0
+
+
+def test_probe_uses_bulk_listings_only(fred_stub):
+    with make_source(fred_stub, metadata_bulk={"releases": [0]}) as source:
+        stamps = source.get_revision_stamps(['inside', 'outside'])
+
+    # Release 0 enthält BENCH00000-BENCH00009; für "outside" kein Einzel-Request
+    assert stamps == {'inside': '2024-01-01 08:00:00-05|1959-12-01'}
+    assert fred_stub.stats['requests'] == 1
+
+
+def test_unchanged_run_skips_download_and_output_write(make_updater, fred_stub, workdir):
+    fred = {"metadata_bulk": {"releases": [0]}}
+    updater = make_updater(fred=fred, probe=True)
+    first = updater.update_all_data()
+    assert first['meta']['update_summary']['fred']['unchanged'] == 0
+    assert first['datasets']['series_0']['revision'] == '2024-01-01 08:00:00-05|1959-12-01'
+
+    output_file = workdir / 'economic_data.json'
+    written = os.stat(output_file).st_mtime_ns
+    requests_before = fred_stub.stats['requests']
+
+    second = make_updater(fred=fred, probe=True).update_all_data()
+
+    assert second['meta']['update_summary']['fred']['unchanged'] == 3
+    assert fred_stub.stats['requests'] - requests_before == 1  # nur die Release-Liste
+    assert os.stat(output_file).st_mtime_ns == written
+    with open(output_file) as f:
+        assert json.load(f)['datasets'].keys() == second['datasets'].keys()
+
+
+def test_new_dataset_forces_output_write(make_updater, workdir):
+    fred = {"metadata_bulk": {"releases": [0]}}
+    make_updater(fred=fred, probe=True).update_all_data()
+
+    second = make_updater(datasets=4, fred=fred, probe=True).update_all_data()
+
+    assert second['meta']['update_summary']['fred']['unchanged'] == 3
+    with open(workdir / 'economic_data.json') as f:
+        assert 'series_3' in json.load(f)['datasets']
+
+
+def test_changed_revision_bypasses_fresh_cache_entries(make_updater, fred_stub, workdir, monkeypatch):
+    import api_manager
+    fred = {"metadata_bulk": {"releases": [0]}}
+    # Persistenter Cache neben api_config.json, wie im Standardbetrieb
+    sections = {"cache": {"backend": "sqlite", "ttl": 3600}}
+    first = make_updater(fred=fred, sections=sections, probe=True).update_all_data()
+    assert first['datasets']['series_0']['data']['latest']['date'] == '1959-12-01'
+    assert (workdir / 'api_cache.sqlite').exists()
+
+    # Neue Beobachtung upstream; neuer Prozess mit demselben (noch frischen) SQLite-Cache
+    fred_stub.series_length += 1
+    api_manager._api_manager.close()
+    monkeypatch.setattr(api_manager, '_api_manager', None)
+    second = make_updater(fred=fred, sections=sections, probe=True).update_all_data()
+
+    dataset = second['datasets']['series_0']
+    assert dataset['revision'].endswith('|1960-01-01')
+    assert dataset['data']['latest']['date'] == '1960-01-01'
+    assert second['meta']['update_summary']['fred']['unchanged'] == 0
+
+    third = make_updater(fred=fred, sections=sections, probe=True).update_all_data()
+    assert third['meta']['update_summary']['fred']['unchanged'] == 3
+    assert third['datasets']['series_0']['data']['latest']['date'] == '1960-01-01'
@@ -0,0 +1,226 @@
+# tests/test_scheduler.py - Frequenzbewusster Aktualisierungs-Scheduler
+
+import heapq
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from scheduler import DAY, FREQUENCY_DAYS, RefreshScheduler, _date_to_timestamp, infer_frequency
+from sources.timeseries import TimeSeries
+
+
+def series_of(dates):
+    return TimeSeries.from_records([{"date": day, "value": float(index)} for index, day in enumerate(dates)])
+
+
+def monthly(count, start_year=2020):
+    return series_of([date(start_year + index // 12, index % 12 + 1, 1).isoformat() for index in range(count)])
+
+
+class FakeSources:
+    def __init__(self, frequencies):
+        self.frequencies = frequencies
+
+    def get_available_datasets(self):
+        return [{"id": dataset_id, "frequency": frequency} for dataset_id, frequency in self.frequencies.items()]
+
+
+class FakeUpdater:
+    """Minimaler WEDDataUpdater: liefert vorgegebene Reihen bzw. Fehler je Datensatz"""
+
+    def __init__(self, tmp_path, datasets, frequencies=None):
+        self.config = {}
+        self.output_file = str(tmp_path / 'economic_data.json')
+        self.registered_sources = {'fred': {dataset_id: dataset_id.upper() for dataset_id in datasets}}
+        self.api_manager = type('Manager', (), {'sources': {'fred': FakeSources(frequencies or {})}})()
+        self.responses = {}
+        self.calls = []
+
+    def update_datasets(self, jobs, refresh=False):
+        self.calls.append(list(jobs))
+        results = []
+        for _, dataset_id in jobs:
+            response = self.responses.get(dataset_id)
+            if isinstance(response, str):
+                results.append((None, response))
+            else:
+                results.append(({"data": {"historical": response}}, None))
+        return results
+
+
+@pytest.fixture
+def make_scheduler(tmp_path):
+    def factory(series=('gdp',), frequencies=None, **config):
+        updater = FakeUpdater(tmp_path, series, frequencies)
+        scheduler = RefreshScheduler(updater, dict({"min_interval": 900, "backoff_base": 3600}, **config))
+        scheduler.load()
+        return scheduler, updater
+    return factory
+
+
+def test_infer_frequency():
+    assert infer_frequency(monthly(24)) == 'M'
+    assert infer_frequency(series_of(['2020-01-01', '2020-04-01', '2020-07-01', '2020-10-01'])) == 'Q'
+    start = date(2024, 1, 1)
+    assert infer_frequency(series_of([(start + timedelta(days=7 * i)).isoformat() for i in range(10)])) == 'W'
+    assert infer_frequency(series_of(['2020-01-01', '2021-01-01'])) is None
+
+
+def test_expected_release_is_end_of_next_period_plus_lag(make_scheduler):
+    scheduler, _ = make_scheduler()
+    entry = {'frequency': 'M', 'last_observation': '2024-01-01', 'release_lag_days': 10}
+    # Beobachtung 2024-01 -> nächste Periode (Februar) endet ca. 2 Perioden nach dem 1.1., dann 10 Tage Verzug
+    assert scheduler._expected_release(entry) == _date_to_timestamp('2024-01-01') + (2 * 30.44 + 10) * DAY
+    assert scheduler._expected_release({'frequency': None, 'last_observation': '2024-01-01'}) is None
+    assert scheduler._expected_release({'frequency': 'Q', 'last_observation': None}) is None
+
+
+def test_new_observation_schedules_next_release(make_scheduler):
+    scheduler, _ = make_scheduler(datasets={'gdp': {'frequency': 'Q', 'release_lag_days': 30}})
+    series = series_of(['2023-07-01', '2023-10-01', '2024-01-01'])
+    now = _date_to_timestamp('2024-05-01')
+
+    scheduler._reschedule('fred/gdp', series, None, now)
+
+    entry = scheduler.state['fred/gdp']
+    assert entry['last_observation'] == '2024-01-01'
+    assert entry['misses'] == 0
+    assert entry['next_due'] == _date_to_timestamp('2024-01-01') + (2 * FREQUENCY_DAYS['Q'] + 30) * DAY
+
+
+def test_next_due_never_earlier_than_min_interval(make_scheduler):
+    scheduler, _ = make_scheduler()
+    scheduler.state['fred/gdp'].update(frequency='M', frequency_origin='config')
+    now = _date_to_timestamp('2030-01-01')
+
+    scheduler._reschedule('fred/gdp', monthly(12), None, now)
+
+    # Erwarteter Termin liegt in der Vergangenheit -> frühestens nach min_interval
+    assert scheduler.state['fred/gdp']['next_due'] == now + 900
+
+
+def test_unchanged_before_expected_release_waits_for_it(make_scheduler):
+    scheduler, _ = make_scheduler()
+    entry = scheduler.state['fred/gdp']
+    entry.update(frequency='M', frequency_origin='config', last_observation='2024-01-01', release_lag_days=5)
+    expected = scheduler._expected_release(entry)
+
+    scheduler._reschedule('fred/gdp', series_of(['2023-12-01', '2024-01-01']), None, expected - 3 * DAY)
+
+    assert entry['next_due'] == expected
+    assert entry['misses'] == 0
+
+
+def test_overdue_and_errors_back_off_exponentially_up_to_one_period(make_scheduler):
+    scheduler, _ = make_scheduler(backoff_max=7 * DAY)
+    entry = scheduler.state['fred/gdp']
+    entry.update(frequency='W', frequency_origin='config', last_observation='2024-01-01')
+    now = _date_to_timestamp('2024-03-01')
+    same = series_of(['2023-12-25', '2024-01-01'])
+
+    waits = []
+    for _ in range(10):
+        scheduler._reschedule('fred/gdp', same, None, now)
+        waits.append(entry['next_due'] - now)
+
+    assert waits[:4] == [3600, 7200, 14400, 28800]
+    assert max(waits) == 7 * DAY
+    assert entry['misses'] == 10
+
+    scheduler._reschedule('fred/gdp', None, "HTTP 500", now)
+    assert entry['next_due'] - now == 7 * DAY
+    assert entry['last_observation'] == '2024-01-01'
+
+    # Tägliche Serie: nie länger als eine Periode warten
+    entry['frequency'] = 'D'
+    scheduler._reschedule('fred/gdp', same, None, now)
+    assert entry['next_due'] - now == DAY
+
+
+def test_backoff_respects_min_interval(make_scheduler):
+    scheduler, _ = make_scheduler(backoff_base=60, min_interval=900)
+    scheduler._reschedule('fred/gdp', None, "timeout", 1000.0)
+    assert scheduler.state['fred/gdp']['next_due'] == 1900.0
+
+
+def test_release_lag_is_learned_and_smoothed(make_scheduler):
+    scheduler, _ = make_scheduler()
+    entry = scheduler.state['fred/gdp']
+    entry.update(frequency='M', frequency_origin='config', last_observation='2024-01-01')
+
+    # Februar-Wert erscheint 12 Tage nach Periodenende
+    now = _date_to_timestamp('2024-02-01') + (FREQUENCY_DAYS['M'] + 12) * DAY
+    scheduler._reschedule('fred/gdp', monthly(2, 2024), None, now)
+    assert entry['release_lag_days'] == 12
+
+    # März-Wert nach 20 Tagen -> geglättet (12 + 20) / 2
+    now = _date_to_timestamp('2024-03-01') + (FREQUENCY_DAYS['M'] + 20) * DAY
+    scheduler._reschedule('fred/gdp', monthly(3, 2024), None, now)
+    assert entry['release_lag_days'] == 16
+
+    # Lücke über mehrere Perioden: kein Lernen
+    now = _date_to_timestamp('2024-06-01') + 100 * DAY
+    scheduler._reschedule('fred/gdp', monthly(6, 2024), None, now)
+    assert entry['release_lag_days'] == 16
+
+
+def test_configured_release_lag_is_not_learned(make_scheduler):
+    scheduler, _ = make_scheduler(datasets={'gdp': {'frequency': 'M', 'release_lag_days': 3}})
+    entry = scheduler.state['fred/gdp']
+    entry['last_observation'] = '2024-01-01'
+
+    scheduler._reschedule('fred/gdp', monthly(2, 2024), None, _date_to_timestamp('2024-05-01'))
+    assert entry['release_lag_days'] == 3
+
+
+def test_load_merges_saved_state_config_and_metadata(make_scheduler, tmp_path):
+    (tmp_path / 'economic_data.schedule.json').write_text(json.dumps({"datasets": {
+        "fred/gdp": {"next_due": 5000.0, "misses": 2, "last_observation": "2024-01-01", "frequency": "Q",
+                     "frequency_origin": "observed"},
+        "fred/removed": {"next_due": 1.0, "misses": 0, "last_observation": None}
+    }}))
+    scheduler, _ = make_scheduler(series=('gdp', 'cpi', 'rate'), frequencies={'cpi': 'M', 'rate': 'Weird'},
+                                  datasets={"rate": {"frequency": "D"}})
+
+    assert sorted(scheduler.state) == ['fred/cpi', 'fred/gdp', 'fred/rate']
+    assert scheduler.state['fred/gdp']['next_due'] == 5000.0
+    assert scheduler.state['fred/gdp']['frequency'] == 'Q'
+    assert scheduler.state['fred/cpi']['frequency'] == 'M'
+    assert scheduler.state['fred/cpi']['frequency_origin'] == 'metadata'
+    assert scheduler.state['fred/rate']['frequency'] == 'D'
+    assert scheduler.state['fred/rate']['frequency_origin'] == 'config'
+    assert scheduler.next_due() == 0.0
+
+
+def test_pop_due_respects_batch_size_and_skips_outdated_entries(make_scheduler):
+    scheduler, _ = make_scheduler(series=('a', 'b', 'c'), batch_size=2)
+    assert scheduler._pop_due(now=10.0) == ['fred/a', 'fred/b']
+    assert scheduler._pop_due(now=10.0) == ['fred/c']
+    assert scheduler._pop_due(now=10.0) == []
+    assert scheduler.next_due() is None
+
+    # Eine Neuplanung hinterlässt den alten Warteschlangen-Eintrag; er wird übersprungen
+    scheduler.state['fred/a']['next_due'] = 50.0
+    heapq.heappush(scheduler._queue, (20.0, 'fred/a'))
+    heapq.heappush(scheduler._queue, (50.0, 'fred/a'))
+    assert scheduler._pop_due(now=30.0) == []
+    assert scheduler.next_due() == 50.0
+    assert scheduler._pop_due(now=50.0) == ['fred/a']
+
+
+def test_run_refreshes_due_series_and_saves_schedule(make_scheduler, tmp_path):
+    scheduler, updater = make_scheduler(series=('gdp', 'cpi'))
+    updater.responses = {'gdp': monthly(24), 'cpi': "HTTP 500"}
+
+    scheduler.run(max_batches=1)
+
+    assert len(updater.calls) == 1
+    assert sorted(updater.calls[0]) == [('fred', 'cpi'), ('fred', 'gdp')]
+    with open(tmp_path / 'economic_data.schedule.json') as f:
+        saved = json.load(f)['datasets']
+    assert saved['fred/gdp']['frequency'] == 'M'
+    assert saved['fred/gdp']['frequency_origin'] == 'observed'
+    assert saved['fred/gdp']['last_observation'] == '2021-12-01'
+    assert saved['fred/cpi']['misses'] == 1
+    assert scheduler.next_due() == min(saved['fred/gdp']['next_due'], saved['fred/cpi']['next_due'])
@@ -0,0 +1,118 @@
+# tests/test_single_flight.py - Zusammenfassen gleichzeitiger identischer Abrufe im APIManager
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api_manager import APIManager
+from sources.metrics import metrics
+
+
+class BlockingSource:
+    """Quelle, deren Abrufe bis zur Freigabe blockieren und gezählt werden"""
+
+    rate_limiter = None  # Kein zusätzliches Rate-Limit im Manager
+
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.release = threading.Event()
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def fetch_dataset(self, dataset_id, params=None):
+        with self._lock:
+            self.calls.append((dataset_id, params))
+        assert self.release.wait(10)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {"meta": {"dataset": dataset_id, "params": params}, "data": {"latest": {"value": 1.0}}}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    config_file = tmp_path / 'api_config.json'
+    config_file.write_text(json.dumps({"cache": {"backend": "memory"}}))
+    metrics.reset()
+    manager = APIManager(str(config_file))
+    yield manager
+    manager.close()
+    metrics.reset()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def coalesced():
+    return metrics.snapshot(source='stub')['counters'].get('wed_fetch_coalesced_total', 0)
+
+
+def test_concurrent_identical_requests_share_one_fetch(manager):
+    source = BlockingSource()
+    manager.register_source('stub', source)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(manager.fetch_data, 'stub', 'gdp', {'limit': 5}) for _ in range(8)]
+        wait_for(lambda: coalesced() == 7)
+        source.release.set()
+        results = [future.result(timeout=10) for future in futures]
+
+    assert source.calls == [('gdp', {'limit': 5})]
+    assert all(result is results[0] for result in results)
+    assert manager._inflight == {}
+    # Danach bedient der Cache
+    assert manager.fetch_data('stub', 'gdp', {'limit': 5}) is results[0]
+    assert len(source.calls) == 1
+
+
+def test_parameter_order_does_not_split_the_flight(manager):
+    source = BlockingSource()
+    manager.register_source('stub', source)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(manager.fetch_data, 'stub', 'gdp', {'limit': 5, 'sort_order': 'desc'})
+        wait_for(lambda: len(source.calls) == 1)
+        second = executor.submit(manager.fetch_data, 'stub', 'gdp', {'sort_order': 'desc', 'limit': 5})
+        wait_for(lambda: coalesced() == 1)
+        source.release.set()
+        assert first.result(timeout=10) is second.result(timeout=10)
+
+    assert len(source.calls) == 1
+
+
+def test_different_requests_are_not_coalesced(manager):
+    source = BlockingSource()
+    manager.register_source('stub', source)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(manager.fetch_data, 'stub', dataset_id) for dataset_id in ('gdp', 'cpi')]
+        wait_for(lambda: len(source.calls) == 2)
+        source.release.set()
+        results = [future.result(timeout=10) for future in futures]
+
+    assert [result['meta']['dataset'] for result in results] == ['gdp', 'cpi']
+    assert coalesced() == 0
+
+
+def test_errors_are_shared_but_not_cached(manager):
+    source = BlockingSource(fail=True)
+    manager.register_source('stub', source)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(manager.fetch_data, 'stub', 'gdp') for _ in range(4)]
+        wait_for(lambda: coalesced() == 3)
+        source.release.set()
+        results = [future.result(timeout=10) for future in futures]
+
+    assert len(source.calls) == 1
+    assert all(result == {'error': 'Error fetching data from stub: upstream down'} for result in results)
+
+    # Der nächste Aufruf versucht es erneut
+    manager.fetch_data('stub', 'gdp')
+    assert len(source.calls) == 2
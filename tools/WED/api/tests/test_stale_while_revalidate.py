@@ -0,0 +1,137 @@
+# tests/test_stale_while_revalidate.py - Veraltete Cache-Einträge sofort liefern, im Hintergrund erneuern
+
+import json
+import threading
+
+import pytest
+
+from api_manager import APIManager
+from sources.metrics import metrics
+
+
+class VersionedSource:
+    """Quelle, die bei jedem Abruf eine neue Version liefert; Abrufe lassen sich anhalten"""
+
+    rate_limiter = None
+
+    def __init__(self):
+        self.version = 0
+        self.fail = False
+        self.release = threading.Event()
+        self.release.set()
+
+    def fetch_dataset(self, dataset_id, params=None):
+        assert self.release.wait(10)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        self.version += 1
+        return {"meta": {"version": self.version}, "data": {}}
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    managers = []
+
+    def factory(swr):
+        config_file = tmp_path / 'api_config.json'
+        config_file.write_text(json.dumps({"cache": {"backend": "memory", "ttl": 60, "stale_while_revalidate": swr}}))
+        manager = APIManager(str(config_file))
+        source = VersionedSource()
+        manager.register_source('stub', source)
+        managers.append(manager)
+        return manager, source
+
+    metrics.reset()
+    yield factory
+    for manager in managers:
+        manager.close()
+    metrics.reset()
+
+
+def age_entries(manager, seconds):
+    for entry in manager.data_cache.values():
+        entry['timestamp'] -= seconds
+
+
+def wait_for_refresh(manager):
+    """Wartet, bis alle Hintergrund-Aktualisierungen abgeschlossen sind"""
+    for future in list(manager._inflight.values()):
+        future.result(timeout=10)
+
+
+def version(result):
+    return result['meta']['version']
+
+
+def test_stale_entry_is_served_and_refreshed_once(make_manager):
+    manager, source = make_manager({"max_staleness": 3600})
+    assert version(manager.fetch_data('stub', 'gdp')) == 1
+    age_entries(manager, 120)
+
+    source.release.clear()
+    # Beide Aufrufe erhalten sofort den veralteten Stand; nur eine Aktualisierung läuft
+    assert version(manager.fetch_data('stub', 'gdp')) == 1
+    assert version(manager.fetch_data('stub', 'gdp')) == 1
+    assert len(manager._inflight) == 1
+    source.release.set()
+    wait_for_refresh(manager)
+
+    assert source.version == 2
+    assert version(manager.fetch_data('stub', 'gdp')) == 2
+    counters = metrics.snapshot(source='stub')['counters']
+    assert counters['wed_cache_requests_total{result=stale}'] == 2
+    assert counters['wed_cache_refreshes_total{result=ok}'] == 1
+
+
+def test_blocking_callers_wait_for_running_refresh(make_manager):
+    manager, source = make_manager({"max_staleness": 3600})
+    manager.fetch_data('stub', 'gdp')
+    age_entries(manager, 120)
+
+    source.release.clear()
+    manager.fetch_data('stub', 'gdp')
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(manager.fetch_data('stub', 'gdp', allow_stale=False)))
+    waiter.start()
+    source.release.set()
+    waiter.join(10)
+
+    assert version(result[0]) == 2
+    assert source.version == 2
+
+
+def test_entries_beyond_max_staleness_are_fetched_synchronously(make_manager):
+    manager, source = make_manager({"max_staleness": 300})
+    manager.fetch_data('stub', 'gdp')
+    age_entries(manager, 600)
+
+    assert version(manager.fetch_data('stub', 'gdp')) == 2
+    assert manager._inflight == {}
+
+
+def test_disabled_by_default(make_manager):
+    manager, source = make_manager({})
+    manager.fetch_data('stub', 'gdp')
+    age_entries(manager, 120)
+
+    assert version(manager.fetch_data('stub', 'gdp')) == 2
+
+
+def test_failed_refresh_keeps_stale_entry(make_manager):
+    manager, source = make_manager({"max_staleness": 3600})
+    manager.fetch_data('stub', 'gdp')
+    age_entries(manager, 120)
+
+    source.fail = True
+    assert version(manager.fetch_data('stub', 'gdp')) == 1
+    wait_for_refresh(manager)
+
+    assert version(manager.fetch_data('stub', 'gdp')) == 1
+    assert metrics.snapshot(source='stub')['counters']['wed_cache_refreshes_total{result=error}'] >= 1
+
+
+def test_most_specific_staleness_wins(make_manager):
+    manager, _ = make_manager({"max_staleness": 100, "sources": {"stub": 200}, "datasets": {"stub/gdp": 300}})
+    assert manager._get_max_staleness('stub', 'gdp') == 300
+    assert manager._get_max_staleness('stub', 'cpi') == 200
+    assert manager._get_max_staleness('other', 'gdp') == 100
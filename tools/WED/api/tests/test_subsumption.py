@@ -0,0 +1,122 @@
+# tests/test_subsumption.py - Cache-Schlüssel, Abdeckung und Zuschnitt gecachter Obermengen
+
+import json
+
+import pytest
+
+from api_manager import APIManager
+from response_cache import canonical_params, covers, serve_from_superset
+from sources.fred_source import create_fred_source
+from sources.timeseries import TimeSeries
+
+
+def monthly(start_year, end_year):
+    return TimeSeries.from_records([{"date": f"{year}-{month:02d}-01", "value": float(year * 100 + month)}
+                                    for year in range(start_year, end_year + 1) for month in range(1, 13)])
+
+
+def cached(series, start=None, end=None):
+    return {"meta": {"source": "FRED", "count": len(series), "coverage": {"start": start, "end": end}},
+            "data": {"latest": series.latest(), "historical": series}}
+
+
+def query(start=None, end=None, limit=None, newest_first=False):
+    return {"variant": "{}", "start": start, "end": end, "limit": limit, "newest_first": newest_first}
+
+
+def test_canonical_params_ignores_order_and_empty_params():
+    assert canonical_params({'limit': 1, 'sort_order': 'desc'}) == canonical_params({'sort_order': 'desc', 'limit': 1})
+    assert canonical_params(None) == canonical_params({}) == '{}'
+
+
+def test_covers_open_and_closed_bounds():
+    assert covers({'start': None, 'end': None}, None, None) == {'start': True, 'end': True}
+    assert covers({'start': '2020-01-01', 'end': None}, '2021-01-01', None) == {'start': True, 'end': True}
+    assert covers({'start': '2020-01-01', 'end': '2020-12-31'}, None, '2020-06-30') == {'start': False, 'end': True}
+    assert covers({'start': '2020-01-01', 'end': '2020-12-31'}, '2019-01-01', '2021-01-01') == \
+        {'start': False, 'end': False}
+
+
+def test_serve_range_from_superset():
+    data = cached(monthly(2000, 2009), start='2000-01-01', end='2009-12-31')
+
+    result = serve_from_superset(data, query(start='2003-01-01', end='2003-12-31'))
+
+    assert result['meta']['count'] == 12
+    assert result['data']['historical'].start_date == '2003-01-01'
+    assert result['data']['historical'].end_date == '2003-12-01'
+    assert result['data']['latest']['date'] == '2003-12-01'
+    assert result['meta']['coverage'] == {'start': '2003-01-01', 'end': '2003-12-31'}
+
+
+def test_serve_newest_limit_from_open_ended_superset():
+    data = cached(monthly(2000, 2009))
+
+    result = serve_from_superset(data, query(limit=3, newest_first=True))
+
+    assert list(result['data']['historical'].dates()) == ['2009-10-01', '2009-11-01', '2009-12-01']
+    assert result['meta']['coverage'] == {'start': '2009-10-01', 'end': None}
+
+
+def test_serve_limit_from_partially_covered_superset():
+    # Nur die letzten 60 Beobachtungen sind gecacht (Standard-Abfrage)
+    data = cached(monthly(2005, 2009), start='2005-01-01', end=None)
+
+    assert serve_from_superset(data, query(limit=12, newest_first=True))['meta']['count'] == 12
+    assert serve_from_superset(data, query(limit=61, newest_first=True)) is None
+    assert serve_from_superset(data, query(limit=12)) is None
+    assert serve_from_superset(data, query(start='2004-01-01')) is None
+
+
+def test_serve_requires_coverage():
+    data = cached(monthly(2000, 2001))
+    del data['meta']['coverage']
+    assert serve_from_superset(data, query(limit=1, newest_first=True)) is None
+
+
+@pytest.fixture
+def manager(workdir, fred_stub):
+    with open(workdir / 'api_config.json', 'w') as f:
+        json.dump({"cache": {"backend": "memory"}}, f)
+    manager = APIManager(str(workdir / 'api_config.json'))
+    manager.register_source('fred', create_fred_source({
+        "base_url": fred_stub.base_url, "rate_limit": 0, "retries": 1, "page_size": 25,
+        "datasets": {"bench": "BENCH00000"}
+    }, 'test'))
+    yield manager
+    manager.close()
+
+
+def test_narrow_query_served_from_default_query(manager, fred_stub):
+    full = manager.fetch_data('fred', 'bench')
+    requests_before = fred_stub.stats['requests']
+
+    latest = manager.fetch_data('fred', 'bench', {'limit': 1})
+
+    assert fred_stub.stats['requests'] == requests_before
+    assert latest['data']['historical'].dates() == ['1959-12-01']
+    assert latest['data']['latest'] == full['data']['latest']
+
+
+def test_historical_range_is_cached_and_serves_narrower_ranges(manager, fred_stub):
+    full = manager.fetch_historical_range('fred', 'bench', '1950-01-01', '1959-12-31')
+    assert full['meta']['coverage'] == {'start': '1950-01-01', 'end': '1959-12-31'}
+    # Der Stub liefert vereinzelt fehlende Werte ('.'), die beim Konvertieren entfallen
+    assert full['data']['historical'].start_date == '1950-01-01'
+    assert full['data']['historical'].end_date == '1959-12-01'
+    requests_before = fred_stub.stats['requests']
+
+    again = manager.fetch_historical_range('fred', 'bench', '1950-01-01', '1959-12-31')
+    narrower = manager.fetch_historical_range('fred', 'bench', '1952-01-01', '1952-12-31')
+    first_obs = manager.fetch_data('fred', 'bench', {'observation_start': '1950-01-01',
+                                                     'observation_end': '1959-12-31',
+                                                     'sort_order': 'asc', 'limit': 5})
+
+    assert fred_stub.stats['requests'] == requests_before
+    assert again['data']['historical'] == full['data']['historical']
+    assert narrower['data']['historical'] == full['data']['historical'].between('1952-01-01', '1952-12-31')
+    assert first_obs['data']['historical'] == full['data']['historical'][:5]
+
+
+def test_historical_range_for_unknown_source(manager):
+    assert 'error' in manager.fetch_historical_range('missing', 'bench', '1950-01-01', '1950-12-31')
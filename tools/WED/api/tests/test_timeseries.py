@@ -0,0 +1,104 @@
+# tests/test_timeseries.py - Array-basierte Zeitreihe
+
+import json
+import hashlib
+from array import array
+
+import pytest
+
+from sources.timeseries import TimeSeries, json_default
+
+RECORDS = [
+    {"date": "2024-01-01", "value": 1.0},
+    {"date": "2024-02-01", "value": 2.0},
+    {"date": "2024-03-01", "value": 3.0},
+    {"date": "2024-04-01", "value": 4.0}
+]
+
+
+def to_float(raw):
+    return None if raw in (None, '.') else float(raw)
+
+
+def test_from_observations_keeps_or_reverses_api_order():
+    ascending = [{"date": r["date"], "value": str(r["value"])} for r in RECORDS]
+    descending = list(reversed(ascending))
+    shuffled = [ascending[2], ascending[0], ascending[3], ascending[1]]
+
+    for observations in (ascending, descending, shuffled):
+        series = TimeSeries.from_observations(observations, to_float)
+        assert series.to_records() == RECORDS
+
+
+def test_from_observations_skips_missing_and_invalid_entries():
+    observations = [
+        {"date": "2024-01-01", "value": "1.5"},
+        {"date": "2024-02-01", "value": "."},
+        {"date": None, "value": "2.0"},
+        {"date": "not-a-date", "value": "3.0"},
+        {"date": "2024-05-01", "value": "4.5"}
+    ]
+    series = TimeSeries.from_observations(observations, to_float)
+    assert list(series) == [("2024-01-01", 1.5), ("2024-05-01", 4.5)]
+
+
+def test_records_roundtrip_and_compact_form():
+    series = TimeSeries.from_records(RECORDS + [{"date": "2024-05-01", "value": None}])
+    assert series.to_records() == RECORDS
+    assert TimeSeries.from_compact(json.loads(json.dumps(series.to_compact()))) == series
+    assert json.loads(json.dumps({"historical": series}, default=json_default)) == {"historical": RECORDS}
+    assert isinstance(series.ordinals, array) and series.ordinals.typecode == 'i'
+
+
+def test_access_helpers():
+    series = TimeSeries.from_records(RECORDS)
+    assert len(series) == 4
+    assert series.start_date == "2024-01-01"
+    assert series.end_date == "2024-04-01"
+    assert series.latest() == {"date": "2024-04-01", "value": 4.0}
+    assert series[1] == ("2024-02-01", 2.0)
+    assert series[-2:].dates() == ["2024-03-01", "2024-04-01"]
+    assert TimeSeries().latest() == {"value": None, "date": None}
+    assert TimeSeries().start_date is None
+
+
+def test_between_is_inclusive_and_open_ended():
+    series = TimeSeries.from_records(RECORDS)
+    assert series.between("2024-01-15", "2024-03-01").dates() == ["2024-02-01", "2024-03-01"]
+    assert series.between(None, "2024-01-01").dates() == ["2024-01-01"]
+    assert series.between("2024-03-02").dates() == ["2024-04-01"]
+    assert len(series.between("2025-01-01")) == 0
+
+
+def test_merge_replaces_overlap_with_revised_values():
+    series = TimeSeries.from_records(RECORDS)
+    newer = TimeSeries.from_records([
+        {"date": "2024-03-01", "value": 30.0},
+        {"date": "2024-04-01", "value": 40.0},
+        {"date": "2024-05-01", "value": 50.0}
+    ])
+    merged = series.merge(newer)
+
+    assert list(merged) == [("2024-01-01", 1.0), ("2024-02-01", 2.0), ("2024-03-01", 30.0),
+                            ("2024-04-01", 40.0), ("2024-05-01", 50.0)]
+    assert series.merge(TimeSeries()) == series
+    assert series.to_records() == RECORDS
+
+
+def test_concat_and_from_arrays():
+    first = TimeSeries.from_records(RECORDS[:2])
+    second = TimeSeries.from_records(RECORDS[2:])
+    assert TimeSeries.concat([first, second]).to_records() == RECORDS
+    assert TimeSeries.concat([second, first]).to_records() == RECORDS
+    assert TimeSeries.from_arrays(reversed(first.ordinals), reversed(first.values)) == first
+
+
+def test_update_hash_depends_on_content():
+    def digest(series):
+        hasher = hashlib.sha256()
+        series.update_hash(hasher)
+        return hasher.hexdigest()
+
+    series = TimeSeries.from_records(RECORDS)
+    assert digest(series) == digest(TimeSeries.from_records(RECORDS))
+    assert digest(series) != digest(series.merge(TimeSeries.from_records([{"date": "2024-04-01", "value": 4.5}])))
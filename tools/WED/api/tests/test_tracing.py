@@ -0,0 +1,53 @@
+# tests/test_tracing.py - Tracing der Update-Läufe (Chrome-Trace) und Zustand des globalen Tracers
+
+import json
+
+from sources.tracing import Tracer, tracer
+
+
+def test_disabled_tracer_records_nothing():
+    local = Tracer()
+    with local.span('work', dataset='gdp') as span:
+        span.set(cache='hit')
+    assert local.events() == []
+
+
+def test_spans_are_recorded_and_written(tmp_path):
+    local = Tracer(enabled=True)
+    with local.span('outer'):
+        with local.span('inner', dataset='gdp') as span:
+            span.set(cache='miss')
+
+    names = [event['name'] for event in local.events()]
+    assert names == ['inner', 'outer']
+    assert local.events()[0]['args'] == {'dataset': 'gdp', 'cache': 'miss'}
+
+    path = tmp_path / 'trace.json'
+    local.write(str(path))
+    with open(path) as f:
+        trace = json.load(f)
+    assert {event['name'] for event in trace['traceEvents']} == {'inner', 'outer', 'thread_name'}
+
+
+def test_traced_update_restores_global_tracer(make_updater, workdir):
+    assert not tracer.enabled
+
+    make_updater(trace=True).update_all_data()
+
+    assert not tracer.enabled
+    assert tracer.events() == []
+    with open(workdir / 'economic_data.trace.json') as f:
+        names = {event['name'] for event in json.load(f)['traceEvents']}
+    assert {'update_all_data', 'fetch_data', 'save_data'} <= names
+
+
+def test_traced_update_keeps_callers_tracer(make_updater):
+    tracer.enable()
+    try:
+        with tracer.span('caller'):
+            make_updater(trace=True).update_all_data()
+        assert tracer.enabled
+        assert {'caller', 'update_all_data'} <= {event['name'] for event in tracer.events()}
+    finally:
+        tracer.disable()
+        tracer.reset()